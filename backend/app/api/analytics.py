@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from datetime import datetime
 
-from backend.app.db import get_session
+from backend.app.db import get_async_session
 from backend.app.api import deps
 from backend.app.models.user import User
 from backend.app.models.interview import InterviewHistory, PerformanceMetric, InterviewQuestion
@@ -31,28 +32,40 @@ class PerformanceReportResponse(BaseModel):
     summary: str | None
     interview_date: datetime | None
 
+async def _performance_by_interview(session: AsyncSession, interview_ids: List[int]) -> dict:
+    """First performance metric of each interview, in one query"""
+    if not interview_ids:
+        return {}
+    metrics = (await session.exec(
+        select(PerformanceMetric).where(
+            PerformanceMetric.interview_id.in_(interview_ids)
+        ).order_by(PerformanceMetric.id)
+    )).all()
+    by_interview = {}
+    for metric in metrics:
+        by_interview.setdefault(metric.interview_id, metric)
+    return by_interview
+
 @router.get("/history", response_model=List[InterviewHistoryResponse])
 async def get_interview_history(
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Get all interview history for the current user
     """
-    interviews = session.exec(
+    interviews = (await session.exec(
         select(InterviewHistory).where(
             InterviewHistory.user_id == current_user.id
         ).order_by(InterviewHistory.started_at.desc())
-    ).all()
+    )).all()
+    
+    # Performance metrics of all interviews at once, rather than a query per interview
+    performances = await _performance_by_interview(session, [interview.id for interview in interviews])
     
     result = []
     for interview in interviews:
-        # Get performance metric if exists
-        performance = session.exec(
-            select(PerformanceMetric).where(
-                PerformanceMetric.interview_id == interview.id
-            )
-        ).first()
+        performance = performances.get(interview.id)
         
         result.append(InterviewHistoryResponse(
             id=interview.id,
@@ -69,20 +82,20 @@ async def get_interview_history(
 async def get_performance_report(
     interview_id: int,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Get detailed performance report for a specific interview
     """
-    interview = session.get(InterviewHistory, interview_id)
+    interview = await session.get(InterviewHistory, interview_id)
     if not interview or interview.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Interview not found")
     
-    performance = session.exec(
+    performance = (await session.exec(
         select(PerformanceMetric).where(
             PerformanceMetric.interview_id == interview_id
         )
-    ).first()
+    )).first()
     
     if not performance:
         raise HTTPException(status_code=404, detail="Performance report not found")
@@ -103,17 +116,17 @@ async def get_performance_report(
 @router.get("/comparison")
 async def get_performance_comparison(
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Compare performance across all completed interviews
     """
-    interviews = session.exec(
+    interviews = (await session.exec(
         select(InterviewHistory).where(
             InterviewHistory.user_id == current_user.id,
             InterviewHistory.status == "completed"
         ).order_by(InterviewHistory.ended_at.desc())
-    ).all()
+    )).all()
     
     if len(interviews) < 2:
         return {
@@ -122,13 +135,10 @@ async def get_performance_comparison(
         }
     
     # Get performance metrics for all interviews
+    performances = await _performance_by_interview(session, [interview.id for interview in interviews])
     comparisons = []
     for i, interview in enumerate(interviews):
-        performance = session.exec(
-            select(PerformanceMetric).where(
-                PerformanceMetric.interview_id == interview.id
-            )
-        ).first()
+        performance = performances.get(interview.id)
         
         if performance:
             comparisons.append({
@@ -1,5 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 from backend.app.api import auth, interview, report, analytics
+from backend.app.services.warmup import warmup
+from backend.app.services.embedding import embedding_cache_stats
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -12,3 +14,18 @@ api_router.include_router(analytics.router, prefix="/analytics", tags=["analytic
 async def health_check():
     return {"status": "ok", "message": "AI Interviewer Backend is running"}
 
+
+
+@api_router.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness (as opposed to liveness): 503 until the slow subsystems are loaded"""
+    readiness = warmup.readiness()
+    if not readiness["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
+
+
+@api_router.get("/embeddings/cache/stats")
+async def get_embedding_cache_stats():
+    """Hit ratio and size of the persistent embedding cache"""
+    return embedding_cache_stats()
@@ -1,20 +1,36 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
-from sqlmodel import Session, select
+from fastapi import APIRouter, BackgroundTasks, Depends, UploadFile, File, Form, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import json
+import logging
+import re
 import os
-from pathlib import Path
 
-from backend.app.db import get_session
+from backend.app.db import get_async_session, async_session_maker
+from backend.app.core.config import settings
 from backend.app.api import deps
 from backend.app.models.user import User
 from backend.app.models.interview import InterviewHistory, InterviewQuestion, PerformanceMetric
-from backend.app.services.parser import parse_resume
-from backend.app.services.rag import rag_engine
+from backend.app.services.parser import ResumeParseTimeout, sniff_extension
+from backend.app.services.rag import get_rag_engine, interview_namespace
 from backend.app.services.gemini_service import gemini_client
+from backend.app.services.chat_session import chat_sessions, InterviewChatSession
+from backend.app.services.context_builder import context_assembler
+from backend.app.services.question_cache import question_cache, QuestionCacheLookup
+from backend.app.services.question_guard import question_guard
+from backend.app.services.resume_cache import get_resume_cache, load_resume, format_profile
+from backend.app.services.session_store import get_session_store
+from backend.app.services.upload_store import upload_store, UploadTooLarge
 from backend.app.services.voice_service import voice_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Request/Response Models
@@ -25,7 +41,7 @@ class InterviewSetupRequest(BaseModel):
 class InterviewStartResponse(BaseModel):
     interview_id: int
     first_question: str
-    audio_base64: Optional[str] = None
+    audio_url: Optional[str] = None
 
 class AnswerRequest(BaseModel):
     interview_id: int
@@ -33,15 +49,343 @@ class AnswerRequest(BaseModel):
 
 class AnswerResponse(BaseModel):
     next_question: Optional[str] = None
-    audio_base64: Optional[str] = None
+    audio_url: Optional[str] = None
     is_complete: bool = False
 
 class EndInterviewResponse(BaseModel):
     interview_id: int
     performance_report: dict
 
-# Global storage for current interview context (in production, use Redis or similar)
-interview_contexts = {}
+def _audio_url(interview_id: int, question_number: int) -> str:
+    return f"{settings.API_V1_STR}/interview/{interview_id}/questions/{question_number}/audio"
+
+# Strong references to fire-and-forget tasks (question generation, audio prefetch) started from SSE streams
+_background_tasks = set()
+
+def _start_background_task(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def _prefetch_audio(text: str):
+    """Synthesize question audio into the TTS cache ahead of the client's request"""
+    try:
+        await run_in_threadpool(voice_service.synthesize, text)
+    except Exception as e:
+        logger.error(f"TTS prefetch failed: {e}")
+
+async def _stream_audio(text: str):
+    """Relay pipelined TTS segments, ending the stream early if a segment fails"""
+    try:
+        async for chunk in voice_service.stream_speech(text):
+            yield chunk
+    except Exception as e:
+        logger.error(f"TTS streaming failed: {e}")
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def _save_context(interview_id: int, context: dict):
+    try:
+        await run_in_threadpool(get_session_store().put, interview_id, context)
+    except Exception as e:
+        logger.error(f"Session store write failed for interview {interview_id}: {e}")
+
+async def _rehydrated_resume(interview: InterviewHistory) -> tuple:
+    """(resume text, formatted profile) of an interview's stored resume, ("", None) if it is gone"""
+    path = interview.resume_path
+    if not path or not await run_in_threadpool(os.path.exists, path):
+        return "", None
+    try:
+        sha256 = await run_in_threadpool(upload_store.sha256_of, path)
+        filename = path if os.path.splitext(path)[1] else path + await run_in_threadpool(sniff_extension, path)
+        parsed = await load_resume(sha256, path, filename)
+    except Exception as e:
+        logger.error(f"Could not reload the resume of interview {interview.id}: {e}")
+        return "", None
+    if parsed is None:
+        return "", None
+    return parsed.text, (format_profile(parsed.profile) if parsed.profile else None)
+
+async def _interview_context(session: AsyncSession, interview: InterviewHistory) -> dict:
+    """
+    The interview's context from the session store
+    
+    A context that expired, was evicted, or was set up by another deployment
+    is rebuilt from InterviewHistory (resume text and profile come from the
+    resume cache) and stored again.
+    """
+    try:
+        context = await run_in_threadpool(get_session_store().get, interview.id)
+    except Exception as e:
+        logger.error(f"Session store read failed for interview {interview.id}: {e}")
+        context = None
+    if context is not None:
+        return context
+    
+    logger.info(f"Rehydrating context of interview {interview.id}")
+    resume_text, profile = await _rehydrated_resume(interview)
+    answered = (await session.exec(
+        select(func.count()).select_from(InterviewQuestion).where(
+            InterviewQuestion.interview_id == interview.id,
+            InterviewQuestion.answer_text != None
+        )
+    )).one()
+    context = {
+        "resume": resume_text,
+        "profile": profile,
+        "job_description": interview.job_description or "",
+        "types": [t.strip() for t in interview.interview_type.split(",")],
+        "current_type_index": 0,
+        "question_count": answered
+    }
+    await _save_context(interview.id, context)
+    return context
+
+async def _new_chat(interview_id: int, context: dict, interview_type: str) -> InterviewChatSession:
+    """Start a chat session whose system instruction holds the budgeted candidate context"""
+    context_str, used_chunks = await run_in_threadpool(
+        context_assembler.build,
+        context["resume"],
+        context["job_description"],
+        interview_type,
+        namespace=interview_namespace(interview_id),
+        profile=context.get("profile")
+    )
+    chat = chat_sessions.create(interview_id, interview_type, context_str)
+    chat.sent_context.update(used_chunks)
+    return chat
+
+async def _chat_for_answer(
+    session: AsyncSession,
+    interview_id: int,
+    context: dict,
+    interview_type: str,
+    question_count: int
+) -> InterviewChatSession:
+    """
+    Return the interview's chat session, rebuilding it from stored questions
+    if it was evicted or is behind the `question_count` questions stored
+    (turns served by another worker)
+    """
+    chat = chat_sessions.get(interview_id, interview_type, question_count)
+    if chat is not None:
+        return chat
+    
+    all_questions = (await session.exec(
+        select(InterviewQuestion).where(
+            InterviewQuestion.interview_id == interview_id
+        ).order_by(InterviewQuestion.question_number)
+    )).all()
+    
+    context_str, used_chunks = await run_in_threadpool(
+        context_assembler.build,
+        context["resume"],
+        context["job_description"],
+        interview_type,
+        namespace=interview_namespace(interview_id),
+        profile=context.get("profile")
+    )
+    chat = chat_sessions.rebuild(
+        interview_id,
+        interview_type,
+        context_str,
+        [(q.question_text, q.answer_text) for q in all_questions]
+    )
+    chat.sent_context.update(used_chunks)
+    return chat
+
+async def _lookup_opening_question(chat: InterviewChatSession, context: dict, use_cache: bool) -> Optional[QuestionCacheLookup]:
+    """Look up a cached opening question for a similar JD and candidate"""
+    if not use_cache or not settings.QUESTION_CACHE_ENABLED:
+        return None
+    try:
+        return await run_in_threadpool(
+            question_cache.lookup,
+            chat.interview_type,
+            context["job_description"],
+            context.get("profile") or context["resume"]
+        )
+    except Exception as e:
+        logger.error(f"Question cache lookup failed: {e}")
+        return None
+
+def _asked_questions(chat: InterviewChatSession) -> list:
+    """Questions already in the chat session, used to re-seed the duplicate guard after eviction"""
+    return [turn["parts"][0] for turn in chat.turns if turn["role"] == "model"]
+
+async def _remember_question(interview_id: int, question: str):
+    if settings.QUESTION_GUARD_ENABLED:
+        try:
+            await run_in_threadpool(question_guard.remember, interview_id, question)
+        except Exception as e:
+            logger.error(f"Question guard update failed: {e}")
+
+async def _deduplicated_question(
+    chat: InterviewChatSession,
+    message: str,
+    question: str,
+    asked: list
+) -> str:
+    """
+    Regenerate a question that repeats an earlier one in this interview
+    
+    The repeated exchange is rewound out of the chat session and the turn is
+    resent with the earlier question forbidden, up to QUESTION_GUARD_MAX_RETRIES
+    times. Every candidate is checked, the last one included; if all of them
+    repeat (or regeneration fails), the least similar one is kept and the chat
+    session is left ending with it.
+    """
+    if not settings.QUESTION_GUARD_ENABLED or chat.last_error is not None:
+        return question
+    
+    rejected = []  # (similarity, message, question)
+    for attempt in range(settings.QUESTION_GUARD_MAX_RETRIES + 1):
+        try:
+            duplicate = await run_in_threadpool(question_guard.find_duplicate, chat.interview_id, question, asked)
+        except Exception as e:
+            logger.error(f"Question guard check failed: {e}")
+            return question
+        if duplicate is None:
+            return question
+        
+        repeated, similarity = duplicate
+        rejected.append((similarity, message, question))
+        if attempt == settings.QUESTION_GUARD_MAX_RETRIES:
+            break
+        logger.info(f"Interview {chat.interview_id}: question repeats an earlier one (similarity {similarity:.2f}), regenerating")
+        chat.rewind()
+        retry_message = gemini_client.avoid_repeat_message(message, repeated)
+        retried = await chat.ask(retry_message)
+        if chat.last_error is not None:
+            chat.record(message, question)  # restore the rewound exchange
+            chat.last_error = None
+            break
+        message, question = retry_message, retried
+    
+    similarity, kept_message, kept = min(rejected, key=lambda candidate: candidate[0])
+    if kept != question:
+        # The session ends with the last candidate; make it end with the one being asked
+        chat.rewind()
+        chat.record(kept_message, kept)
+    logger.warning(
+        f"Interview {chat.interview_id}: no candidate avoided repeating an earlier question, "
+        f"keeping the least similar (similarity {similarity:.2f})"
+    )
+    return kept
+
+async def _answer_message(chat: InterviewChatSession, context: dict, answer: str) -> str:
+    """Answer turn plus any not-yet-sent resume/JD excerpts relevant to the answer"""
+    extra_context, used_chunks = await run_in_threadpool(
+        context_assembler.build,
+        context["resume"],
+        context["job_description"],
+        chat.interview_type,
+        last_answer=answer,
+        exclude=chat.sent_context,
+        token_budget=settings.CONTEXT_TURN_TOKEN_BUDGET,
+        top_k=settings.CONTEXT_TURN_TOP_K,
+        fallback=False,
+        namespace=interview_namespace(chat.interview_id),
+        profile=context.get("profile")
+    )
+    chat.sent_context.update(used_chunks)
+    return chat.answer_message(answer, extra_context)
+
+async def _generate_question(
+    events: asyncio.Queue,
+    chat: InterviewChatSession,
+    message: str,
+    interview_id: int,
+    question_number: int,
+    cache_lookup: Optional[QuestionCacheLookup] = None,
+    asked: Optional[list] = None
+):
+    """
+    Generate and persist a question, putting its SSE events on `events`
+
+    Runs as its own task, so the question is saved even if the client
+    disconnects mid-stream (otherwise the already-saved answer would be left
+    without a pending question). Ends with a None sentinel.
+    """
+    chunks = []
+    try:
+        if cache_lookup is not None and cache_lookup.question:
+            chat.record(message, cache_lookup.question)
+            chunks.append(cache_lookup.question)
+            events.put_nowait(_sse_event("token", {"text": cache_lookup.question}))
+        else:
+            async for chunk in chat.stream(message):
+                chunks.append(chunk)
+                events.put_nowait(_sse_event("token", {"text": chunk}))
+        
+        question_text = "".join(chunks).strip()
+        if cache_lookup is not None and not cache_lookup.question and chat.last_error is None:
+            question_cache.store(cache_lookup, question_text)
+        try:
+            if asked is not None:
+                # Tokens are already on the client, so a regenerated question replaces them
+                deduplicated = await _deduplicated_question(chat, message, question_text, asked)
+                if deduplicated != question_text:
+                    question_text = deduplicated
+                    events.put_nowait(_sse_event("replace", {"text": question_text}))
+            
+            # The request-scoped session is closed once streaming starts, use a fresh one
+            async with async_session_maker() as session:
+                session.add(InterviewQuestion(
+                    interview_id=interview_id,
+                    question_number=question_number,
+                    question_text=question_text
+                ))
+                await session.commit()
+            if chat.last_error is None:
+                await _remember_question(interview_id, question_text)
+        finally:
+            question_guard.forget_checked(interview_id)
+        
+        events.put_nowait(_sse_event("question", {
+            "interview_id": interview_id,
+            "question_number": question_number,
+            "question": question_text,
+            "audio_url": _audio_url(interview_id, question_number)
+        }))
+        
+        # Warm the audio cache so the client's audio request is served immediately
+        _start_background_task(_prefetch_audio(question_text))
+        
+        events.put_nowait(_sse_event("done", {"is_complete": False}))
+    except Exception as e:
+        logger.error(f"Question streaming failed: {e}")
+        events.put_nowait(_sse_event("error", {"detail": str(e)}))
+    finally:
+        events.put_nowait(None)
+
+async def _stream_question(*args, **kwargs):
+    """
+    Relay Gemini's streamed question as SSE events.
+    
+    Emits `token` events while the question is generated, then a `question`
+    event (with the audio URL) once the full text is saved to InterviewQuestion,
+    then `done`. A question cache hit is sent as a single token; a miss is
+    stored in the cache once generated. When `asked` is given, a question that
+    repeats one of them is regenerated and sent as a `replace` event.
+    Arguments are those of _generate_question after `events`.
+    """
+    events = asyncio.Queue()
+    _start_background_task(_generate_question(events, *args, **kwargs))
+    while True:
+        event = await events.get()
+        if event is None:
+            return
+        yield event
+
+def _sse_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.post("/setup")
 async def setup_interview(
@@ -49,7 +393,7 @@ async def setup_interview(
     job_description: str = Form(...),
     interview_types: str = Form(...),  # Comma-separated: "HR,Technical"
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Upload resume and job description to set up interview
@@ -57,53 +401,54 @@ async def setup_interview(
     # Parse interview types
     types_list = [t.strip() for t in interview_types.split(",")]
     
-    # Save resume file
-    upload_dir = Path("uploads")
-    upload_dir.mkdir(exist_ok=True)
-    
-    # Use timestamp without colons for Windows compatibility
-    timestamp = str(int(datetime.utcnow().timestamp()))
-    resume_filename = f"{current_user.id}_{timestamp}_{resume.filename}"
-    resume_path = upload_dir / resume_filename
-    
-    # Read and save resume file
-    resume_bytes = await resume.read()
-    with open(resume_path, "wb") as f:
-        f.write(resume_bytes)
+    # Stream the resume into the content-addressed store (identical files are stored once)
+    try:
+        stored = await upload_store.save(resume)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=f"Resume file is larger than the {e.limit} byte limit.")
     
-    # Parse resume content
-    resume_content = await parse_resume(resume_bytes, resume.filename)
+    # Parse and profile the resume, or reuse both if this file was seen before
+    try:
+        parsed = await load_resume(stored.sha256, stored.path, resume.filename)
+    except ResumeParseTimeout:
+        raise HTTPException(status_code=422, detail="Resume file took too long to parse.")
     
-    if not resume_content:
+    if parsed is None:
         raise HTTPException(status_code=400, detail="Could not parse resume file.")
+    resume_content = parsed.text
+    profile = format_profile(parsed.profile) if parsed.profile else None
 
     
-    # Clear and populate RAG engine
-    rag_engine.clear()
-    rag_engine.add_document(resume_content)
-    rag_engine.add_document(job_description)
-    
     # Create interview record
     interview = InterviewHistory(
         user_id=current_user.id,
         interview_type=",".join(types_list),
-        resume_path=str(resume_path),
+        resume_path=stored.path,
         job_description=job_description,
         status="ready"
     )
     
     session.add(interview)
-    session.commit()
-    session.refresh(interview)
+    await session.commit()
+    await session.refresh(interview)
+    
+    # Index resume and JD into this interview's own namespace (off the event loop)
+    await run_in_threadpool(
+        context_assembler.index_documents,
+        interview_namespace(interview.id),
+        "" if profile else resume_content,  # prompts use the profile instead of resume excerpts
+        job_description
+    )
     
-    # Store context for this interview
-    interview_contexts[interview.id] = {
+    # Store context for this interview, where every worker can find it
+    await _save_context(interview.id, {
         "resume": resume_content,
+        "profile": profile,
         "job_description": job_description,
         "types": types_list,
         "current_type_index": 0,
         "question_count": 0
-    }
+    })
     
     return {
         "status": "ready",
@@ -114,14 +459,19 @@ async def setup_interview(
 @router.post("/start", response_model=InterviewStartResponse)
 async def start_interview(
     interview_id: int,
+    background_tasks: BackgroundTasks,
+    use_cache: bool = True,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Start the interview and get the first question
+    
+    The opening question may come from the semantic question cache;
+    pass use_cache=false to always generate a fresh one.
     """
     # Get interview
-    interview = session.get(InterviewHistory, interview_id)
+    interview = await session.get(InterviewHistory, interview_id)
     if not interview or interview.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Interview not found")
     
@@ -129,22 +479,25 @@ async def start_interview(
     interview.status = "in_progress"
     interview.started_at = datetime.utcnow()
     session.add(interview)
-    session.commit()
+    await session.commit()
     
     # Get context
-    context = interview_contexts.get(interview_id)
-    if not context:
-        raise HTTPException(status_code=400, detail="Interview context not found. Please setup again.")
+    context = await _interview_context(session, interview)
     
-    # Generate first question
+    # Generate first question in a fresh chat session for this interview
     interview_type = context["types"][0]
-    context_str = f"Resume:\n{context['resume']}\n\nJob Description:\n{context['job_description']}"
-    
-    first_question = gemini_client.generate_interview_question(
-        context=context_str,
-        interview_type=interview_type,
-        previous_qa=None
-    )
+    chat = await _new_chat(interview_id, context, interview_type)
+    
+    cache_lookup = await _lookup_opening_question(chat, context, use_cache)
+    if cache_lookup is not None and cache_lookup.question:
+        # Seed the session so follow-up turns see the opening exchange
+        first_question = cache_lookup.question
+        chat.record(chat.opening_message(), first_question)
+    else:
+        first_question = await chat.ask(chat.opening_message())
+        if cache_lookup is not None and chat.last_error is None:
+            question_cache.store(cache_lookup, first_question)
+    await _remember_question(interview_id, first_question)
     
     # Save question to database
     question_record = InterviewQuestion(
@@ -153,44 +506,41 @@ async def start_interview(
         question_text=first_question
     )
     session.add(question_record)
-    session.commit()
+    await session.commit()
     
-    # Generate TTS audio (with error handling)
-    audio_base64 = ""
-    try:
-        audio_base64 = voice_service.text_to_speech_base64(first_question)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"TTS generation failed: {e}")
-        # Continue without audio
+    # Audio is served separately, start synthesizing it once the response is sent
+    background_tasks.add_task(_prefetch_audio, first_question)
     
     return InterviewStartResponse(
         interview_id=interview_id,
         first_question=first_question,
-        audio_base64=audio_base64
+        audio_url=_audio_url(interview_id, 1)
     )
 
 @router.post("/answer", response_model=AnswerResponse)
 async def submit_answer(
     answer_req: AnswerRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Submit answer and get next question
     """
-    interview = session.get(InterviewHistory, answer_req.interview_id)
+    interview = await session.get(InterviewHistory, answer_req.interview_id)
     if not interview or interview.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Interview not found")
     
+    # Get context (before saving the answer, so a rehydrated count does not include it)
+    context = await _interview_context(session, interview)
+    
     # Get the last unanswered question
     statement = select(InterviewQuestion).where(
         InterviewQuestion.interview_id == answer_req.interview_id,
         InterviewQuestion.answer_text == None
     ).order_by(InterviewQuestion.question_number.desc())
     
-    last_question = session.exec(statement).first()
+    last_question = (await session.exec(statement)).first()
     
     if not last_question:
         raise HTTPException(status_code=400, detail="No pending question found")
@@ -199,76 +549,140 @@ async def submit_answer(
     last_question.answer_text = answer_req.answer
     last_question.answered_at = datetime.utcnow()
     session.add(last_question)
-    session.commit()
-    
-    # Get context
-    context = interview_contexts.get(answer_req.interview_id)
-    if not context:
-        raise HTTPException(status_code=400, detail="Interview context not found")
+    await session.commit()
     
     context["question_count"] += 1
+    await _save_context(answer_req.interview_id, context)
     
     # No question limit - allow unlimited questions
     # Users can end interview manually when ready
     
-    
-    # Get all previous Q&A
-    all_questions = session.exec(
-        select(InterviewQuestion).where(
-            InterviewQuestion.interview_id == answer_req.interview_id
-        ).order_by(InterviewQuestion.question_number)
-    ).all()
-    
-    previous_qa = [
-        {"question": q.question_text, "answer": q.answer_text}
-        for q in all_questions if q.answer_text
-    ]
-    
-    # Generate next question
+    # Generate next question, sending only the new answer to the chat session
     current_type = context["types"][context["current_type_index"]]
-    context_str = f"Resume:\n{context['resume']}\n\nJob Description:\n{context['job_description']}"
-    
-    next_question = gemini_client.generate_interview_question(
-        context=context_str,
-        interview_type=current_type,
-        previous_qa=previous_qa
-    )
-    
-    # Save next question
-    question_record = InterviewQuestion(
-        interview_id=answer_req.interview_id,
-        question_number=len(all_questions) + 1,
-        question_text=next_question
-    )
-    session.add(question_record)
-    session.commit()
+    chat = await _chat_for_answer(session, answer_req.interview_id, context, current_type, last_question.question_number)
     
-    # Generate TTS (with error handling)
-    audio_base64 = ""
+    asked = _asked_questions(chat)
+    message = await _answer_message(chat, context, answer_req.answer)
+    next_question = await chat.ask(message)
     try:
-        audio_base64 = voice_service.text_to_speech_base64(next_question)
-    except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"TTS generation failed in answer endpoint: {e}")
-        # Continue without audio
+        # Re-asking a near-identical question wastes the turn (and its TTS), regenerate it first
+        next_question = await _deduplicated_question(chat, message, next_question, asked)
+        
+        # Save next question
+        question_record = InterviewQuestion(
+            interview_id=answer_req.interview_id,
+            question_number=last_question.question_number + 1,
+            question_text=next_question
+        )
+        session.add(question_record)
+        await session.commit()
+        if chat.last_error is None:
+            await _remember_question(answer_req.interview_id, next_question)
+    finally:
+        question_guard.forget_checked(answer_req.interview_id)
+    
+    # Audio is served separately, start synthesizing it once the response is sent
+    background_tasks.add_task(_prefetch_audio, next_question)
     
     return AnswerResponse(
         next_question=next_question,
-        audio_base64=audio_base64,
+        audio_url=_audio_url(answer_req.interview_id, question_record.question_number),
         is_complete=False
     )
 
+@router.post("/start/stream")
+async def start_interview_stream(
+    interview_id: int,
+    use_cache: bool = True,
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Start the interview and stream the first question as Server-Sent Events
+    
+    Like /start, use_cache=false bypasses the semantic question cache.
+    """
+    interview = await session.get(InterviewHistory, interview_id)
+    if not interview or interview.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    context = await _interview_context(session, interview)
+    
+    # Update status
+    interview.status = "in_progress"
+    interview.started_at = datetime.utcnow()
+    session.add(interview)
+    await session.commit()
+    
+    interview_type = context["types"][0]
+    chat = await _new_chat(interview_id, context, interview_type)
+    
+    cache_lookup = await _lookup_opening_question(chat, context, use_cache)
+    
+    return _sse_response(_stream_question(
+        chat=chat,
+        message=chat.opening_message(),
+        interview_id=interview_id,
+        question_number=1,
+        cache_lookup=cache_lookup
+    ))
+
+@router.post("/answer/stream")
+async def submit_answer_stream(
+    answer_req: AnswerRequest,
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Submit answer and stream the next question as Server-Sent Events
+    """
+    interview = await session.get(InterviewHistory, answer_req.interview_id)
+    if not interview or interview.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    context = await _interview_context(session, interview)
+    
+    # Get the last unanswered question
+    last_question = (await session.exec(
+        select(InterviewQuestion).where(
+            InterviewQuestion.interview_id == answer_req.interview_id,
+            InterviewQuestion.answer_text == None
+        ).order_by(InterviewQuestion.question_number.desc())
+    )).first()
+    
+    if not last_question:
+        raise HTTPException(status_code=400, detail="No pending question found")
+    
+    # Save answer
+    last_question.answer_text = answer_req.answer
+    last_question.answered_at = datetime.utcnow()
+    session.add(last_question)
+    await session.commit()
+    
+    context["question_count"] += 1
+    await _save_context(answer_req.interview_id, context)
+    
+    current_type = context["types"][context["current_type_index"]]
+    chat = await _chat_for_answer(session, answer_req.interview_id, context, current_type, last_question.question_number)
+    
+    return _sse_response(_stream_question(
+        chat=chat,
+        message=await _answer_message(chat, context, answer_req.answer),
+        interview_id=answer_req.interview_id,
+        question_number=last_question.question_number + 1,
+        asked=_asked_questions(chat)
+    ))
+
 @router.post("/end", response_model=EndInterviewResponse)
 async def end_interview(
     interview_id: int,
     current_user: User = Depends(deps.get_current_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     End interview and generate performance report
     """
-    interview = session.get(InterviewHistory, interview_id)
+    interview = await session.get(InterviewHistory, interview_id)
     if not interview or interview.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Interview not found")
     
@@ -276,25 +690,45 @@ async def end_interview(
     interview.status = "completed"
     interview.ended_at = datetime.utcnow()
     session.add(interview)
+    # Commit now, so SQLite's write lock is not held while the report is generated
+    await session.commit()
     
     # Get all Q&A
-    questions = session.exec(
+    questions = (await session.exec(
         select(InterviewQuestion).where(
             InterviewQuestion.interview_id == interview_id
         ).order_by(InterviewQuestion.question_number)
-    ).all()
+    )).all()
     
     qa_list = [
         {"question": q.question_text, "answer": q.answer_text or ""}
         for q in questions
     ]
     
+    # The chat session and duplicate guard are no longer needed once the interview ends
+    chat_sessions.drop(interview_id)
+    question_guard.drop(interview_id)
+    
     # Get context
-    context = interview_contexts.get(interview_id, {})
-    context_str = f"Resume:\n{context.get('resume', '')}\n\nJob Description:\n{context.get('job_description', '')}"
+    context = await _interview_context(session, interview)
+    context_str, _ = await run_in_threadpool(
+        context_assembler.build,
+        context["resume"],
+        context["job_description"],
+        interview.interview_type.split(",")[0],
+        namespace=interview_namespace(interview_id),
+        profile=context.get("profile")
+    )
+    try:
+        await run_in_threadpool(get_session_store().delete, interview_id)
+    except Exception as e:
+        logger.error(f"Session store delete failed for interview {interview_id}: {e}")
+    
+    # The interview's index is no longer needed in memory
+    get_rag_engine().evict(interview_namespace(interview_id))
     
     # Generate performance report using Gemini
-    report = gemini_client.generate_performance_report(
+    report = await gemini_client.generate_performance_report_async(
         questions_answers=qa_list,
         context=context_str,
         interview_type=interview.interview_type
@@ -314,26 +748,26 @@ async def end_interview(
     performance.set_improvements(report.get("improvements", []))
     
     session.add(performance)
-    session.commit()
-    session.refresh(performance)
+    await session.commit()
+    await session.refresh(performance)
     
     # Get previous interviews for comparison
-    previous_interviews = session.exec(
+    previous_interviews = (await session.exec(
         select(InterviewHistory).where(
             InterviewHistory.user_id == current_user.id,
             InterviewHistory.id != interview_id,
             InterviewHistory.status == "completed"
         ).order_by(InterviewHistory.ended_at.desc())
-    ).all()
+    )).all()
     
     comparison = None
     if previous_interviews:
         prev_interview = previous_interviews[0]
-        prev_performance = session.exec(
+        prev_performance = (await session.exec(
             select(PerformanceMetric).where(
                 PerformanceMetric.interview_id == prev_interview.id
             )
-        ).first()
+        )).first()
         
         if prev_performance:
             comparison = {
@@ -357,10 +791,137 @@ async def end_interview(
         performance_report=complete_report
     )
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches `etag` (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in [t[2:] if t.startswith("W/") else t for t in tags]
+
+def _byte_range(range_header: str, total: int) -> Optional[tuple]:
+    """
+    Parse a single-range "bytes=" header against a body of `total` bytes
+
+    Returns:
+        Inclusive (start, end), clamped to the body, or None if the range is
+        malformed or not satisfiable
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    start_str, end_str = match.groups()
+    if start_str:
+        start = int(start_str)
+        end = min(int(end_str), total - 1) if end_str else total - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(total - int(end_str), 0)
+        end = total - 1
+    if start >= total or start > end:
+        return None
+    return start, end
+
+@router.get("/{interview_id}/questions/{question_number}/audio")
+async def get_question_audio(
+    interview_id: int,
+    question_number: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+    current_user: User = Depends(deps.get_current_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Serve a question's speech (audio/mpeg by default), with ETag and byte-range support
+    """
+    interview = await session.get(InterviewHistory, interview_id)
+    if not interview or interview.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Interview not found")
+    
+    question = (await session.exec(
+        select(InterviewQuestion).where(
+            InterviewQuestion.interview_id == interview_id,
+            InterviewQuestion.question_number == question_number
+        )
+    )).first()
+    if not question:
+        raise HTTPException(status_code=404, detail="Question not found")
+    
+    # The cache key is a content hash, so it doubles as a strong ETag
+    etag = f'"{voice_service.cache_key(question.question_text)}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=86400"
+    }
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    
+    audio_bytes = await run_in_threadpool(voice_service.cached_audio, question.question_text)
+    if audio_bytes is None and not range_header:
+        # Not synthesized yet: stream sentence by sentence so playback starts early
+        return StreamingResponse(
+            _stream_audio(question.question_text),
+            media_type=voice_service.media_type,
+            headers=headers
+        )
+    
+    try:
+        if audio_bytes is None:
+            audio_bytes = await run_in_threadpool(voice_service.synthesize, question.question_text)
+    except Exception as e:
+        logger.error(f"TTS generation failed for question audio: {e}")
+        raise HTTPException(status_code=503, detail="Audio is not available right now")
+    
+    total = len(audio_bytes)
+    if range_header:
+        byte_range = _byte_range(range_header, total)
+        if byte_range is None:
+            raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{total}"})
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+        return Response(content=audio_bytes[start:end + 1], status_code=206, media_type=voice_service.media_type, headers=headers)
+    
+    return Response(content=audio_bytes, media_type=voice_service.media_type, headers=headers)
+
+@router.get("/tts/cache/stats")
+async def get_tts_cache_stats():
+    """
+    Hit/miss counters and sizes of the TTS audio cache
+    """
+    return voice_service.cache_stats()
+
+@router.get("/resumes/cache/stats")
+async def get_resume_cache_stats():
+    """
+    Hit/miss counters and size of the parsed-resume/profile cache
+    """
+    return await run_in_threadpool(get_resume_cache().stats)
+
+@router.get("/sessions/stats")
+async def get_session_store_stats():
+    """
+    Entries, stored bytes and hit/eviction counters of the interview session store
+    """
+    return await run_in_threadpool(get_session_store().stats)
+
+@router.get("/questions/cache/stats")
+async def get_question_cache_stats():
+    """
+    Hit/miss counters and partition sizes of the semantic question cache
+    """
+    return question_cache.stats()
+
+@router.get("/questions/guard/stats")
+async def get_question_guard_stats():
+    """
+    Checks and near-duplicates caught by the duplicate-question guard
+    """
+    return question_guard.stats()
+
 @router.get("/tts/{text}")
 async def get_tts_audio(text: str):
     """
     Generate TTS audio for given text
     """
-    audio_base64 = voice_service.text_to_speech_base64(text)
+    audio_base64 = await run_in_threadpool(voice_service.text_to_speech_base64, text)
     return {"audio_base64": audio_base64}
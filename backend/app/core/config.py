@@ -8,9 +8,125 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Database
+    DATABASE_ASYNC_URL: str = ""  # async driver URL, derived from DATABASE_URL if empty (aiosqlite, asyncpg, aiomysql)
+    DB_ECHO: bool = False  # log every SQL statement
+    DB_POOL_SIZE: int = 5  # connections kept open per engine and worker
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # reconnect after this many seconds (server databases)
+    DB_POOL_PRE_PING: bool = True  # check connections before use (server databases)
+    DB_SQLITE_WAL: bool = True  # journal_mode=WAL: reads do not wait for a writer
+    DB_SQLITE_SYNCHRONOUS: str = "NORMAL"  # OFF | NORMAL | FULL; NORMAL is durable enough with WAL
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000  # wait for the write lock instead of failing with "database is locked"
+    DB_SQLITE_CACHE_KB: int = 16384  # page cache per connection
+    
+    # Production server (python start.py; more than one worker runs the pre-fork server)
+    WEB_WORKERS: int = 1
+    WEB_PRELOAD: bool = True  # load the app and models once in the master, shared copy-on-write by workers
+    WEB_MAX_REQUESTS: int = 0  # recycle a worker after this many requests, 0 = never
+    WEB_MAX_REQUESTS_JITTER: int = 0  # random extra requests per worker, so they do not recycle together
+    WEB_GRACEFUL_TIMEOUT: float = 30.0  # seconds a stopping worker gets to finish in-flight requests
+    
     # Gemini API
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-3-flash-preview"
+    GEMINI_REQUEST_TIMEOUT: float = 60.0  # seconds per Gemini call
+    GEMINI_MAX_CONCURRENT_REQUESTS: int = 32  # in-flight async calls per worker
+    GEMINI_CHAT_POOL_SIZE: int = 256  # live per-interview chat sessions per worker
+    GEMINI_CHAT_MAX_TURNS: int = 12  # Q/A exchanges kept in a chat session
+    
+    # Embeddings
+    WARMUP_ON_STARTUP: bool = True  # load the embedding model and vector store in the background at startup
+    EMBEDDING_BATCH_SIZE: int = 32  # texts per model forward pass
+    EMBEDDING_BACKEND: str = "torch"  # torch | onnx (export with: python -m backend.app.services.onnx_embedding)
+    EMBEDDING_ONNX_DIR: str = "models/all-MiniLM-L6-v2-onnx"
+    EMBEDDING_ONNX_QUANTIZED: bool = True  # use the int8 export
+    EMBEDDING_ONNX_THREADS: int = 0  # ONNX Runtime intra-op threads, 0 = all cores
+    EMBEDDING_CACHE_ENABLED: bool = True  # reuse embeddings of previously seen chunks
+    EMBEDDING_CACHE_DIR: str = "embedding_cache"
+    EMBEDDING_WORKER_ENABLED: bool = False  # run the model once in a shared worker process (started by start.py)
+    EMBEDDING_WORKER_ADDRESS: str = "embedding-worker.sock"  # Unix socket path, or host:port
+    EMBEDDING_WORKER_AUTHKEY: str = ""  # shared secret of worker and clients; start.py generates one per run if empty (TCP needs 32+ chars)
+    EMBEDDING_WORKER_MAX_BATCH: int = 64  # texts per micro-batch
+    EMBEDDING_WORKER_MAX_WAIT_MS: float = 5.0  # how long a batch waits for more requests
+    EMBEDDING_WORKER_TIMEOUT: float = 30.0  # seconds to wait for a reply before encoding locally
+    
+    # Vector store (one namespace per interview)
+    RAG_STORAGE_DIR: str = "vector_store"
+    RAG_MAX_NAMESPACES: int = 256  # interview namespaces kept in memory per worker (corpora stay loaded)
+    RAG_PERSIST_NAMESPACES: bool = False  # also save interview namespaces to disk (corpora always are)
+    RAG_SNAPSHOT_EVERY: int = 1024  # appended chunks between index snapshots
+    RAG_INDEX_TYPE: str = "flat"  # flat | hnsw | ivfpq, for shared corpus namespaces
+    RAG_VECTOR_STORAGE: str = "float32"  # float32 | fp16 | int8 codes in flat/hnsw indexes
+    RAG_RERANK_FACTOR: int = 4  # candidates per result re-ranked exactly when vectors are quantized (persisted namespaces)
+    RAG_HNSW_M: int = 32  # graph neighbours per node
+    RAG_HNSW_EF_CONSTRUCTION: int = 200
+    RAG_HNSW_EF_SEARCH: int = 64  # higher = better recall, slower search
+    RAG_IVF_NLIST: int = 1024  # inverted lists (k-means centroids)
+    RAG_IVF_NPROBE: int = 16  # lists scanned per query
+    RAG_PQ_M: int = 48  # sub-quantizers, must divide the embedding dimension
+    RAG_PQ_NBITS: int = 8
+    RAG_TRAIN_SIZE: int = 100000  # max vectors sampled for training
+    
+    # Prompt context (estimated tokens of resume/JD excerpts per prompt)
+    CONTEXT_TOKEN_BUDGET: int = 1200
+    CONTEXT_TOP_K: int = 8
+    CONTEXT_TURN_TOKEN_BUDGET: int = 300  # extra excerpts relevant to the last answer
+    CONTEXT_TURN_TOP_K: int = 3
+    
+    # Interview session store (shared by all workers)
+    SESSION_STORE_BACKEND: str = "sqlite"  # sqlite | redis
+    SESSION_STORE_PATH: str = "sessions.sqlite"
+    SESSION_REDIS_URL: str = "redis://localhost:6379/0"
+    SESSION_TTL_SECONDS: int = 6 * 3600  # idle time before a context expires (it is rehydrated on next use)
+    SESSION_MAX_BYTES: int = 256 * 1024 * 1024  # least recently used contexts are evicted above this
+    
+    # Semantic cache of opening questions
+    QUESTION_CACHE_ENABLED: bool = True
+    QUESTION_CACHE_THRESHOLD: float = 0.92  # min cosine similarity of job descriptions for a hit
+    QUESTION_CACHE_CANDIDATE_THRESHOLD: float = 0.98  # and of candidate profiles/resumes (openers may cite them)
+    QUESTION_CACHE_CANDIDATE_FREE_TYPES: str = "Aptitude"  # types whose openers never use the resume, keyed on the JD only
+    QUESTION_CACHE_TTL_SECONDS: int = 86400
+    QUESTION_CACHE_MAX_PER_TYPE: int = 512  # LRU bound per interview type
+    
+    # Duplicate-question guard
+    QUESTION_GUARD_ENABLED: bool = True
+    QUESTION_GUARD_THRESHOLD: float = 0.9  # cosine similarity at which a question counts as repeated
+    QUESTION_GUARD_MAX_RETRIES: int = 1  # constrained regenerations per question
+    QUESTION_GUARD_MAX_INTERVIEWS: int = 256  # interviews kept in memory per worker
+    
+    # Resume uploads (content-addressed, deduplicated)
+    UPLOAD_DIR: str = "uploads"
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024  # read/hash/write granularity
+    UPLOAD_RETENTION_DAYS: int = 0  # sweep drops resumes of interviews older than this, 0 = keep them
+    UPLOAD_ORPHAN_GRACE_SECONDS: int = 3600  # unreferenced files younger than this survive a sweep
+    UPLOAD_SWEEP_ON_STARTUP: bool = True
+    
+    # Resume parsing
+    PARSER_WORKERS: int = 2  # processes extracting PDF/DOCX text off the event loop
+    PARSER_TIMEOUT_SECONDS: float = 30.0  # per uploaded file
+    PARSER_PDF_PAGES_PER_TASK: int = 8  # longer PDFs are extracted in parallel page ranges
+    
+    # Parsed resumes and candidate profiles, keyed by file hash
+    RESUME_CACHE_ENABLED: bool = True
+    RESUME_CACHE_DIR: str = "resume_cache"
+    RESUME_PROFILE_ENABLED: bool = True  # prompts use an extracted compact profile instead of resume excerpts
+    RESUME_PROFILE_MAX_CHARS: int = 24000  # resume text sent to the extraction prompt
+    
+    # Text-to-speech
+    TTS_ENGINE: str = "gtts"  # "gtts" (network) or "espeak" (local, offline)
+    TTS_ENGINE_TIMEOUT: float = 30.0  # seconds per local synthesis
+    TTS_ESPEAK_BINARY: str = "espeak-ng"
+    TTS_ESPEAK_VOICE: str = ""  # defaults to the service language
+    TTS_ESPEAK_SPEED: int = 160  # words per minute
+    TTS_ESPEAK_MP3: bool = True  # encode to MP3 with ffmpeg when available
+    TTS_CACHE_DIR: str = "tts_cache"
+    TTS_CACHE_MEMORY_MB: int = 32
+    TTS_CACHE_DISK_MB: int = 512
+    TTS_PIPELINE_WORKERS: int = 4  # concurrent sentence syntheses
+    TTS_SEGMENT_MIN_CHARS: int = 40  # shorter sentences are merged with a neighbour
     
     # Interview Configuration
     DEFAULT_INTERVIEW_DURATION: int = 30
@@ -1,21 +1,98 @@
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from backend.app.core.config import settings
 
 # Import all models to ensure they're registered with SQLModel
 from backend.app.models.user import User
 from backend.app.models.interview import InterviewHistory, InterviewQuestion, PerformanceMetric
 
+# Async drivers used when DATABASE_ASYNC_URL is not set
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_ASYNC_URL, or DATABASE_URL with its async driver (sqlite:///x.db -> sqlite+aiosqlite:///x.db)"""
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def _engine_options(url: str, is_async: bool = False) -> dict:
+    """Pool settings for an engine on `url`"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        if parsed.database in (None, "", ":memory:"):
+            return {}  # one shared in-memory connection, nothing to size
+        # A local file: connections never go stale. aiosqlite would otherwise open
+        # a connection (and its thread) per session, so pool those too
+        options = {"pool_size": settings.DB_POOL_SIZE, "max_overflow": settings.DB_MAX_OVERFLOW,
+                   "pool_timeout": settings.DB_POOL_TIMEOUT}
+        if is_async:
+            options["poolclass"] = AsyncAdaptedQueuePool
+        return options
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Per-connection SQLite tuning: WAL lets readers run while a request writes"""
+    cursor = dbapi_connection.cursor()
+    if settings.DB_SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.DB_SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.DB_SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.DB_SQLITE_CACHE_KB)}")
+    cursor.close()
+
+
+# Synchronous engine: table creation, scripts, the upload sweep and the auth routes (run in the threadpool)
 # check_same_thread=False is needed for SQLite
 engine = create_engine(
-    settings.DATABASE_URL, 
-    echo=True, 
-    connect_args={"check_same_thread": False}
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
+    **_engine_options(settings.DATABASE_URL)
+)
+
+# Async engine for request handlers on the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.DATABASE_URL),
+    echo=settings.DB_ECHO,
+    **_engine_options(settings.DATABASE_URL, is_async=True)
 )
 
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _configure_sqlite)
+    event.listen(async_engine.sync_engine, "connect", _configure_sqlite)
+
+# Objects stay usable after commit; reloading expired attributes would need an implicit await
+async_session_maker = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
 def get_session():
     with Session(engine) as session:
         yield session
 
+async def get_async_session():
+    async with async_session_maker() as session:
+        yield session
+
 def init_db():
     """Initialize database and create all tables"""
     SQLModel.metadata.create_all(engine)
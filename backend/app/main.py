@@ -4,11 +4,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import os
+import threading
 import traceback
 import logging
 from backend.app.core.config import settings
-from backend.app.db import init_db
+from backend.app.db import init_db, async_engine
 from backend.app.api.api import api_router
+from backend.app.services.warmup import warmup
+from backend.app.services.parser import shutdown_parser_pool
+from backend.app.services.upload_store import run_sweep
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -20,10 +24,17 @@ async def lifespan(app: FastAPI):
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
     init_db()
+    if settings.WARMUP_ON_STARTUP:
+        # Runs in a background thread so the port opens without waiting for the model
+        warmup.start()
+    if settings.UPLOAD_SWEEP_ON_STARTUP:
+        threading.Thread(target=run_sweep, name="upload-sweep", daemon=True).start()
     logger.info(f"API_V1_STR: {settings.API_V1_STR}")
     for route in app.routes:
         logger.info(f"Route: {route.path} {route.name}")
     yield
+    shutdown_parser_pool()
+    await async_engine.dispose()
 
 app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json", lifespan=lifespan)
 
@@ -0,0 +1,237 @@
+"""
+Pre-fork production server
+
+A master process imports the app and loads the heavy subsystems once (the
+embedding model, FAISS, the Gemini client), freezes the heap, binds the
+listening socket and forks the uvicorn workers. Workers share the master's
+pages copy-on-write instead of each loading MiniLM, and accept connections
+from the same socket.
+
+A worker exits gracefully after WEB_MAX_REQUESTS requests (plus up to
+WEB_MAX_REQUESTS_JITTER, so workers do not recycle together) and the master
+forks a fresh one from its clean, preloaded state. Workers that die are
+replaced the same way. SIGTERM/SIGINT stop the workers gracefully.
+
+The port is bound before the preload, so it opens immediately; requests
+arriving while the model loads wait in the socket backlog.
+
+Fork safety: the master never runs inference, opens database connections it
+keeps, or starts threads, so workers start without inherited locks or pools.
+
+Run with:  python start.py --workers 4
+"""
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import time
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_RESPAWN_BACKOFF_SECONDS = 1.0  # a worker that dies this soon after starting is respawned with a delay
+
+
+def preload():
+    """
+    Import the app and load shared state in the master before forking
+
+    Returns:
+        The ASGI app
+    """
+    from backend.app.main import app
+    from backend.app.db import init_db, engine, async_engine
+    from backend.app.services.gemini_service import gemini_client  # noqa: F401 (created on import)
+    from backend.app.services.rag import get_rag_engine
+
+    started = time.perf_counter()
+    # Create tables once here rather than racing in every worker's lifespan
+    init_db()
+
+    if not settings.EMBEDDING_WORKER_ENABLED:
+        # Only the weights; no forward pass, so no runtime thread pools are created before the fork
+        from backend.app.services.embedding import get_model
+        get_model()
+    get_rag_engine()  # imports FAISS; namespaces still load lazily in the workers
+
+    if settings.UPLOAD_SWEEP_ON_STARTUP:
+        # Once for the whole server instead of in every (re)started worker
+        from backend.app.services.upload_store import run_sweep
+        run_sweep()
+        settings.UPLOAD_SWEEP_ON_STARTUP = False
+
+    # Connections must not be shared across processes
+    engine.dispose()
+    async_engine.sync_engine.dispose()
+
+    # Move everything allocated so far out of the collector's reach, so that
+    # collections in the workers do not write to (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded app in {time.perf_counter() - started:.1f}s ({gc.get_freeze_count()} objects frozen)")
+    return app
+
+
+class PreforkServer:
+    """Master process that forks, supervises and recycles uvicorn workers (app None = import in each worker)"""
+
+    def __init__(
+        self,
+        app,
+        host: str,
+        port: int,
+        workers: int,
+        max_requests: int = 0,
+        max_requests_jitter: int = 0,
+        graceful_timeout: float = 30.0
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.graceful_timeout = graceful_timeout
+        self.children = {}  # pid -> start time
+        self.stopping_since = None
+        self.killed = False
+        self.sock = None
+
+    def bind(self):
+        """Open the listening socket (connections queue in its backlog until workers run)"""
+        if self.sock is not None:
+            return
+        sock = socket.socket(socket.AF_INET6 if ":" in self.host else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        self.sock = sock
+        logger.info(f"Pre-fork server listening on {self.host}:{self.port}")
+
+    def _run_worker(self):
+        import uvicorn
+
+        # Drop the master's handlers; uvicorn installs its own for graceful shutdown
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        random.seed()
+        app = self.app
+        if app is None:
+            from backend.app.main import app
+
+        limit = None
+        if self.max_requests:
+            limit = self.max_requests + random.randint(0, self.max_requests_jitter)
+        config = uvicorn.Config(
+            app,
+            log_level="info",
+            access_log=True,
+            limit_max_requests=limit,
+            timeout_graceful_shutdown=self.graceful_timeout
+        )
+        logger.info(f"Worker {os.getpid()} started" + (f", recycling after {limit} requests" if limit else ""))
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._run_worker()
+            except BaseException as e:
+                if not isinstance(e, SystemExit):
+                    logger.exception(f"Worker {os.getpid()} crashed: {e}")
+                    code = 1
+            finally:
+                logging.shutdown()
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+
+    def _signal_children(self, sig):
+        for pid in list(self.children):
+            try:
+                os.kill(pid, sig)
+            except ProcessLookupError:
+                self.children.pop(pid, None)
+
+    def _stop(self, signum, frame):
+        if self.stopping_since is None:
+            logger.info(f"Stopping {len(self.children)} workers")
+            self.stopping_since = time.monotonic()
+            self._signal_children(signal.SIGTERM)
+
+    def _reap(self):
+        """Collect exited workers and replace them unless stopping"""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.children.clear()
+                return
+            if pid == 0:
+                return
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping_since is not None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if code == 0:
+                logger.info(f"Worker {pid} exited (recycled), starting a new one")
+            else:
+                logger.warning(f"Worker {pid} exited with status {code}, starting a new one")
+                if time.monotonic() - started < _RESPAWN_BACKOFF_SECONDS:
+                    time.sleep(_RESPAWN_BACKOFF_SECONDS)
+            self._spawn()
+
+    def run(self):
+        self.bind()
+        logger.info(f"Starting {self.workers} workers")
+        for _ in range(self.workers):
+            self._spawn()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        try:
+            while self.children:
+                self._reap()
+                if (self.stopping_since is not None and not self.killed
+                        and time.monotonic() - self.stopping_since > self.graceful_timeout + 5):
+                    logger.warning("Workers did not stop in time, killing them")
+                    self._signal_children(signal.SIGKILL)
+                    self.killed = True
+                time.sleep(0.2)
+        finally:
+            self.sock.close()
+        logger.info("Pre-fork server stopped")
+
+
+def serve(host: str, port: int, workers: int = None, max_requests: int = None):
+    """
+    Preload the app and run it with forked workers
+
+    Args:
+        host: Interface to bind
+        port: Port to bind
+        workers: Worker processes, defaults to WEB_WORKERS
+        max_requests: Requests before a worker is recycled, defaults to WEB_MAX_REQUESTS (0 = never)
+    """
+    if not hasattr(os, "fork"):
+        raise RuntimeError("The pre-fork server needs os.fork (not available on Windows)")
+    server = PreforkServer(
+        None,  # None: every worker imports the app itself
+        host=host,
+        port=port,
+        workers=workers or settings.WEB_WORKERS,
+        max_requests=settings.WEB_MAX_REQUESTS if max_requests is None else max_requests,
+        max_requests_jitter=settings.WEB_MAX_REQUESTS_JITTER,
+        graceful_timeout=settings.WEB_GRACEFUL_TIMEOUT
+    )
+    # Open the port before loading (and possibly downloading) the model, so
+    # platform port scans and health checks see it immediately
+    server.bind()
+    if settings.WEB_PRELOAD:
+        server.app = preload()
+    server.run()
@@ -0,0 +1,214 @@
+"""
+FAISS index types for the vector store
+
+"flat" is exact brute force and right for a single interview's handful of
+chunks. For a large shared corpus (question library, JDs, reference
+answers) approximate indexes trade a little recall for much lower latency:
+
+    hnsw   graph index, no training, supports incremental adds
+    ivfpq  inverted lists over product-quantized vectors, needs training
+           on a representative sample before vectors can be added
+
+flat and hnsw indexes can also store vectors as float16 or int8 codes
+(faiss scalar quantizers), cutting vector memory by 2x or 4x. Quantized
+search returns approximate distances, so callers that have the exact vectors
+elsewhere (e.g. on disk) re-rank the top candidates against them (see rerank).
+"""
+import numpy as np
+
+from backend.app.core.config import settings
+
+INDEX_TYPES = ("flat", "hnsw", "ivfpq")
+VECTOR_STORAGE = ("float32", "fp16", "int8")
+
+
+def default_index_params() -> dict:
+    """Build and search parameters from settings"""
+    return {
+        "hnsw_m": settings.RAG_HNSW_M,
+        "hnsw_ef_construction": settings.RAG_HNSW_EF_CONSTRUCTION,
+        "hnsw_ef_search": settings.RAG_HNSW_EF_SEARCH,
+        "ivf_nlist": settings.RAG_IVF_NLIST,
+        "ivf_nprobe": settings.RAG_IVF_NPROBE,
+        "pq_m": settings.RAG_PQ_M,
+        "pq_nbits": settings.RAG_PQ_NBITS,
+        "train_size": settings.RAG_TRAIN_SIZE,
+        "storage": settings.RAG_VECTOR_STORAGE,
+    }
+
+
+def min_train_vectors(index_type: str, params: dict) -> int:
+    """Vectors needed before an index of this type can be trained (0 if it needs no training)"""
+    if index_type == "ivfpq":
+        # FAISS wants roughly 39 points per k-means centroid, for both the
+        # coarse quantizer and each PQ codebook
+        return max(params["ivf_nlist"], 2 ** params["pq_nbits"]) * 39
+    return 0
+
+
+def _scalar_quantizer(storage: str):
+    import faiss
+
+    if storage == "fp16":
+        return faiss.ScalarQuantizer.QT_fp16
+    if storage == "int8":
+        return faiss.ScalarQuantizer.QT_8bit_uniform
+    raise ValueError(f"Unknown vector storage '{storage}', expected one of {', '.join(VECTOR_STORAGE)}")
+
+
+def _train_unit_range(index, dimension: int):
+    """
+    Fix the int8 quantization range to [-1, 1]
+
+    Embeddings are L2-normalised, so every component lies in that range and
+    the quantizer needs no data-dependent training (a namespace may only
+    ever hold a few chunks).
+    """
+    bounds = np.stack([-np.ones(dimension), np.ones(dimension)]).astype(np.float32)
+    index.train(bounds)
+
+
+def create_index(index_type: str, dimension: int, params: dict = None):
+    """
+    Create an empty index
+
+    Args:
+        index_type: One of INDEX_TYPES
+        dimension: Vector dimension
+        params: Build parameters, defaults to default_index_params()
+
+    Returns:
+        FAISS index (an ivfpq index still has to be trained)
+    """
+    import faiss
+
+    params = params or default_index_params()
+    storage = params.get("storage", "float32")
+    if index_type == "flat":
+        if storage == "float32":
+            return faiss.IndexFlatL2(dimension)
+        index = faiss.IndexScalarQuantizer(dimension, _scalar_quantizer(storage), faiss.METRIC_L2)
+        _train_unit_range(index, dimension)
+        return index
+    if index_type == "hnsw":
+        if storage == "float32":
+            index = faiss.IndexHNSWFlat(dimension, params["hnsw_m"])
+        else:
+            index = faiss.IndexHNSWSQ(dimension, _scalar_quantizer(storage), params["hnsw_m"])
+            _train_unit_range(index, dimension)
+        index.hnsw.efConstruction = params["hnsw_ef_construction"]
+        index.hnsw.efSearch = params["hnsw_ef_search"]
+        return index
+    if index_type == "ivfpq":
+        if dimension % params["pq_m"]:
+            raise ValueError(f"pq_m={params['pq_m']} must divide the vector dimension {dimension}")
+        quantizer = faiss.IndexFlatL2(dimension)
+        index = faiss.IndexIVFPQ(quantizer, dimension, params["ivf_nlist"], params["pq_m"], params["pq_nbits"])
+        index.nprobe = params["ivf_nprobe"]
+        return index
+    raise ValueError(f"Unknown index type '{index_type}', expected one of {', '.join(INDEX_TYPES)}")
+
+
+def index_type_of(index) -> str:
+    import faiss
+
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivfpq"
+    return "flat"
+
+
+def is_approximate(index) -> bool:
+    """Whether the index returns approximate distances (quantized codes) and needs re-ranking"""
+    import faiss
+
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    return isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexIVFPQ))
+
+
+def vector_bytes(index) -> int:
+    """Memory taken by the stored vector codes (excluding graph / list overhead)"""
+    import faiss
+
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    return getattr(index, "code_size", 0) * index.ntotal
+
+
+def index_bytes(index) -> int:
+    """Memory held by an index: vector codes plus graph links, inverted-list ids and codebooks"""
+    import faiss
+
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexHNSW):
+        hnsw = index.hnsw
+        links = hnsw.neighbors.size() * 4 + hnsw.offsets.size() * 8 + hnsw.levels.size() * 4
+        return index_bytes(index.storage) + links
+    if isinstance(index, faiss.IndexIVFPQ):
+        lists = index.ntotal * (index.code_size + 8)  # codes and int64 ids
+        codebooks = (index.pq.centroids.size() + index.precomputed_table.size()) * 4
+        return lists + codebooks + index_bytes(index.quantizer)
+    return vector_bytes(index)
+
+
+def rerank(query: np.ndarray, ids: list, exact: np.ndarray) -> list:
+    """
+    Order candidate ids by exact L2 distance to the query
+
+    Args:
+        query: float32 query vector
+        ids: Candidate ids from an approximate search
+        exact: float32 vectors of the candidates, one row per id
+
+    Returns:
+        ids sorted from nearest to farthest
+    """
+    distances = np.square(np.asarray(exact, dtype=np.float32) - query).sum(axis=1)
+    return [ids[i] for i in np.argsort(distances, kind="stable")]
+
+
+def set_search_params(index, params: dict):
+    """Apply search-time parameters (efSearch / nprobe) to a built or loaded index"""
+    index_type = index_type_of(index)
+    if index_type == "hnsw" and "hnsw_ef_search" in params:
+        index.hnsw.efSearch = params["hnsw_ef_search"]
+    elif index_type == "ivfpq" and "ivf_nprobe" in params:
+        index.nprobe = params["ivf_nprobe"]
+
+
+def train_index(index, vectors: np.ndarray, train_size: int, seed: int = 1234):
+    """Train an index on a random sample of at most train_size vectors"""
+    if index.is_trained:
+        return
+    if len(vectors) > train_size:
+        rows = np.sort(np.random.default_rng(seed).choice(len(vectors), train_size, replace=False))
+        sample = vectors[rows]
+    else:
+        sample = vectors
+    index.train(np.ascontiguousarray(sample, dtype=np.float32))
+
+
+def build_index(index_type: str, vectors: np.ndarray, params: dict = None, batch_size: int = 65536):
+    """
+    Create, train and fill an index from a (possibly memory-mapped) matrix
+
+    Args:
+        index_type: One of INDEX_TYPES
+        vectors: float32 matrix of shape (n, dimension)
+        params: Build parameters, defaults to default_index_params()
+        batch_size: Rows added per call, so memory-mapped input is paged in gradually
+
+    Returns:
+        The filled index
+    """
+    params = params or default_index_params()
+    index = create_index(index_type, vectors.shape[1], params)
+    needed = min_train_vectors(index_type, params)
+    if len(vectors) < needed:
+        raise ValueError(f"{index_type} needs at least {needed} vectors to train, got {len(vectors)}")
+    train_index(index, vectors, params["train_size"])
+    for start in range(0, len(vectors), batch_size):
+        index.add(np.ascontiguousarray(vectors[start:start + batch_size], dtype=np.float32))
+    return index
@@ -0,0 +1,178 @@
+"""
+Per-interview Gemini chat sessions
+
+Each session keeps the interview's system instruction (type rules plus
+candidate context) and its prior turns, so a new turn only sends the
+candidate's latest answer instead of rebuilding the whole prompt. Sessions
+live in a bounded LRU pool and can be rebuilt from the database when evicted.
+"""
+from collections import OrderedDict
+from typing import Optional
+import logging
+import threading
+
+from backend.app.core.config import settings
+from backend.app.services.gemini_service import gemini_client
+
+logger = logging.getLogger(__name__)
+
+
+class InterviewChatSession:
+    """Conversation state for a single interview"""
+
+    def __init__(self, interview_id: int, interview_type: str, context: str, max_turns: int):
+        self.interview_id = interview_id
+        self.interview_type = interview_type
+        self.max_turns = max_turns
+        self.context = context
+        self.model = gemini_client.create_model(
+            system_instruction=gemini_client.interview_system_instruction(context, interview_type)
+        )
+        self.turns = []  # [{"role": "user" | "model", "parts": [text]}, ...]
+        self.question_count = 0  # questions recorded so far, including turns trimmed by max_turns
+        self.sent_context = set()  # resume/JD chunks already given to the model
+        self.last_error = None  # set when the latest turn failed
+
+    def opening_message(self) -> str:
+        return gemini_client.opening_turn_message(self.interview_type)
+
+    def answer_message(self, answer: str, extra_context: str = "") -> str:
+        return gemini_client.answer_turn_message(self.interview_type, answer, extra_context)
+
+    def record(self, message: str, question: str):
+        """Append a completed (user, model) exchange, keeping only the last max_turns"""
+        self.turns.append({"role": "user", "parts": [message]})
+        self.turns.append({"role": "model", "parts": [question]})
+        self.question_count += 1
+        if len(self.turns) > 2 * self.max_turns:
+            self.turns = self.turns[-2 * self.max_turns:]
+
+    def rewind(self):
+        """Drop the latest exchange, e.g. to regenerate a rejected question"""
+        self.turns = self.turns[:-2]
+        self.question_count -= 1
+
+    def _contents(self, message: str) -> list:
+        return self.turns + [{"role": "user", "parts": [message]}]
+
+    async def ask(self, message: str) -> str:
+        """
+        Send one user turn and return the generated question
+
+        Failed turns are not recorded, so the session stays consistent.
+        """
+        if not self.model:
+            self.last_error = "Error: Gemini API is not properly configured. Please check your API key."
+            return self.last_error
+
+        try:
+            question = await gemini_client.generate_text_async(self._contents(message), model=self.model)
+        except Exception as e:
+            logger.error(f"Gemini chat error for interview {self.interview_id}: {e}")
+            self.last_error = f"Error communicating with Gemini API: {str(e)}"
+            return self.last_error
+
+        self.last_error = None
+        self.record(message, question)
+        return question
+
+    async def stream(self, message: str):
+        """Streaming version of ask, yields text chunks and records the turn at the end"""
+        if not self.model:
+            self.last_error = "Error: Gemini API is not properly configured. Please check your API key."
+            yield self.last_error
+            return
+
+        chunks = []
+        try:
+            async for chunk in gemini_client.stream_text(self._contents(message), model=self.model):
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            logger.error(f"Gemini chat streaming error for interview {self.interview_id}: {e}")
+            self.last_error = f"Error communicating with Gemini API: {str(e)}"
+            yield self.last_error
+            return
+
+        self.last_error = None
+        self.record(message, "".join(chunks).strip())
+
+
+class ChatSessionPool:
+    """Bounded LRU pool of interview chat sessions"""
+
+    def __init__(self, max_sessions: int, max_turns: int):
+        self.max_sessions = max_sessions
+        self.max_turns = max_turns
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, interview_id: int, interview_type: str, question_count: Optional[int] = None) -> Optional[InterviewChatSession]:
+        """
+        Return the live session, or None if it was evicted or the type changed
+
+        Args:
+            interview_id: Interview the session belongs to
+            interview_type: Type of interview (HR, Technical, Aptitude)
+            question_count: Questions stored for the interview; a session that
+                recorded a different number is stale (other workers served
+                turns of this interview) and is not returned
+        """
+        with self._lock:
+            chat = self._sessions.get(interview_id)
+            if chat is None or chat.interview_type != interview_type:
+                return None
+            if question_count is not None and chat.question_count != question_count:
+                logger.info(
+                    f"Chat session for interview {interview_id} is stale "
+                    f"({chat.question_count} questions, {question_count} stored)"
+                )
+                return None
+            self._sessions.move_to_end(interview_id)
+            return chat
+
+    def create(self, interview_id: int, interview_type: str, context: str) -> InterviewChatSession:
+        """Create a fresh session, replacing any existing one for the interview"""
+        chat = InterviewChatSession(interview_id, interview_type, context, self.max_turns)
+        with self._lock:
+            self._sessions[interview_id] = chat
+            self._sessions.move_to_end(interview_id)
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.info(f"Evicted chat session for interview {evicted_id}")
+        return chat
+
+    def rebuild(self, interview_id: int, interview_type: str, context: str, questions: list) -> InterviewChatSession:
+        """
+        Recreate a session from stored questions after eviction
+
+        Args:
+            interview_id: Interview the session belongs to
+            interview_type: Type of interview (HR, Technical, Aptitude)
+            context: Candidate context for the system instruction
+            questions: (question_text, answer_text) pairs in question order
+
+        Returns:
+            The rebuilt session, ready for the next answer turn
+        """
+        chat = self.create(interview_id, interview_type, context)
+        previous_answer = None
+        for i, (question_text, answer_text) in enumerate(questions):
+            message = chat.opening_message() if i == 0 else chat.answer_message(previous_answer or "")
+            chat.record(message, question_text)
+            previous_answer = answer_text
+        return chat
+
+    def drop(self, interview_id: int):
+        with self._lock:
+            self._sessions.pop(interview_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+# Global instance
+chat_sessions = ChatSessionPool(
+    max_sessions=settings.GEMINI_CHAT_POOL_SIZE,
+    max_turns=settings.GEMINI_CHAT_MAX_TURNS
+)
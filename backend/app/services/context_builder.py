@@ -0,0 +1,153 @@
+"""
+Token-budgeted candidate context for Gemini prompts
+
+Instead of pasting the full resume and job description into every prompt,
+pick the chunks from the RAG index that are most relevant to the interview
+type (and the candidate's last answer) until a token budget is reached.
+When the candidate's compact profile is known, it replaces resume excerpts.
+"""
+import logging
+
+from backend.app.core.config import settings
+from backend.app.services.rag import get_rag_engine, DEFAULT_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+# What each interview type cares about in the resume / job description
+TYPE_QUERIES = {
+    "HR": "teamwork leadership communication collaboration roles responsibilities achievements career goals",
+    "Technical": "technical skills programming languages frameworks tools projects system design implementation",
+    "Aptitude": "education qualifications analytical problem solving quantitative skills",
+}
+
+CHARS_PER_TOKEN = 4  # rough average for English text
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for budgeting"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class ContextAssembler:
+    """Select resume/JD chunks for a prompt under a token budget"""
+
+    def __init__(self, rag=None, token_budget: int = 1200, top_k: int = 8):
+        self._rag = rag
+        self.token_budget = token_budget
+        self.top_k = top_k
+
+    @property
+    def rag(self):
+        # Resolved on use so the vector store is only created when needed
+        return self._rag if self._rag is not None else get_rag_engine()
+
+    def _query(self, interview_type: str, last_answer: str = None) -> str:
+        query = TYPE_QUERIES.get(interview_type, TYPE_QUERIES["Technical"])
+        if last_answer:
+            query = f"{last_answer}\n{query}"
+        return query
+
+    def index_documents(self, namespace: str, resume: str, job_description: str):
+        """Index an interview's documents into its own namespace"""
+        self.rag.clear(namespace)
+        self.rag.add_document(resume, namespace=namespace)
+        self.rag.add_document(job_description, namespace=namespace)
+
+    def _truncated(self, resume: str, job_description: str, token_budget: int, profile: str = None) -> str:
+        """Fallback when the index has nothing: split the budget between both documents"""
+        if profile:
+            chars = max(token_budget - estimate_tokens(profile), 0) * CHARS_PER_TOKEN
+            return f"{profile}\n\nJob Description:\n{job_description[:chars]}"
+        half = token_budget * CHARS_PER_TOKEN // 2
+        return f"Resume:\n{resume[:half]}\n\nJob Description:\n{job_description[:half]}"
+
+    def build(
+        self,
+        resume: str,
+        job_description: str,
+        interview_type: str,
+        last_answer: str = None,
+        exclude: set = None,
+        token_budget: int = None,
+        top_k: int = None,
+        fallback: bool = True,
+        namespace: str = DEFAULT_NAMESPACE,
+        profile: str = None
+    ) -> tuple:
+        """
+        Assemble prompt context from the most relevant chunks
+
+        Args:
+            resume: Full resume text of this interview
+            job_description: Full job description of this interview
+            interview_type: Type of interview (HR, Technical, Aptitude)
+            last_answer: Candidate's last answer, used to steer retrieval
+            exclude: Chunks already sent in this conversation
+            token_budget: Max estimated tokens, defaults to CONTEXT_TOKEN_BUDGET
+            top_k: Chunks to retrieve, defaults to CONTEXT_TOP_K
+            fallback: Return truncated documents if retrieval yields nothing
+            namespace: Index namespace of this interview, re-indexed if it was evicted
+            profile: Formatted candidate profile; used instead of resume excerpts,
+                and included unless it is in `exclude`
+
+        Returns:
+            (context string, list of chunks used, including the profile if it was included)
+        """
+        token_budget = token_budget or self.token_budget
+        top_k = top_k or self.top_k
+        exclude = exclude or set()
+        include_profile = bool(profile) and profile not in exclude
+
+        try:
+            if namespace != DEFAULT_NAMESPACE and not self.rag.has_documents(namespace):
+                # With a profile, resume excerpts are never used, so only the JD is indexed
+                self.index_documents(namespace, "" if profile else resume, job_description)
+            candidates = self.rag.search(
+                self._query(interview_type, last_answer),
+                k=top_k + len(exclude),
+                namespace=namespace
+            )
+        except Exception as e:
+            logger.error(f"Context retrieval failed: {e}")
+            candidates = []
+
+        resume_chunks, jd_chunks, used = [], [], []
+        tokens = estimate_tokens(profile) if include_profile else 0
+        for chunk in candidates:
+            if chunk in exclude or chunk in used:
+                continue
+            # Guard against chunks that are not part of this interview's documents
+            if chunk in resume and not profile:
+                target = resume_chunks
+            elif chunk in job_description:
+                target = jd_chunks
+            else:
+                continue
+            cost = estimate_tokens(chunk)
+            if tokens + cost > token_budget:
+                break
+            target.append(chunk)
+            used.append(chunk)
+            tokens += cost
+            if len(used) >= top_k:
+                break
+
+        if not used and fallback:
+            return self._truncated(resume, job_description, token_budget, profile), [profile] if include_profile else []
+
+        parts = []
+        if include_profile:
+            parts.append(profile)
+            used.append(profile)
+        if resume_chunks:
+            parts.append("Resume excerpts:\n" + "\n...\n".join(resume_chunks))
+        if jd_chunks:
+            parts.append("Job Description excerpts:\n" + "\n...\n".join(jd_chunks))
+        return "\n\n".join(parts), used
+
+
+# Global instance
+context_assembler = ContextAssembler(
+    token_budget=settings.CONTEXT_TOKEN_BUDGET,
+    top_k=settings.CONTEXT_TOP_K
+)
@@ -1,13 +1,161 @@
-from sentence_transformers import SentenceTransformer
+"""
+Sentence embeddings for RAG
 
-# Initialize model once
-# This will download the model on first run if not present
-model = SentenceTransformer('all-MiniLM-L6-v2')
+The model is loaded lazily on first use (or by the startup warm-up), so
+importing this module does not block the server from opening its port.
+Chunk embeddings are memoised in a persistent cache, so re-uploaded resumes
+and reused job descriptions are not run through the model again. With
+EMBEDDING_WORKER_ENABLED the model runs in the shared embedding worker
+process instead of in every API worker. EMBEDDING_BACKEND selects PyTorch
+(sentence-transformers) or an int8-quantized ONNX Runtime export.
+"""
+import logging
+import threading
+
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.services.embedding_cache import EmbeddingCache
+from backend.app.services.embedding_worker import embedding_worker_client
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+EMBEDDING_DIMENSION = 384 # All-MiniLM-L6-v2
+
+_model = None
+_model_lock = threading.Lock()
+
+EMBEDDING_BACKENDS = ("torch", "onnx")
+
+def model_id() -> str:
+    """Identifies the model and backend producing the vectors (part of the cache key)."""
+    if settings.EMBEDDING_BACKEND == "onnx":
+        return f"{MODEL_NAME}/onnx-{'int8' if settings.EMBEDDING_ONNX_QUANTIZED else 'fp32'}"
+    return MODEL_NAME
+
+def get_model():
+    """Return the shared embedding model for EMBEDDING_BACKEND, loading it on first call."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if settings.EMBEDDING_BACKEND == "onnx":
+                    from backend.app.services.onnx_embedding import OnnxEmbeddingModel
+                    _model = OnnxEmbeddingModel(
+                        settings.EMBEDDING_ONNX_DIR,
+                        quantized=settings.EMBEDDING_ONNX_QUANTIZED,
+                        threads=settings.EMBEDDING_ONNX_THREADS
+                    )
+                elif settings.EMBEDDING_BACKEND == "torch":
+                    # Imported here because torch alone takes seconds to import
+                    from sentence_transformers import SentenceTransformer
+                    # This will download the model on first run if not present
+                    _model = SentenceTransformer(MODEL_NAME)
+                else:
+                    raise ValueError(
+                        f"Unknown EMBEDDING_BACKEND '{settings.EMBEDDING_BACKEND}', "
+                        f"expected one of {', '.join(EMBEDDING_BACKENDS)}"
+                    )
+    return _model
+
+def is_model_loaded() -> bool:
+    if settings.EMBEDDING_WORKER_ENABLED and embedding_worker_client.ready:
+        return True
+    return _model is not None
+
+_cache = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+def get_embedding_cache():
+    """Return the shared embedding cache, or None when caching is disabled or unavailable."""
+    global _cache, _cache_failed
+    if _cache is None and settings.EMBEDDING_CACHE_ENABLED and not _cache_failed:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                try:
+                    _cache = EmbeddingCache(settings.EMBEDDING_CACHE_DIR, EMBEDDING_DIMENSION, model_id())
+                except Exception as e:
+                    print(f"Embedding cache unavailable: {e}")
+                    _cache_failed = True
+    return _cache
+
+def encode_local(texts: list[str], batch_size: int = None) -> np.ndarray:
+    """Run the model in this process."""
+    vectors = get_model().encode(
+        texts,
+        batch_size=batch_size or settings.EMBEDDING_BATCH_SIZE,
+        convert_to_numpy=True,
+        show_progress_bar=False
+    )
+    return np.ascontiguousarray(vectors, dtype=np.float32)
+
+_worker_fallback_logged = False
+
+def _encode(texts: list[str], batch_size: int = None) -> np.ndarray:
+    global _worker_fallback_logged
+    if settings.EMBEDDING_WORKER_ENABLED:
+        try:
+            vectors = embedding_worker_client.encode(texts)
+            _worker_fallback_logged = False  # log the next outage again
+            return vectors
+        except Exception as e:
+            # Serving with a local copy of the model beats failing the request
+            if not _worker_fallback_logged:
+                _worker_fallback_logged = True
+                logger.warning(f"Embedding worker unavailable, encoding locally: {e}")
+            else:
+                logger.debug(f"Embedding worker unavailable, encoding locally: {e}")
+    return encode_local(texts, batch_size)
 
 def get_embedding(text: str) -> list[float]:
     """Generate embedding for a given text."""
+    vectors = get_embeddings([text])
+    return vectors[0].tolist() if len(vectors) else []
+
+def get_embeddings(texts: list[str], batch_size: int = None, use_cache: bool = True) -> np.ndarray:
+    """
+    Generate embeddings for many texts in batched forward passes.
+
+    Cached texts are served from the embedding cache; only the rest are
+    run through the model (and then added to the cache).
+
+    Returns a float32 matrix of shape (len(texts), EMBEDDING_DIMENSION),
+    or an empty (0, EMBEDDING_DIMENSION) matrix on error.
+    """
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+
+    cache = get_embedding_cache() if use_cache else None
+    if cache is None:
+        try:
+            return _encode(texts, batch_size)
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            return np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+
+    try:
+        vectors, missing = cache.get_many(texts)
+    except Exception as e:
+        print(f"Embedding cache lookup failed: {e}")
+        vectors, missing = np.zeros((len(texts), EMBEDDING_DIMENSION), dtype=np.float32), list(range(len(texts)))
+    if not missing:
+        return vectors
+
+    missing_texts = [texts[i] for i in missing]
+    try:
+        fresh = _encode(missing_texts, batch_size)
+    except Exception as e:
+        print(f"Error generating embeddings: {e}")
+        return np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+    vectors[missing] = fresh
+
     try:
-        return model.encode(text).tolist()
+        cache.put_many(missing_texts, fresh)
     except Exception as e:
-        print(f"Error generating embedding: {e}")
-        return []
+        print(f"Embedding cache write failed: {e}")
+    return vectors
+
+def embedding_cache_stats() -> dict:
+    cache = get_embedding_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
@@ -0,0 +1,157 @@
+"""
+Persistent cache of chunk embeddings
+
+Resumes and job descriptions are re-uploaded across many interviews, so
+their chunks are embedded once and reused. Vectors are appended to a single
+float32 file that is read through a memory map; a small SQLite table maps
+each (model name, normalized chunk hash) key to its row in that file.
+"""
+from typing import Optional
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+try:
+    import fcntl  # serialises appends across worker processes
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_SQL_BATCH = 500  # stay under SQLite's bound-parameter limit
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-insensitive form of a chunk, so reformatted copies share a key"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class EmbeddingCache:
+    """Disk-backed map from chunk text to its embedding vector"""
+
+    def __init__(self, directory: str, dimension: int, model_name: str):
+        self.directory = directory
+        self.dimension = dimension
+        self.model_name = model_name
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.sqlite")
+        self._row_bytes = dimension * 4
+
+        os.makedirs(directory, exist_ok=True)
+        open(self.vectors_path, "ab").close()
+        self._db = sqlite3.connect(self.index_path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, row INTEGER NOT NULL)"
+        )
+        self._db.commit()
+
+        self._mmap = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, text: str) -> str:
+        raw = f"{self.model_name}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _vectors(self, rows_needed: int) -> Optional[np.memmap]:
+        """Memory map of the vector file, re-opened when it has grown past the mapped rows"""
+        if self._mmap is None or len(self._mmap) < rows_needed:
+            rows = os.path.getsize(self.vectors_path) // self._row_bytes
+            self._mmap = None
+            if rows:
+                self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dimension))
+        return self._mmap
+
+    def _lookup_rows(self, keys: list) -> dict:
+        rows = {}
+        for i in range(0, len(keys), _SQL_BATCH):
+            batch = keys[i:i + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows.update(self._db.execute(
+                f"SELECT key, row FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall())
+        return rows
+
+    def get_many(self, texts: list) -> tuple:
+        """
+        Look up embeddings for several texts
+
+        Args:
+            texts: Chunk texts to look up
+
+        Returns:
+            (float32 matrix with one row per text, indices of texts that were not cached);
+            rows of missing texts are left as zeros
+        """
+        keys = [self.make_key(text) for text in texts]
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        missing = []
+        with self._lock:
+            rows = self._lookup_rows(list(set(keys)))
+            mmap = self._vectors(max(rows.values()) + 1) if rows else None
+            for i, key in enumerate(keys):
+                row = rows.get(key)
+                if row is not None and mmap is not None and row < len(mmap):
+                    vectors[i] = mmap[row]
+                else:
+                    missing.append(i)
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        return vectors, missing
+
+    def put_many(self, texts: list, vectors: np.ndarray):
+        """Append embeddings for texts that are not cached yet"""
+        fresh = {}
+        for text, vector in zip(texts, vectors):
+            fresh.setdefault(self.make_key(text), vector)
+        if not fresh:
+            return
+
+        with self._lock:
+            known = self._lookup_rows(list(fresh))
+            fresh = {key: vector for key, vector in fresh.items() if key not in known}
+            if not fresh:
+                return
+            keys = list(fresh)
+            block = np.ascontiguousarray(np.stack([fresh[key] for key in keys]), dtype=np.float32)
+
+            with open(self.vectors_path, "r+b") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    # Vectors are written before their index rows, so a crash only leaves unreferenced rows
+                    size = f.seek(0, os.SEEK_END)
+                    start = size // self._row_bytes
+                    if size % self._row_bytes:
+                        f.truncate(start * self._row_bytes)  # drop a torn row from an interrupted write
+                        f.seek(start * self._row_bytes)
+                    f.write(block.tobytes())
+                    f.flush()
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO embeddings (key, row) VALUES (?, ?)",
+                        [(key, start + i) for i, key in enumerate(keys)]
+                    )
+                    self._db.commit()
+                finally:
+                    if fcntl:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {
+                "model": self.model_name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "disk_bytes": os.path.getsize(self.vectors_path),
+            }
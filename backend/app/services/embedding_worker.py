@@ -0,0 +1,348 @@
+"""
+Shared embedding worker process
+
+One process owns the SentenceTransformer; API workers send it texts over a
+local socket (a Unix socket path, or host:port). Requests that arrive within
+a short window are grouped into a single forward pass, and each connection
+gets its vectors back through a shared-memory buffer it reuses for its
+lifetime, so only a small header travels over the socket.
+
+Connections are pickle-based (multiprocessing.connection), so they are
+authenticated with EMBEDDING_WORKER_AUTHKEY: a Unix socket is only
+accessible to its owner, and a TCP address is refused unless the key is a
+long, dedicated secret.
+
+Run with:  python -m backend.app.services.embedding_worker [--supervise]
+(start.py runs it supervised when EMBEDDING_WORKER_ENABLED is set: the
+worker is restarted whenever it dies)
+"""
+from multiprocessing import shared_memory
+from multiprocessing.connection import Client, Listener
+import argparse
+import logging
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MIN_BUFFER_BYTES = 1 << 20
+_MIN_TCP_AUTHKEY_LENGTH = 32
+_RESPAWN_BACKOFF_SECONDS = 1.0  # a worker that dies this soon after starting is restarted with a delay
+_EXIT_MISCONFIGURED = 78  # EX_CONFIG: restarting would not help
+
+
+def parse_address(address: str):
+    """'host:port' -> TCP address tuple, anything else is a Unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def _authkey() -> bytes:
+    if not settings.EMBEDDING_WORKER_AUTHKEY:
+        raise ValueError("EMBEDDING_WORKER_AUTHKEY is not set")
+    return settings.EMBEDDING_WORKER_AUTHKEY.encode("utf-8")
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to the server's segment without letting this process's resource tracker unlink it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+class _Request:
+    __slots__ = ("texts", "vectors", "error", "done")
+
+    def __init__(self, texts: list):
+        self.texts = texts
+        self.vectors = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _ResultBuffer:
+    """Per-connection shared memory that results are written into (grown when too small)"""
+
+    def __init__(self):
+        self.shm = None
+
+    def write(self, vectors: np.ndarray) -> str:
+        if self.shm is None or self.shm.size < vectors.nbytes:
+            self.close()
+            self.shm = shared_memory.SharedMemory(create=True, size=max(vectors.nbytes, _MIN_BUFFER_BYTES))
+        np.ndarray(vectors.shape, dtype=np.float32, buffer=self.shm.buf)[:] = vectors
+        return self.shm.name
+
+    def close(self):
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+
+
+class EmbeddingWorkerServer:
+    """Accepts embedding requests and runs them through the model in micro-batches"""
+
+    def __init__(self, address: str, max_batch: int, max_wait_ms: float):
+        self.address = parse_address(address)
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._buffers = set()
+
+    def _collect(self) -> list:
+        """Block for one request, then gather more until the batch is full or the window closes"""
+        batch = [self._queue.get()]
+        count = len(batch[0].texts)
+        deadline = time.monotonic() + self.max_wait
+        while count < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            count += len(request.texts)
+        return batch
+
+    def _batch_loop(self):
+        from backend.app.services.embedding import encode_local, get_model
+
+        try:
+            get_model()
+        except Exception as e:
+            logger.error(f"Embedding worker could not load the model: {e}")
+            self._fail_forever(f"model failed to load: {e}")
+        logger.info("Embedding worker model loaded")
+        while True:
+            batch = self._collect()
+            texts = [text for request in batch for text in request.texts]
+            try:
+                vectors = encode_local(texts)
+            except Exception as e:
+                logger.error(f"Embedding worker batch of {len(texts)} failed: {e}")
+                for request in batch:
+                    request.error = str(e)
+                    request.done.set()
+                continue
+            logger.debug(f"Embedded {len(texts)} texts from {len(batch)} requests in one batch")
+
+            start = 0
+            for request in batch:
+                request.vectors = vectors[start:start + len(request.texts)]
+                start += len(request.texts)
+                request.done.set()
+
+    def _fail_forever(self, error: str):
+        """Answer every request with an error, so clients fall back instead of waiting"""
+        while True:
+            for request in self._collect():
+                request.error = error
+                request.done.set()
+
+    def _run_batches(self):
+        try:
+            self._batch_loop()
+        except BaseException as e:
+            logger.exception(f"Embedding worker batch thread crashed: {e}")
+            self._fail_forever(f"batch thread crashed: {e}")
+
+    def _handle(self, conn):
+        buffer = _ResultBuffer()
+        self._buffers.add(buffer)
+        try:
+            while True:
+                request = _Request(conn.recv())
+                self._queue.put(request)
+                request.done.wait()
+                if request.error is not None:
+                    conn.send(("error", request.error))
+                else:
+                    conn.send(("ok", buffer.write(request.vectors), request.vectors.shape))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+            buffer.close()
+            self._buffers.discard(buffer)
+
+    def _listen(self) -> Listener:
+        authkey = _authkey()
+        if isinstance(self.address, tuple):
+            # Anyone who can reach the port and knows the key can run code through pickle
+            if len(authkey) < _MIN_TCP_AUTHKEY_LENGTH:
+                raise ValueError(
+                    f"Refusing to listen on TCP {self.address}: EMBEDDING_WORKER_AUTHKEY "
+                    f"must be at least {_MIN_TCP_AUTHKEY_LENGTH} characters"
+                )
+            return Listener(self.address, authkey=authkey)
+
+        if os.path.exists(self.address):
+            os.remove(self.address)  # stale socket from a previous run
+        umask = os.umask(0o177)  # socket file readable and writable by the owner only
+        try:
+            return Listener(self.address, authkey=authkey)
+        finally:
+            os.umask(umask)
+
+    def serve_forever(self):
+        # Listen before loading the model, so early clients queue instead of being refused
+        listener = self._listen()
+        logger.info(f"Embedding worker listening on {self.address}")
+        threading.Thread(target=self._run_batches, name="embedding-batcher", daemon=True).start()
+        # Exit through the finally block on terminate, so shared memory is unlinked
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception as e:
+                    logger.warning(f"Embedding worker rejected a connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            for buffer in list(self._buffers):
+                buffer.close()
+            listener.close()
+
+
+class EmbeddingWorkerClient:
+    """Thread-safe client; every thread keeps its own connection and result buffer"""
+
+    def __init__(self, address: str, timeout: float):
+        self.address = parse_address(address)
+        self.timeout = timeout
+        self.ready = False  # set after the first successful round trip
+        self._local = threading.local()
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        shm = getattr(self._local, "shm", None)
+        if shm is not None:
+            shm.close()
+        self._local.conn = None
+        self._local.shm = None
+
+    def _round_trip(self, texts: list):
+        if getattr(self._local, "conn", None) is None:
+            self._local.conn = Client(self.address, authkey=_authkey())
+            self._local.shm = None
+        self._local.conn.send(texts)
+        if not self._local.conn.poll(self.timeout):
+            raise TimeoutError(f"No reply from the embedding worker within {self.timeout}s")
+        return self._local.conn.recv()
+
+    def encode(self, texts: list) -> np.ndarray:
+        """
+        Embed texts in the worker process
+
+        Returns:
+            float32 matrix with one row per text
+
+        Raises:
+            OSError: The worker is not reachable
+            TimeoutError: The worker did not answer within EMBEDDING_WORKER_TIMEOUT
+            RuntimeError: The worker failed to embed the batch
+        """
+        texts = list(texts)
+        try:
+            reply = self._round_trip(texts)
+        except TimeoutError:
+            # A late reply would be read as the answer to the next request
+            self._reset()
+            raise
+        except (EOFError, OSError):
+            # The worker may have restarted; reconnect once
+            self._reset()
+            try:
+                reply = self._round_trip(texts)
+            except (EOFError, OSError):
+                self._reset()
+                raise
+
+        if reply[0] == "error":
+            raise RuntimeError(f"Embedding worker error: {reply[1]}")
+
+        _, name, shape = reply
+        if self._local.shm is None or self._local.shm.name != name:
+            if self._local.shm is not None:
+                self._local.shm.close()
+            self._local.shm = _attach(name)
+        vectors = np.ndarray(shape, dtype=np.float32, buffer=self._local.shm.buf).copy()
+        self.ready = True
+        return vectors
+
+
+# Global instance (connects lazily, per thread)
+embedding_worker_client = EmbeddingWorkerClient(settings.EMBEDDING_WORKER_ADDRESS, settings.EMBEDDING_WORKER_TIMEOUT)
+
+
+def supervise():
+    """
+    Run the worker in a child process and restart it whenever it exits
+
+    Runs in its own process (started by start.py) rather than as a thread, so
+    the pre-fork master stays free of threads. SIGTERM/SIGINT stop the worker
+    and the supervisor.
+    """
+    state = {"stopping": False, "child": None}
+
+    def stop(signum, frame):
+        state["stopping"] = True
+        if state["child"] is not None and state["child"].poll() is None:
+            state["child"].terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while not state["stopping"]:
+        started = time.monotonic()
+        state["child"] = child = subprocess.Popen([sys.executable, "-m", "backend.app.services.embedding_worker"])
+        if state["stopping"]:
+            child.terminate()
+        code = child.wait()
+        if state["stopping"]:
+            break
+        if code == _EXIT_MISCONFIGURED:
+            logger.error("Embedding worker is misconfigured, not restarting it")
+            break
+        logger.warning(f"Embedding worker exited with status {code}, starting a new one")
+        if time.monotonic() - started < _RESPAWN_BACKOFF_SECONDS:
+            time.sleep(_RESPAWN_BACKOFF_SECONDS)
+    logger.info("Embedding worker supervisor stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Shared embedding worker")
+    parser.add_argument("--supervise", action="store_true", help="restart the worker whenever it exits")
+    if parser.parse_args().supervise:
+        supervise()
+    else:
+        try:
+            EmbeddingWorkerServer(
+                settings.EMBEDDING_WORKER_ADDRESS,
+                max_batch=settings.EMBEDDING_WORKER_MAX_BATCH,
+                max_wait_ms=settings.EMBEDDING_WORKER_MAX_WAIT_MS
+            ).serve_forever()
+        except ValueError as e:
+            logger.error(f"Embedding worker not started: {e}")
+            sys.exit(_EXIT_MISCONFIGURED)
@@ -1,98 +1,15 @@
 import google.generativeai as genai
 from backend.app.core.config import settings
+import asyncio
+import json
 import logging
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-class GeminiService:
-    """Service for interacting with Google Gemini API"""
-    
-    def __init__(self):
-        """Initialize Gemini API with API key from settings"""
-        if not settings.GEMINI_API_KEY:
-            logger.warning("GEMINI_API_KEY not set in environment variables")
-        else:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
-        
-        self.model_name = settings.GEMINI_MODEL
-        self.model = None
-        self._initialize_model()
-    
-    def _initialize_model(self):
-        """Initialize the Gemini model"""
-        try:
-            self.model = genai.GenerativeModel(self.model_name)
-            logger.info(f"Gemini model '{self.model_name}' initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Gemini model: {e}")
-            self.model = None
-    
-    def chat_completion(
-        self, 
-        user_message: str, 
-        system_message: str = "You are a helpful AI assistant.",
-        conversation_history: list = None
-    ) -> str:
-        """
-        Generate a chat completion using Gemini API
-        
-        Args:
-            user_message: The user's message
-            system_message: System prompt to set context
-            conversation_history: List of previous messages [{"role": "user", "content": "..."}, ...]
-        
-        Returns:
-            The AI's response as a string
-        """
-        if not self.model:
-            return "Error: Gemini API is not properly configured. Please check your API key."
-        
-        try:
-            # Build the prompt with system message and conversation history
-            full_prompt = f"{system_message}\n\n"
-            
-            if conversation_history:
-                for msg in conversation_history:
-                    role = msg.get("role", "user")
-                    content = msg.get("content", "")
-                    prefix = "User: " if role == "user" else "Assistant: "
-                    full_prompt += f"{prefix}{content}\n\n"
-            
-            full_prompt += f"User: {user_message}\n\nAssistant:"
-            
-            # Generate response
-            response = self.model.generate_content(full_prompt)
-            
-            if response and response.text:
-                return response.text.strip()
-            else:
-                logger.warning("Empty response from Gemini API")
-                return "I apologize, but I couldn't generate a response. Please try again."
-                
-        except Exception as e:
-            logger.error(f"Gemini API error: {e}")
-            return f"Error communicating with Gemini API: {str(e)}"
-    
-    def generate_interview_question(
-        self,
-        context: str,
-        interview_type: str,
-        previous_qa: list = None
-    ) -> str:
-        """
-        Generate an interview question based on context and type
-        
-        Args:
-            context: Resume and job description context
-            interview_type: Type of interview (HR, Technical, Aptitude)
-            previous_qa: Previous questions and answers
-        
-        Returns:
-            Generated interview question
-        """
-        # Detailed type-specific prompts with STRICT enforcement
-        type_prompts = {
-            "HR": """You are an HR interviewer. You MUST ONLY ask behavioral and soft-skills questions.
+# Detailed type-specific prompts with STRICT enforcement
+INTERVIEW_TYPE_PROMPTS = {
+    "HR": """You are an HR interviewer. You MUST ONLY ask behavioral and soft-skills questions.
 
 STRICT RULES - YOU MUST FOLLOW THESE:
 1. DO NOT ask about technical projects, coding, or programming
@@ -122,7 +39,7 @@ EXAMPLE QUESTIONS (USE SIMILAR):
 
 REMEMBER: This is an HR interview - NO technical or project questions allowed!""",
 
-            "Technical": """You are a Technical interviewer. You MUST ONLY ask about technical skills, coding, and technology.
+    "Technical": """You are a Technical interviewer. You MUST ONLY ask about technical skills, coding, and technology.
 
 STRICT RULES - YOU MUST FOLLOW THESE:
 1. ONLY ask about technologies mentioned in resume or job description
@@ -151,7 +68,7 @@ EXAMPLE QUESTIONS (USE SIMILAR):
 
 REMEMBER: This is a Technical interview - focus on code, tech stack, and implementation!""",
 
-            "Aptitude": """You are an Aptitude test interviewer. You MUST ONLY ask logical, mathematical, and analytical questions.
+    "Aptitude": """You are an Aptitude test interviewer. You MUST ONLY ask logical, mathematical, and analytical questions.
 
 STRICT RULES - YOU MUST FOLLOW THESE:
 1. ONLY ask math problems, puzzles, and logical reasoning questions
@@ -179,11 +96,206 @@ EXAMPLE QUESTIONS (USE SIMILAR):
 - "If 5 machines make 5 widgets in 5 minutes, how long for 100 machines to make 100 widgets?"
 
 REMEMBER: This is an Aptitude test - NO resume-based or behavioral questions!"""
-        }
+}
+
+
+class GeminiService:
+    """Service for interacting with Google Gemini API"""
+    
+    def __init__(self):
+        """Initialize Gemini API with API key from settings"""
+        if not settings.GEMINI_API_KEY:
+            logger.warning("GEMINI_API_KEY not set in environment variables")
+        else:
+            genai.configure(api_key=settings.GEMINI_API_KEY)
+        
+        self.model_name = settings.GEMINI_MODEL
+        self.model = None
+        self._semaphore = None
+        self._initialize_model()
+    
+    def _initialize_model(self):
+        """Initialize the Gemini model"""
+        try:
+            self.model = genai.GenerativeModel(self.model_name)
+            logger.info(f"Gemini model '{self.model_name}' initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Gemini model: {e}")
+            self.model = None
+    
+    def _build_prompt(
+        self,
+        user_message: str,
+        system_message: str,
+        conversation_history: list = None
+    ) -> str:
+        """Flatten the system message, history and user message into one prompt"""
+        full_prompt = f"{system_message}\n\n"
+        
+        if conversation_history:
+            for msg in conversation_history:
+                role = msg.get("role", "user")
+                content = msg.get("content", "")
+                prefix = "User: " if role == "user" else "Assistant: "
+                full_prompt += f"{prefix}{content}\n\n"
+        
+        full_prompt += f"User: {user_message}\n\nAssistant:"
+        return full_prompt
+    
+    def _request_options(self) -> dict:
+        """Per-request options shared by the sync and async paths"""
+        return {"timeout": settings.GEMINI_REQUEST_TIMEOUT}
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Bound the number of in-flight async Gemini calls per worker"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENT_REQUESTS)
+        return self._semaphore
+    
+    def chat_completion(
+        self, 
+        user_message: str, 
+        system_message: str = "You are a helpful AI assistant.",
+        conversation_history: list = None
+    ) -> str:
+        """
+        Generate a chat completion using Gemini API
+        
+        Args:
+            user_message: The user's message
+            system_message: System prompt to set context
+            conversation_history: List of previous messages [{"role": "user", "content": "..."}, ...]
         
+        Returns:
+            The AI's response as a string
+        """
+        if not self.model:
+            return "Error: Gemini API is not properly configured. Please check your API key."
+        
+        try:
+            full_prompt = self._build_prompt(user_message, system_message, conversation_history)
+            
+            # Generate response
+            response = self.model.generate_content(full_prompt, request_options=self._request_options())
+            
+            if response and response.text:
+                return response.text.strip()
+            else:
+                logger.warning("Empty response from Gemini API")
+                return "I apologize, but I couldn't generate a response. Please try again."
+                
+        except Exception as e:
+            logger.error(f"Gemini API error: {e}")
+            return f"Error communicating with Gemini API: {str(e)}"
+    
+    def create_model(self, system_instruction: str = None):
+        """
+        Create a model bound to a system instruction (e.g. for one interview)
+        
+        Returns:
+            A GenerativeModel, or None if it could not be created
+        """
+        try:
+            return genai.GenerativeModel(self.model_name, system_instruction=system_instruction)
+        except Exception as e:
+            logger.error(f"Failed to create Gemini model: {e}")
+            return None
+    
+    async def generate_text_async(self, contents, model=None) -> str:
+        """
+        Run one async generation and return the response text.
+        
+        Goes through the SDK's shared gRPC asyncio client, so the connection
+        is reused across calls. Raises on API errors.
+        
+        Args:
+            contents: A prompt string or a list of {"role", "parts"} turns
+            model: Model to use, defaults to the service's model
+        
+        Returns:
+            The stripped response text
+        """
+        model = model or self.model
+        async with self._get_semaphore():
+            response = await model.generate_content_async(
+                contents,
+                request_options=self._request_options()
+            )
+        
+        if response and response.text:
+            return response.text.strip()
+        logger.warning("Empty response from Gemini API")
+        return "I apologize, but I couldn't generate a response. Please try again."
+    
+    async def stream_text(self, contents, model=None):
+        """
+        Stream one async generation chunk by chunk. Raises on API errors.
+        
+        Args:
+            contents: A prompt string or a list of {"role", "parts"} turns
+            model: Model to use, defaults to the service's model
+        
+        Yields:
+            Text chunks as they arrive
+        """
+        model = model or self.model
+        async with self._get_semaphore():
+            response = await model.generate_content_async(
+                contents,
+                stream=True,
+                request_options=self._request_options()
+            )
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. the final finish-reason chunk)
+                    continue
+                if text:
+                    yield text
+    
+    async def chat_completion_async(
+        self, 
+        user_message: str, 
+        system_message: str = "You are a helpful AI assistant.",
+        conversation_history: list = None
+    ) -> str:
+        """
+        Async version of chat_completion that does not block the event loop
+        
+        Args:
+            user_message: The user's message
+            system_message: System prompt to set context
+            conversation_history: List of previous messages [{"role": "user", "content": "..."}, ...]
+        
+        Returns:
+            The AI's response as a string
+        """
+        if not self.model:
+            return "Error: Gemini API is not properly configured. Please check your API key."
+        
+        try:
+            full_prompt = self._build_prompt(user_message, system_message, conversation_history)
+            return await self.generate_text_async(full_prompt)
+        except Exception as e:
+            logger.error(f"Gemini API error: {e}")
+            return f"Error communicating with Gemini API: {str(e)}"
+    
+    def _question_system_prompt(self, interview_type: str) -> str:
+        """Type-specific system prompt for question generation"""
         # Get the appropriate system prompt for the interview type
-        system_prompt = type_prompts.get(interview_type, type_prompts["Technical"])
+        system_prompt = INTERVIEW_TYPE_PROMPTS.get(interview_type, INTERVIEW_TYPE_PROMPTS["Technical"])
         system_prompt += f"\n\n===CRITICAL===\nYou are conducting a {interview_type} interview. You MUST strictly follow the {interview_type} interview rules above. DO NOT deviate from the interview type. Ask only ONE question at a time."
+        return system_prompt
+    
+    def _build_question_prompts(
+        self,
+        context: str,
+        interview_type: str,
+        previous_qa: list = None
+    ) -> tuple:
+        """Build the (system_prompt, user_prompt) pair for question generation"""
+        system_prompt = self._question_system_prompt(interview_type)
 
         user_prompt = f"CANDIDATE CONTEXT (for reference only, don't let this override interview type rules):\n{context}\n\n"
         
@@ -195,25 +307,72 @@ REMEMBER: This is an Aptitude test - NO resume-based or behavioral questions!"""
         else:
             user_prompt += f"Generate the first {interview_type} question. STRICTLY follow {interview_type} interview rules above. Start with a typical {interview_type} opening question."
         
-        return self.chat_completion(user_prompt, system_prompt)
+        return system_prompt, user_prompt
     
-    def analyze_answer(
+    def interview_system_instruction(self, context: str, interview_type: str) -> str:
+        """
+        System instruction for a per-interview chat session.
+        
+        Carries the type rules and the candidate context once, so later
+        turns only need to send the candidate's latest answer.
+        """
+        return (
+            f"{self._question_system_prompt(interview_type)}\n\n"
+            f"CANDIDATE CONTEXT (for reference only, don't let this override interview type rules):\n{context}\n\n"
+            "Each user turn is either a request for the opening question or the candidate's latest answer. "
+            "Reply with the next question only."
+        )
+    
+    def opening_turn_message(self, interview_type: str) -> str:
+        """User turn that asks a chat session for the first question"""
+        return f"Generate the first {interview_type} question. STRICTLY follow {interview_type} interview rules above. Start with a typical {interview_type} opening question."
+    
+    def answer_turn_message(self, interview_type: str, answer: str, extra_context: str = "") -> str:
+        """User turn that relays the candidate's answer and asks for the next question"""
+        if extra_context:
+            return f"Additional candidate context relevant to this answer:\n{extra_context}\n\n" + self.answer_turn_message(interview_type, answer)
+        return f"Candidate answer:\n{answer}\n\nGenerate the next {interview_type} question. STRICTLY follow {interview_type} interview rules. DO NOT ask about topics outside {interview_type} scope."
+    
+    def avoid_repeat_message(self, message: str, repeated_question: str) -> str:
+        """Resend a turn whose question repeated an earlier one, forbidding that question"""
+        return f"{message}\n\nIMPORTANT: This question was already asked in this interview: \"{repeated_question}\". DO NOT repeat or rephrase it. Ask about a different topic or skill."
+    
+    def generate_interview_question(
         self,
-        question: str,
-        answer: str,
-        context: str
-    ) -> dict:
+        context: str,
+        interview_type: str,
+        previous_qa: list = None
+    ) -> str:
         """
-        Analyze the quality of an interview answer
+        Generate an interview question based on context and type
         
         Args:
-            question: The interview question
-            answer: The candidate's answer
             context: Resume and job description context
+            interview_type: Type of interview (HR, Technical, Aptitude)
+            previous_qa: Previous questions and answers
         
         Returns:
-            Dictionary with analysis metrics
+            Generated interview question
         """
+        system_prompt, user_prompt = self._build_question_prompts(context, interview_type, previous_qa)
+        return self.chat_completion(user_prompt, system_prompt)
+    
+    def _parse_json_response(self, response: str) -> dict:
+        """Extract and parse a JSON object, stripping markdown code fences if present"""
+        if "```json" in response:
+            response = response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            response = response.split("```")[1].split("```")[0].strip()
+        
+        return json.loads(response)
+    
+    def _build_analysis_prompts(
+        self,
+        question: str,
+        answer: str,
+        context: str
+    ) -> tuple:
+        """Build the (system_prompt, user_prompt) pair for answer analysis"""
         system_prompt = """You are an expert interview evaluator. 
 Analyze the candidate's answer and provide structured feedback in JSON format with these fields:
 - accuracy_score (0-10): How well the answer addresses the question
@@ -231,18 +390,12 @@ Answer: {answer}
 
 Provide your analysis in JSON format."""
 
-        response = self.chat_completion(user_prompt, system_prompt)
-        
-        # Try to parse JSON response
+        return system_prompt, user_prompt
+    
+    def _parse_analysis(self, response: str) -> dict:
+        """Parse an answer analysis, falling back to neutral scores"""
         try:
-            import json
-            # Extract JSON from response if it's wrapped in markdown
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response)
+            return self._parse_json_response(response)
         except Exception as e:
             logger.error(f"Failed to parse analysis response: {e}")
             return {
@@ -254,23 +407,34 @@ Provide your analysis in JSON format."""
                 "feedback": "Unable to analyze the answer at this time."
             }
     
-    def generate_performance_report(
+    def analyze_answer(
         self,
-        questions_answers: list,
-        context: str,
-        interview_type: str
+        question: str,
+        answer: str,
+        context: str
     ) -> dict:
         """
-        Generate comprehensive performance report for the interview
+        Analyze the quality of an interview answer
         
         Args:
-            questions_answers: List of Q&A pairs
-            context: Resume and job description
-            interview_type: Type of interview
+            question: The interview question
+            answer: The candidate's answer
+            context: Resume and job description context
         
         Returns:
-            Performance report dictionary
+            Dictionary with analysis metrics
         """
+        system_prompt, user_prompt = self._build_analysis_prompts(question, answer, context)
+        response = self.chat_completion(user_prompt, system_prompt)
+        return self._parse_analysis(response)
+    
+    def _build_report_prompts(
+        self,
+        questions_answers: list,
+        context: str,
+        interview_type: str
+    ) -> tuple:
+        """Build the (system_prompt, user_prompt) pair for the performance report"""
         system_prompt = """You are an expert interview evaluator creating a comprehensive performance report.
 Provide structured feedback in JSON format with:
 - overall_score (0-100): Overall interview performance
@@ -295,16 +459,12 @@ Interview Transcript:
 
 Provide a comprehensive performance analysis in JSON format."""
 
-        response = self.chat_completion(user_prompt, system_prompt)
-        
+        return system_prompt, user_prompt
+    
+    def _parse_report(self, response: str) -> dict:
+        """Parse a performance report, falling back to a neutral report"""
         try:
-            import json
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0].strip()
-            
-            return json.loads(response)
+            return self._parse_json_response(response)
         except Exception as e:
             logger.error(f"Failed to parse performance report: {e}")
             return {
@@ -317,6 +477,81 @@ Provide a comprehensive performance analysis in JSON format."""
                 "improvements": ["Try again later"],
                 "summary": "Unable to generate detailed report at this time."
             }
+    
+    def generate_performance_report(
+        self,
+        questions_answers: list,
+        context: str,
+        interview_type: str
+    ) -> dict:
+        """
+        Generate comprehensive performance report for the interview
+        
+        Args:
+            questions_answers: List of Q&A pairs
+            context: Resume and job description
+            interview_type: Type of interview
+        
+        Returns:
+            Performance report dictionary
+        """
+        system_prompt, user_prompt = self._build_report_prompts(questions_answers, context, interview_type)
+        response = self.chat_completion(user_prompt, system_prompt)
+        return self._parse_report(response)
+    
+    async def generate_performance_report_async(
+        self,
+        questions_answers: list,
+        context: str,
+        interview_type: str
+    ) -> dict:
+        """Async version of generate_performance_report"""
+        system_prompt, user_prompt = self._build_report_prompts(questions_answers, context, interview_type)
+        response = await self.chat_completion_async(user_prompt, system_prompt)
+        return self._parse_report(response)
+
+    def _build_profile_prompts(self, resume: str) -> tuple:
+        """Build the (system_prompt, user_prompt) pair for candidate profile extraction"""
+        system_prompt = """You extract a compact candidate profile from a resume.
+Respond in JSON format with:
+- skills (list): Technologies, tools and skills, most prominent first (max 25)
+- roles (list): Job titles with employer, most recent first (max 6)
+- years_experience (number or null): Total years of professional experience
+- projects (list): One short line per notable project or achievement (max 5)
+- education (list): Degrees or certifications (max 3)
+Use only information stated in the resume. Keep every entry short."""
+
+        user_prompt = f"""Resume:
+{resume[:settings.RESUME_PROFILE_MAX_CHARS]}
+
+Provide the candidate profile in JSON format."""
+
+        return system_prompt, user_prompt
+    
+    def _parse_profile(self, response: str) -> Optional[dict]:
+        """Parse a candidate profile; None if the response is not a usable profile"""
+        try:
+            profile = self._parse_json_response(response)
+        except Exception as e:
+            logger.error(f"Failed to parse candidate profile: {e}")
+            return None
+        if not isinstance(profile, dict) or not any(profile.get(k) for k in ("skills", "roles", "projects")):
+            return None
+        return profile
+    
+    async def extract_candidate_profile_async(self, resume: str) -> Optional[dict]:
+        """
+        Extract a compact structured profile from resume text
+        
+        Args:
+            resume: Full resume text
+        
+        Returns:
+            Profile dictionary (skills, roles, years_experience, projects, education), or None on failure
+        """
+        system_prompt, user_prompt = self._build_profile_prompts(resume)
+        response = await self.chat_completion_async(user_prompt, system_prompt)
+        return self._parse_profile(response)
 
 # Global instance
 gemini_client = GeminiService()
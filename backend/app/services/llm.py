@@ -25,6 +25,23 @@ class LLMService:
         except Exception as e:
             print(f"LLM Chat Error: {e}")
             return "I'm having trouble generating a response. Please try again."
+    
+    async def chat_completion_async(self, user_message: str, system_message: str = "You are a helpful assistant.") -> str:
+        """
+        Async chat completion using Gemini API (does not block the event loop)
+        
+        Args:
+            user_message: The user's message
+            system_message: System prompt to set context
+        
+        Returns:
+            The AI's response as a string
+        """
+        try:
+            return await self.gemini.chat_completion_async(user_message, system_message)
+        except Exception as e:
+            print(f"LLM Chat Error: {e}")
+            return "I'm having trouble generating a response. Please try again."
 
 # Global instance
 llm_client = LLMService()
@@ -0,0 +1,168 @@
+"""
+ONNX Runtime backend for the embedding model
+
+Runs an exported, int8-quantized copy of the sentence-transformers model on
+CPU without PyTorch. The export writes the model's own tokenizer next to it,
+and encoding reproduces the sentence-transformers pipeline for MiniLM
+(transformer -> attention-masked mean pooling -> L2 normalisation), so the
+vectors are compatible with the PyTorch ones (see bench_embeddings.py and
+backend/tests/test_onnx_parity.py).
+
+Export once (needs torch, sentence-transformers, onnx and onnxruntime):
+    python -m backend.app.services.onnx_embedding [output_dir]
+"""
+import json
+import logging
+import os
+import sys
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+CONFIG_FILE = "embedding_config.json"
+
+
+class OnnxEmbeddingModel:
+    """Drop-in replacement for SentenceTransformer.encode backed by ONNX Runtime"""
+
+    def __init__(self, model_dir: str, quantized: bool = True, threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, CONFIG_FILE)) as f:
+            config = json.load(f)
+        self.max_seq_length = config["max_seq_length"]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.no_padding()  # batches are padded to their own longest text
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        model_path = os.path.join(model_dir, QUANTIZED_MODEL_FILE if quantized else MODEL_FILE)
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _run(self, encodings: list) -> np.ndarray:
+        length = max(len(e.ids) for e in encodings)
+        input_ids = np.zeros((len(encodings), length), dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), length), dtype=np.int64)
+        token_type_ids = np.zeros((len(encodings), length), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            n = len(encoding.ids)
+            input_ids[row, :n] = encoding.ids
+            attention_mask[row, :n] = 1
+            token_type_ids[row, :n] = encoding.type_ids
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": token_type_ids}
+        hidden = self.session.run(None, {name: value for name, value in feeds.items() if name in self.input_names})[0]
+
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        """
+        Embed texts (extra SentenceTransformer.encode keyword arguments are ignored)
+
+        Returns:
+            float32 matrix, or a single vector when given a single string
+        """
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        vectors = np.zeros((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        if texts:
+            encodings = self.tokenizer.encode_batch(texts)
+            # Batch texts of similar length together to minimise padding
+            order = np.argsort([len(e.ids) for e in encodings], kind="stable")
+            for start in range(0, len(order), batch_size):
+                rows = order[start:start + batch_size]
+                vectors[rows] = self._run([encodings[i] for i in rows])
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.session.get_outputs()[0].shape[-1]
+
+
+def parity(reference: np.ndarray, candidate: np.ndarray, k: int = 5) -> dict:
+    """
+    Agreement of two backends' embeddings of the same texts
+
+    Returns:
+        min/mean per-text cosine similarity, and the mean overlap of each
+        text's top-k nearest neighbours among the other texts
+    """
+    ref = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    cand = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosine = (ref * cand).sum(axis=1)
+
+    k = min(k, len(ref) - 1)
+    ref_top = np.argsort(-(ref @ ref.T), axis=1)[:, 1:k + 1]
+    cand_top = np.argsort(-(cand @ cand.T), axis=1)[:, 1:k + 1]
+    overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(ref_top, cand_top)])
+    return {"min_cosine": float(cosine.min()), "mean_cosine": float(cosine.mean()), "topk_overlap": float(overlap)}
+
+
+def export_model(model_name: str, output_dir: str):
+    """
+    Export a sentence-transformers model to ONNX and quantize its weights to int8
+
+    Args:
+        model_name: sentence-transformers model to export
+        output_dir: Directory for the ONNX files, tokenizer and config
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(output_dir, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+
+    sample = st_model.tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    class _LastHiddenState(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs))).last_hidden_state
+
+    model_path = os.path.join(output_dir, MODEL_FILE)
+    with torch.no_grad():
+        export_kwargs = dict(
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+        try:
+            torch.onnx.export(_LastHiddenState(transformer), tuple(sample[n] for n in input_names), model_path,
+                              dynamo=False, **export_kwargs)
+        except TypeError:  # torch < 2.5 has no dynamo flag
+            torch.onnx.export(_LastHiddenState(transformer), tuple(sample[n] for n in input_names), model_path,
+                              **export_kwargs)
+
+    quantize_dynamic(model_path, os.path.join(output_dir, QUANTIZED_MODEL_FILE), weight_type=QuantType.QInt8)
+    st_model.tokenizer.backend_tokenizer.save(os.path.join(output_dir, TOKENIZER_FILE))
+    with open(os.path.join(output_dir, CONFIG_FILE), "w") as f:
+        json.dump({"model_name": model_name, "max_seq_length": st_model.max_seq_length}, f)
+    logger.info(f"Exported {model_name} to {output_dir}")
+
+
+if __name__ == "__main__":
+    from backend.app.core.config import settings
+    from backend.app.services.embedding import MODEL_NAME
+
+    logging.basicConfig(level=logging.INFO)
+    export_model(MODEL_NAME, sys.argv[1] if len(sys.argv) > 1 else settings.EMBEDDING_ONNX_DIR)
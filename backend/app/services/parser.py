@@ -1,35 +1,246 @@
+"""
+Resume parsing
+
+PyPDF2 and python-docx are pure-Python and CPU-bound, so extraction runs in
+a small process pool instead of on the event loop, with a deadline per file.
+Large PDFs are split into page ranges that are extracted in parallel.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union
+import asyncio
+import contextvars
+import functools
+import io
+import logging
+import multiprocessing
+import threading
+import time
+
 import PyPDF2
 from docx import Document
-import io
 
-async def parse_pdf(file_bytes: bytes) -> str:
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeParseTimeout(Exception):
+    """Parsing a file took longer than PARSER_TIMEOUT_SECONDS"""
+
+
+# A resume is passed around as its bytes or, cheaper, as the path of the stored upload
+Source = Union[bytes, str]
+
+
+def _open(source: Source):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+# --- Extraction (runs in pool processes) ---
+
+def pdf_page_count(source: Source) -> int:
+    return len(PyPDF2.PdfReader(_open(source)).pages)
+
+
+def extract_pdf_pages(source: Source, start: int = 0, stop: Optional[int] = None) -> list:
+    """Text of pages [start, stop), one string per page"""
+    reader = PyPDF2.PdfReader(_open(source))
+    pages = reader.pages
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    return [pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def extract_docx(source: Source) -> str:
+    doc = Document(_open(source))
+    return "\n".join(para.text for para in doc.paragraphs)
+
+
+# --- Worker pool ---
+#
+# A timed-out extraction cannot be cancelled, only killed with its process,
+# and the pool does not tell which process runs which task. So the pool is
+# retired instead: new work goes to a fresh pool, and the old one is shut
+# down once the other uploads' tasks on it have finished.
+
+_pool = None
+_pool_lock = threading.Lock()
+_in_flight = {}  # pool -> its unfinished futures
+_abandoned = {}  # retired pool -> futures whose parse timed out
+_in_flight_lock = threading.Lock()
+# (pool, future) of every task submitted by the current parse, see _with_deadline
+_submitted = contextvars.ContextVar("parser_submitted", default=None)
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    # spawn: the API process runs threads (and model runtimes) that must not be forked
+    return ProcessPoolExecutor(
+        max_workers=settings.PARSER_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def _finished(pool: ProcessPoolExecutor, future: Future):
+    with _in_flight_lock:
+        _in_flight.get(pool, set()).discard(future)
+
+
+def _submit(fn, *args) -> tuple:
+    """Run fn(*args) on the current pool (created on first use), returning (pool, future)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _new_pool()
+        pool = _pool
+        future = pool.submit(fn, *args)
+        with _in_flight_lock:
+            _in_flight.setdefault(pool, set()).add(future)
+    future.add_done_callback(functools.partial(_finished, pool))
+    submitted = _submitted.get()
+    if submitted is not None:
+        submitted.append((pool, future))
+    return pool, future
+
+
+def _retire_pool(pool: ProcessPoolExecutor, abandoned: set = frozenset()):
+    """Send new work to a fresh pool; `pool` is terminated once all but its abandoned tasks are done"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    with _in_flight_lock:
+        reaping = pool in _abandoned
+        _abandoned.setdefault(pool, set()).update(abandoned)
+    if not reaping:
+        threading.Thread(target=_reap_pool, args=(pool,), name="parser-pool-reaper", daemon=True).start()
+
+
+def _reap_pool(pool: ProcessPoolExecutor):
+    # The remaining tasks belong to parses with their own deadlines, so this wait is bounded
+    deadline = time.monotonic() + 2 * settings.PARSER_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        with _in_flight_lock:
+            remaining = _in_flight.get(pool, set()) - _abandoned[pool]
+        if not remaining:
+            break
+        wait(remaining, timeout=0.5)
+    with _in_flight_lock:
+        _in_flight.pop(pool, None)
+        _abandoned.pop(pool, None)
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def shutdown_parser_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run(fn, *args):
+    pool, future = _submit(fn, *args)
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        # A worker died (e.g. out of memory on a hostile file); later uploads get a fresh pool
+        _retire_pool(pool)
+        raise
+
+
+async def _extract_pdf(source: Source) -> str:
+    pages_per_task = settings.PARSER_PDF_PAGES_PER_TASK
+    page_count = await _run(pdf_page_count, source)
+    if page_count <= pages_per_task or settings.PARSER_WORKERS < 2:
+        pages = await _run(extract_pdf_pages, source, 0, page_count)
+    else:
+        ranges = await asyncio.gather(*(
+            _run(extract_pdf_pages, source, start, start + pages_per_task)
+            for start in range(0, page_count, pages_per_task)
+        ))
+        pages = [page for chunk in ranges for page in chunk]
+    return "".join(pages)
+
+
+async def _with_deadline(coro, filename: str):
+    submitted = []
+    token = _submitted.set(submitted)
     try:
-        reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() or ""
-        return text
+        return await asyncio.wait_for(coro, timeout=settings.PARSER_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        # Queued tasks were cancelled with the coroutine; only ones already handed to a process are stuck
+        stuck = {}
+        for pool, future in submitted:
+            if not future.done():
+                stuck.setdefault(pool, set()).add(future)
+        if stuck:
+            logger.warning(f"Parsing {filename} exceeded {settings.PARSER_TIMEOUT_SECONDS}s, retiring the parser pool")
+        for pool, futures in stuck.items():
+            _retire_pool(pool, futures)
+        raise ResumeParseTimeout(filename)
+    finally:
+        _submitted.reset(token)
+
+
+async def parse_pdf(source: Source, filename: str = "resume.pdf") -> str:
+    try:
+        return await _with_deadline(_extract_pdf(source), filename)
+    except ResumeParseTimeout:
+        raise
     except Exception as e:
-        print(f"Error parsing PDF: {e}")
+        logger.error(f"Error parsing PDF: {e}")
         return ""
 
-async def parse_docx(file_bytes: bytes) -> str:
+
+async def parse_docx(source: Source, filename: str = "resume.docx") -> str:
     try:
-        doc = Document(io.BytesIO(file_bytes))
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text
+        return await _with_deadline(_run(extract_docx, source), filename)
+    except ResumeParseTimeout:
+        raise
     except Exception as e:
-        print(f"Error parsing DOCX: {e}")
+        logger.error(f"Error parsing DOCX: {e}")
         return ""
 
-async def parse_resume(file_bytes: bytes, filename: str) -> str:
+
+def sniff_extension(path: str) -> str:
+    """File extension for a stored upload whose name has none, from its magic bytes"""
+    with open(path, "rb") as f:
+        head = f.read(4)
+    if head == b"%PDF":
+        return ".pdf"
+    if head == b"PK\x03\x04":  # zip container
+        return ".docx"
+    return ".txt"
+
+
+def _read_text(source: Source) -> str:
+    if isinstance(source, bytes):
+        return source.decode('utf-8')
+    with open(source, encoding='utf-8') as f:
+        return f.read()
+
+
+async def parse_resume(source: Source, filename: str) -> str:
+    """
+    Extract the text of an uploaded resume
+
+    Args:
+        source: File contents, or the path of the stored file
+        filename: Original filename, used to pick the format
+
+    Raises:
+        ResumeParseTimeout: Extraction did not finish within PARSER_TIMEOUT_SECONDS
+    """
     if filename.lower().endswith(".pdf"):
-        return await parse_pdf(file_bytes)
+        return await parse_pdf(source, filename)
     elif filename.lower().endswith(".docx"):
-        return await parse_docx(file_bytes)
+        return await parse_docx(source, filename)
     else:
         # Try as plain text
         try:
-            return file_bytes.decode('utf-8')
+            return await asyncio.get_running_loop().run_in_executor(None, _read_text, source)
         except:
             return ""
@@ -0,0 +1,191 @@
+"""
+Semantic cache of opening interview questions
+
+Candidates applying to the same job description with similar resumes get
+the same kind of opening question. The job description and the candidate
+context (profile or resume) are embedded separately, and a cached question
+of the same interview type is served instead of calling Gemini only when
+both are close enough: a shared long job description must not make two
+different candidates look alike, since openers often cite resume projects.
+Types whose openers never use the resume (QUESTION_CACHE_CANDIDATE_FREE_TYPES)
+are keyed on the job description alone. Partitions are per interview type,
+each bounded (LRU) and with entries expiring after a TTL.
+"""
+from collections import OrderedDict
+from typing import Optional
+import logging
+import re
+import threading
+import time
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.services.embedding import get_embeddings
+
+logger = logging.getLogger(__name__)
+
+_KEY_CHUNK_CHARS = 1000  # roughly the embedding model's 256-token window
+
+
+def normalize_context(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class _Entry:
+    __slots__ = ("jd_vector", "candidate_vector", "question", "created", "hits")
+
+    def __init__(self, jd_vector: np.ndarray, candidate_vector: Optional[np.ndarray], question: str):
+        self.jd_vector = jd_vector
+        self.candidate_vector = candidate_vector  # None for candidate-free types
+        self.question = question
+        self.created = time.time()
+        self.hits = 0
+
+
+class QuestionCacheLookup:
+    """Result of a lookup; pass it back to store() after generating on a miss"""
+
+    def __init__(
+        self,
+        interview_type: str,
+        jd_vector: np.ndarray,
+        candidate_vector: Optional[np.ndarray],
+        question: Optional[str] = None,
+        similarity: float = 0.0
+    ):
+        self.interview_type = interview_type
+        self.jd_vector = jd_vector
+        self.candidate_vector = candidate_vector
+        self.question = question
+        self.similarity = similarity  # the lower of the JD and candidate similarities of the best match
+
+
+class SemanticQuestionCache:
+    """Per-type LRU/TTL cache of questions keyed by embedded job description and candidate context"""
+
+    def __init__(
+        self,
+        threshold: float,
+        candidate_threshold: float,
+        candidate_free_types: tuple,
+        ttl_seconds: int,
+        max_entries_per_type: int
+    ):
+        self.threshold = threshold
+        self.candidate_threshold = candidate_threshold
+        self.candidate_free_types = set(candidate_free_types)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_type = max_entries_per_type
+        self._partitions = {}  # interview type -> OrderedDict[int, _Entry]
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _embed(self, context: str) -> Optional[np.ndarray]:
+        """Embed a long context as the normalised mean of its chunk embeddings"""
+        text = normalize_context(context)
+        chunks = [text[i:i + _KEY_CHUNK_CHARS] for i in range(0, len(text), _KEY_CHUNK_CHARS)] or [""]
+        # Contexts are per candidate, keep them out of the chunk embedding cache
+        vectors = get_embeddings(chunks, use_cache=False)
+        if len(vectors) == 0:
+            return None
+        vector = vectors.mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _expire(self, partition: OrderedDict):
+        cutoff = time.time() - self.ttl_seconds
+        for entry_id in [i for i, entry in partition.items() if entry.created < cutoff]:
+            del partition[entry_id]
+
+    def lookup(self, interview_type: str, job_description: str, candidate_context: str) -> Optional[QuestionCacheLookup]:
+        """
+        Find a cached question for a similar job description and candidate
+
+        Args:
+            interview_type: Type of interview (HR, Technical, Aptitude)
+            job_description: Job description of the interview
+            candidate_context: Candidate profile or resume text (ignored for candidate-free types)
+
+        Returns:
+            A lookup whose question is set on a hit, or None if the context could not be embedded
+        """
+        jd_vector = self._embed(job_description)
+        if jd_vector is None:
+            return None
+        candidate_vector = None
+        if interview_type not in self.candidate_free_types:
+            candidate_vector = self._embed(candidate_context)
+            if candidate_vector is None:
+                return None
+
+        with self._lock:
+            partition = self._partitions.get(interview_type)
+            best_id, best_similarity = None, 0.0
+            if partition:
+                self._expire(partition)
+                ids = list(partition)
+                if ids:
+                    jd_similarities = np.stack([partition[i].jd_vector for i in ids]) @ jd_vector
+                    # Each key must match on its own; a match is only as good as its weaker part
+                    matches = jd_similarities >= self.threshold
+                    similarities = jd_similarities
+                    if candidate_vector is not None:
+                        candidate_similarities = np.stack([partition[i].candidate_vector for i in ids]) @ candidate_vector
+                        matches &= candidate_similarities >= self.candidate_threshold
+                        similarities = np.minimum(jd_similarities, candidate_similarities)
+                    if matches.any():
+                        best = int(np.argmax(np.where(matches, similarities, -np.inf)))
+                        best_id = ids[best]
+                    else:
+                        best = int(np.argmax(similarities))
+                    best_similarity = float(similarities[best])
+
+            if best_id is not None:
+                entry = partition[best_id]
+                partition.move_to_end(best_id)
+                entry.hits += 1
+                self.hits += 1
+                return QuestionCacheLookup(interview_type, jd_vector, candidate_vector, entry.question, best_similarity)
+
+            self.misses += 1
+            return QuestionCacheLookup(interview_type, jd_vector, candidate_vector, similarity=best_similarity)
+
+    def store(self, lookup: QuestionCacheLookup, question: str):
+        """Cache a question generated after a miss"""
+        if not question:
+            return
+        with self._lock:
+            partition = self._partitions.setdefault(lookup.interview_type, OrderedDict())
+            partition[self._next_id] = _Entry(lookup.jd_vector, lookup.candidate_vector, question)
+            self._next_id += 1
+            while len(partition) > self.max_entries_per_type:
+                partition.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._partitions.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": {t: len(p) for t, p in self._partitions.items()},
+                "threshold": self.threshold,
+                "candidate_threshold": self.candidate_threshold,
+            }
+
+
+# Global instance
+question_cache = SemanticQuestionCache(
+    threshold=settings.QUESTION_CACHE_THRESHOLD,
+    candidate_threshold=settings.QUESTION_CACHE_CANDIDATE_THRESHOLD,
+    candidate_free_types=tuple(t.strip() for t in settings.QUESTION_CACHE_CANDIDATE_FREE_TYPES.split(",") if t.strip()),
+    ttl_seconds=settings.QUESTION_CACHE_TTL_SECONDS,
+    max_entries_per_type=settings.QUESTION_CACHE_MAX_PER_TYPE
+)
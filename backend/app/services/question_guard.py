@@ -0,0 +1,150 @@
+"""
+Duplicate-question guard
+
+Keeps a small in-memory matrix of embedded questions per interview, so a
+newly generated question can be checked against everything already asked
+before it is persisted and synthesized. Interviews live in a bounded LRU
+pool; an evicted interview is re-seeded from its stored questions.
+"""
+from collections import OrderedDict
+from typing import Optional
+import logging
+import threading
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.services.embedding import get_embeddings, EMBEDDING_DIMENSION
+
+logger = logging.getLogger(__name__)
+
+
+class _AskedQuestions:
+    """Normalised embeddings and texts of one interview's questions"""
+
+    def __init__(self):
+        self.vectors = np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+        self.texts = []
+
+    def add(self, vectors: np.ndarray, texts: list):
+        self.vectors = np.vstack((self.vectors, vectors))
+        self.texts.extend(texts)
+
+
+def _normalised(texts: list) -> np.ndarray:
+    # Questions are unique per interview, so they bypass the chunk embedding cache
+    vectors = get_embeddings(texts, use_cache=False)
+    if len(vectors) != len(texts):
+        return None
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+
+class QuestionGuard:
+    """Detect near-duplicate questions within an interview"""
+
+    def __init__(self, threshold: float, max_interviews: int):
+        self.threshold = threshold
+        self.max_interviews = max_interviews
+        self._interviews = OrderedDict()
+        self._last_checked = {}  # interview id -> (question, vector), reused by remember()
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.duplicates = 0
+
+    def _get(self, interview_id: int, asked: list) -> _AskedQuestions:
+        """
+        Return the interview's index, with any question of `asked` it lacks merged in
+
+        `asked` seeds the index after eviction, and also brings in questions
+        that other workers asked in this interview.
+        """
+        with self._lock:
+            entry = self._interviews.get(interview_id)
+            if entry is not None:
+                self._interviews.move_to_end(interview_id)
+                known = set(entry.texts)
+                missing = [text for text in dict.fromkeys(asked) if text not in known]
+                if not missing:
+                    return entry
+            else:
+                missing = list(dict.fromkeys(asked))
+
+        vectors = _normalised(missing) if missing else None
+
+        with self._lock:
+            entry = self._interviews.setdefault(interview_id, entry or _AskedQuestions())
+            if vectors is not None:
+                # Another request may have added some of them meanwhile
+                known = set(entry.texts)
+                keep = [i for i, text in enumerate(missing) if text not in known]
+                if keep:
+                    entry.add(vectors[keep], [missing[i] for i in keep])
+            while len(self._interviews) > self.max_interviews:
+                self._interviews.popitem(last=False)
+        return entry
+
+    def find_duplicate(self, interview_id: int, question: str, asked: list = None) -> Optional[tuple]:
+        """
+        Check a generated question against the interview's earlier questions
+
+        Args:
+            interview_id: Interview the question belongs to
+            question: Newly generated question
+            asked: Earlier question texts, used to seed the index after eviction
+
+        Returns:
+            (earlier question, similarity) if it is a near-duplicate, otherwise None
+        """
+        entry = self._get(interview_id, asked or [])
+        vectors = _normalised([question])
+        with self._lock:
+            self.checks += 1
+            if vectors is None:
+                return None
+            self._last_checked[interview_id] = (question, vectors)
+            if not entry.texts:
+                return None
+            similarities = entry.vectors @ vectors[0]
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            self.duplicates += 1
+            return entry.texts[best], float(similarities[best])
+
+    def remember(self, interview_id: int, question: str):
+        """Add a persisted question to the interview's index"""
+        with self._lock:
+            checked = self._last_checked.pop(interview_id, None)
+        vectors = checked[1] if checked is not None and checked[0] == question else _normalised([question])
+        if vectors is None:
+            return
+        entry = self._get(interview_id, [])
+        with self._lock:
+            entry.add(vectors, [question])
+
+    def forget_checked(self, interview_id: int):
+        """Discard the vector kept by find_duplicate, e.g. when the question was not persisted"""
+        with self._lock:
+            self._last_checked.pop(interview_id, None)
+
+    def drop(self, interview_id: int):
+        with self._lock:
+            self._interviews.pop(interview_id, None)
+            self._last_checked.pop(interview_id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "interviews": len(self._interviews),
+                "checks": self.checks,
+                "duplicates": self.duplicates,
+                "threshold": self.threshold,
+            }
+
+
+# Global instance
+question_guard = QuestionGuard(
+    threshold=settings.QUESTION_GUARD_THRESHOLD,
+    max_interviews=settings.QUESTION_GUARD_MAX_INTERVIEWS
+)
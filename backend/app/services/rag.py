@@ -1,65 +1,351 @@
-import faiss
+import logging
 import numpy as np
 import os
 import pickle
-from backend.app.services.embedding import get_embedding
+import re
+import shutil
+import threading
+import time
+from collections import Counter, OrderedDict
+from backend.app.core.config import settings
+from backend.app.services.embedding import get_embeddings, EMBEDDING_DIMENSION
+from backend.app.services.vector_store import VectorStore
+from backend.app.services import ann_index
 
-class RAGService:
-    def __init__(self, storage_path="vector_store/index.faiss", doc_path="vector_store/docs.pkl"):
-        self.dimension = 384 # All-MiniLM-L6-v2
-        self.storage_path = storage_path
-        self.doc_path = doc_path
-        self.documents = []
-        
-        if os.path.exists(storage_path) and os.path.exists(doc_path):
-            self.index = faiss.read_index(storage_path)
-            with open(doc_path, "rb") as f:
-                self.documents = pickle.load(f)
+logger = logging.getLogger(__name__)
+
+DEFAULT_NAMESPACE = "default"
+INTERVIEW_NAMESPACE_PREFIX = "interview-"
+
+def interview_namespace(interview_id: int) -> str:
+    """Index namespace holding one interview's resume and job description"""
+    return f"{INTERVIEW_NAMESPACE_PREFIX}{interview_id}"
+
+class _Namespace:
+    """One isolated FAISS index and its chunk texts (in memory, or backed by a VectorStore)"""
+    def __init__(self, dimension: int, index=None, store: VectorStore = None):
+        import faiss
+        self.index = index if index is not None else faiss.IndexFlatL2(dimension)
+        self.store = store
+        self.documents = [] if store is None else None
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.store) if self.store is not None else len(self.documents)
+
+    def add(self, chunks: list, embeddings: np.ndarray):
+        if self.store is not None:
+            self.store.append(chunks, embeddings)
         else:
-            self.index = faiss.IndexFlatL2(self.dimension)
-    
-    def add_document(self, text: str, chunk_size: int = 500):
+            self.documents.extend(chunks)
+        self.index.add(embeddings)
+
+    def document(self, i: int) -> str:
+        return self.store.document(i) if self.store is not None else self.documents[i]
+
+    def vectors(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Embedding rows [start, stop): exact from the store, otherwise decoded from the index"""
+        if self.store is not None:
+            return self.store.vectors(start, stop)
+        stop = self.index.ntotal if stop is None else stop
+        if stop <= start:
+            return np.zeros((0, self.index.d), dtype=np.float32)
+        return self.index.reconstruct_n(start, stop - start)
+
+class RAGService:
+    """
+    Vector search over isolated namespaces (e.g. one per interview).
+
+    Namespaces are isolated, so concurrent setups never touch each other's
+    index. Interview namespaces live in memory with LRU eviction; shared
+    corpus namespaces (the default one and any other non-interview name) are
+    pinned in memory once loaded, and always persisted. Persisted namespaces
+    (corpora, and interview namespaces with persistence enabled) are backed by
+    an append-only VectorStore in their own directory and reloaded on demand
+    after eviction. Loading happens outside the global lock, so a large
+    corpus being read from disk does not stall lookups of other namespaces.
+
+    Interview namespaces always use an exact flat index; shared corpus
+    namespaces use index_type, which can be an approximate index (see
+    ann_index). Index types that need training start out flat and switch
+    over when rebuild() is run. With quantized vector storage the index
+    holds fp16/int8 codes; persisted namespaces re-rank the top candidates
+    exactly against the memory-mapped float32 rows of their VectorStore,
+    in-memory ones rank on the codes alone.
+    """
+    def __init__(self, base_path="vector_store", max_namespaces=256, persist=False, snapshot_every=1024,
+                 index_type="flat", index_params=None, rerank_factor=4):
+        if index_type not in ann_index.INDEX_TYPES:
+            raise ValueError(f"Unknown index type '{index_type}', expected one of {', '.join(ann_index.INDEX_TYPES)}")
+        self.dimension = EMBEDDING_DIMENSION
+        self.base_path = base_path
+        self.max_namespaces = max_namespaces
+        self.persist = persist
+        self.snapshot_every = snapshot_every
+        self.index_type = index_type
+        self.index_params = index_params or ann_index.default_index_params()
+        self.rerank_factor = rerank_factor
+        self._namespaces = OrderedDict()  # interview namespaces, LRU
+        self._corpora = {}  # shared corpus namespaces, never evicted by the LRU
+        self._loading = {}  # namespace -> lock held while it is opened
+        self._lock = threading.Lock()
+
+    def _is_corpus(self, namespace: str) -> bool:
+        return not namespace.startswith(INTERVIEW_NAMESPACE_PREFIX)
+
+    def _persisted(self, namespace: str) -> bool:
+        # A corpus cannot be re-derived from the database like an interview can
+        return self.persist or self._is_corpus(namespace)
+
+    def _directory(self, namespace: str) -> str:
+        # The default namespace keeps the original top-level location
+        if namespace == DEFAULT_NAMESPACE:
+            return self.base_path
+        return os.path.join(self.base_path, re.sub(r"[^A-Za-z0-9_.-]", "_", namespace))
+
+    def _index_type(self, namespace: str) -> str:
+        """Configured index type of a namespace (a single interview is too small for ANN)"""
+        return self.index_type if self._is_corpus(namespace) else "flat"
+
+    def _new_index(self, namespace: str):
+        index_type = self._index_type(namespace)
+        if ann_index.min_train_vectors(index_type, self.index_params):
+            index_type = "flat"  # until there is enough data to train; see rebuild()
+        return ann_index.create_index(index_type, self.dimension, self.index_params)
+
+    def _migrate_legacy(self, store: VectorStore):
+        """Convert a pickled index (index.faiss + docs.pkl) into the append-only layout"""
+        storage_path = os.path.join(store.directory, "index.faiss")
+        doc_path = os.path.join(store.directory, "docs.pkl")
+        if store.exists() or not (os.path.exists(storage_path) and os.path.exists(doc_path)):
+            return
+        import faiss
+        index = faiss.read_index(storage_path)
+        with open(doc_path, "rb") as f:
+            documents = pickle.load(f)
+        count = min(index.ntotal, len(documents))
+        if count:
+            store.append(documents[:count], index.reconstruct_n(0, count))
+        os.remove(storage_path)
+        os.remove(doc_path)
+        logger.info(f"Migrated {count} chunks in {store.directory} to the append-only vector store")
+
+    def _open(self, namespace: str, create: bool):
+        if not self._persisted(namespace):
+            return _Namespace(self.dimension, self._new_index(namespace)) if create else None
+
+        store = VectorStore(self._directory(namespace), self.dimension)
+        self._migrate_legacy(store)
+        if not store.exists() and not create:
+            return None
+        # A snapshot keeps the index type it was built with until the next rebuild
+        index = store.load_index(lambda: self._new_index(namespace))
+        ann_index.set_search_params(index, self.index_params)
+        return _Namespace(self.dimension, index, store)
+
+    def _loaded(self, namespace: str):
+        """A namespace already in memory (caller holds _lock)"""
+        ns = self._corpora.get(namespace)
+        if ns is None:
+            ns = self._namespaces.get(namespace)
+            if ns is not None:
+                self._namespaces.move_to_end(namespace)
+        return ns
+
+    def _get(self, namespace: str, create: bool = True):
+        """Return a namespace from memory, disk, or a fresh one (LRU-evicting the oldest interview)"""
+        with self._lock:
+            ns = self._loaded(namespace)
+            if ns is not None:
+                return ns
+            loading = self._loading.setdefault(namespace, threading.Lock())
+
+        # Reading a store and its index snapshot can take a while; only
+        # callers of this namespace wait for it
+        with loading:
+            with self._lock:
+                ns = self._loaded(namespace)
+                if ns is not None:
+                    return ns
+
+            ns = self._open(namespace, create)
+
+            with self._lock:
+                self._loading.pop(namespace, None)
+                if ns is None:
+                    return None
+                if self._is_corpus(namespace):
+                    self._corpora[namespace] = ns
+                else:
+                    self._namespaces[namespace] = ns
+                    while len(self._namespaces) > self.max_namespaces:
+                        self._namespaces.popitem(last=False)
+            return ns
+
+    def has_documents(self, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        ns = self._get(namespace, create=False)
+        return ns is not None and ns.index.ntotal > 0
+
+    def add_document(self, text: str, chunk_size: int = 500, namespace: str = DEFAULT_NAMESPACE):
         if not text:
             return
-            
+
         chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-        embeddings = []
-        
-        for chunk in chunks:
-            emb = get_embedding(chunk)
-            if emb:
-                embeddings.append(emb)
-                self.documents.append(chunk)
-        
-        if embeddings:
-            self.index.add(np.array(embeddings).astype('float32'))
-            self.save()
-
-    def search(self, query: str, k: int = 3) -> list[str]:
-        if self.index.ntotal == 0:
+        embeddings = get_embeddings(chunks)
+
+        if len(embeddings) == len(chunks):
+            ns = self._get(namespace)
+            with ns.lock:
+                ns.add(chunks, embeddings)
+                # Appends are durable on their own; snapshots only bound the rows re-added on load
+                if ns.store is not None and len(ns.store) - ns.store.snapshot_rows >= self.snapshot_every:
+                    ns.store.write_snapshot(ns.index)
+
+    def search(self, query: str, k: int = 3, namespace: str = DEFAULT_NAMESPACE) -> list[str]:
+        ns = self._get(namespace, create=False)
+        if ns is None or ns.index.ntotal == 0:
             return []
-            
-        query_vector = get_embedding(query)
-        if not query_vector:
+
+        # Queries embed the candidate's latest answer and rarely repeat, so they bypass the cache
+        query_vectors = get_embeddings([query], use_cache=False)
+        if len(query_vectors) == 0:
             return []
-            
-        D, I = self.index.search(np.array([query_vector]).astype('float32'), k)
-        results = []
-        for i in I[0]:
-            if i != -1 and i < len(self.documents):
-                results.append(self.documents[i])
-        return results
-
-    def save(self):
-        if not os.path.exists("vector_store"):
-            os.makedirs("vector_store")
-        faiss.write_index(self.index, self.storage_path)
-        with open(self.doc_path, "wb") as f:
-            pickle.dump(self.documents, f)
-
-    def clear(self):
-        self.index = faiss.IndexFlatL2(self.dimension)
-        self.documents = []
-        self.save()
-
-rag_engine = RAGService()
+
+        with ns.lock:
+            # Quantized distances are only approximate: over-fetch, then re-rank against the
+            # stored float32 rows. In-memory namespaces keep no exact copy (it would outweigh
+            # the codes), so they rank on the codes alone
+            rerank = ns.store is not None and ann_index.is_approximate(ns.index)
+            fetch = k * self.rerank_factor if rerank else k
+            D, I = ns.index.search(query_vectors, fetch)
+            ids = [int(i) for i in I[0] if i != -1 and i < len(ns)]
+
+            if rerank and len(ids) > 1:
+                ids = ann_index.rerank(query_vectors[0], ids, np.asarray(ns.vectors()[ids]))
+            return [ns.document(i) for i in ids[:k]]
+
+    def save(self, namespace: str = DEFAULT_NAMESPACE):
+        """Write an index snapshot now (chunks themselves are persisted as they are added)"""
+        ns = self._get(namespace, create=False)
+        if ns is None or ns.store is None:
+            return
+        with ns.lock:
+            if ns.store.snapshot_rows != len(ns.store):
+                ns.store.write_snapshot(ns.index)
+
+    def rebuild(self, namespace: str = DEFAULT_NAMESPACE, index_type: str = None) -> dict:
+        """
+        Train (if needed) and build a fresh index over a namespace, then swap it in
+
+        The build runs without holding the namespace lock, so searches keep
+        using the old index; rows added meanwhile are appended before the swap.
+
+        Args:
+            namespace: Namespace to rebuild
+            index_type: Index type to build, defaults to the namespace's configured type
+
+        Returns:
+            Summary of the rebuild (type, vector count, seconds)
+        """
+        ns = self._get(namespace, create=False)
+        if ns is None:
+            raise ValueError(f"Namespace '{namespace}' does not exist")
+        index_type = index_type or self._index_type(namespace)
+        started = time.perf_counter()
+
+        with ns.lock:
+            count = ns.index.ntotal
+            vectors = ns.vectors(0, count)
+        index = ann_index.build_index(index_type, vectors, self.index_params)
+
+        with ns.lock:
+            if ns.index.ntotal > count:
+                index.add(np.ascontiguousarray(ns.vectors(count, ns.index.ntotal)))
+            ns.index = index
+            if ns.store is not None:
+                ns.store.write_snapshot(index)
+
+        summary = {
+            "namespace": namespace,
+            "index_type": index_type,
+            "vectors": index.ntotal,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+        logger.info(f"Rebuilt vector index: {summary}")
+        return summary
+
+    def set_search_params(self, namespace: str = DEFAULT_NAMESPACE, **params):
+        """Tune search of a loaded namespace, e.g. hnsw_ef_search=128 or ivf_nprobe=32"""
+        ns = self._get(namespace, create=False)
+        if ns is not None:
+            with ns.lock:
+                ann_index.set_search_params(ns.index, params)
+
+    def evict(self, namespace: str):
+        """Drop a namespace from memory (persisted files are kept)"""
+        with self._lock:
+            self._namespaces.pop(namespace, None)
+            self._corpora.pop(namespace, None)
+
+    def clear(self, namespace: str = DEFAULT_NAMESPACE):
+        """Empty a namespace in memory and on disk"""
+        with self._lock:
+            ns = self._namespaces.pop(namespace, None)
+            if ns is None:
+                ns = self._corpora.pop(namespace, None)
+        if ns is not None and ns.store is not None:
+            with ns.lock:
+                ns.store.clear()
+        elif self._persisted(namespace):
+            VectorStore(self._directory(namespace), self.dimension).clear()
+        if namespace != DEFAULT_NAMESPACE:
+            shutil.rmtree(self._directory(namespace), ignore_errors=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            loaded = {**self._namespaces, **self._corpora}
+        memory = {
+            name: {
+                "vectors": ns.index.ntotal,
+                "index_bytes": ann_index.index_bytes(ns.index),
+                # float32 rows for re-ranking and rebuilds, memory-mapped (page cache, not heap)
+                "mapped_bytes": len(ns.store) * self.dimension * 4 if ns.store is not None else 0,
+            }
+            for name, ns in loaded.items()
+        }
+        return {
+            "namespaces": len(loaded),
+            "corpora": len(self._corpora),
+            "vectors": sum(ns.index.ntotal for ns in loaded.values()),
+            "index_types": dict(Counter(ann_index.index_type_of(ns.index) for ns in loaded.values())),
+            "index_bytes": sum(m["index_bytes"] for m in memory.values()),
+            "mapped_bytes": sum(m["mapped_bytes"] for m in memory.values()),
+            "memory": memory,
+        }
+
+_rag_engine = None
+_rag_engine_lock = threading.Lock()
+
+def get_rag_engine() -> RAGService:
+    """
+    Return the shared RAGService, creating it on first call.
+
+    FAISS is imported lazily as well, so importing this module stays cheap
+    until retrieval is actually needed (or the startup warm-up runs).
+    """
+    global _rag_engine
+    if _rag_engine is None:
+        with _rag_engine_lock:
+            if _rag_engine is None:
+                _rag_engine = RAGService(
+                    base_path=settings.RAG_STORAGE_DIR,
+                    max_namespaces=settings.RAG_MAX_NAMESPACES,
+                    persist=settings.RAG_PERSIST_NAMESPACES,
+                    snapshot_every=settings.RAG_SNAPSHOT_EVERY,
+                    index_type=settings.RAG_INDEX_TYPE,
+                    rerank_factor=settings.RAG_RERANK_FACTOR
+                )
+    return _rag_engine
+
+def is_rag_engine_loaded() -> bool:
+    return _rag_engine is not None
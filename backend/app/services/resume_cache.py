@@ -0,0 +1,187 @@
+"""
+Parsed-resume and candidate-profile cache keyed by file hash
+
+Uploads are content-addressed (see upload_store), so a resume that was seen
+before is recognised by its SHA-256 and is neither re-parsed nor re-profiled.
+Each entry holds the extracted text and a compact structured profile
+(skills, roles, years of experience, projects) that prompts use in place of
+raw resume excerpts.
+"""
+from typing import Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+from backend.app.services.gemini_service import gemini_client
+from backend.app.services.parser import parse_resume
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extraction prompt or profile shape changes; older profiles are re-extracted
+PROFILE_VERSION = 1
+
+_LIST_LIMITS = {"skills": 25, "roles": 6, "projects": 5, "education": 3}
+
+
+class CachedResume:
+    __slots__ = ("sha256", "text", "profile")
+
+    def __init__(self, sha256: str, text: str, profile: Optional[dict]):
+        self.sha256 = sha256
+        self.text = text
+        self.profile = profile  # None until extracted (or if extraction failed)
+
+
+def format_profile(profile: dict) -> str:
+    """
+    Render a profile as the compact candidate context used in prompts
+
+    Args:
+        profile: Profile as returned by the extraction prompt
+
+    Returns:
+        A few short lines, or "" if the profile has nothing usable
+    """
+    lines = []
+    if profile.get("years_experience") not in (None, ""):
+        lines.append(f"Years of experience: {profile['years_experience']}")
+    if profile.get("roles"):
+        lines.append("Roles: " + "; ".join(str(r) for r in profile["roles"][:_LIST_LIMITS["roles"]]))
+    if profile.get("skills"):
+        lines.append("Skills: " + ", ".join(str(s) for s in profile["skills"][:_LIST_LIMITS["skills"]]))
+    if profile.get("projects"):
+        lines.append("Projects:")
+        lines.extend(f"- {p}" for p in profile["projects"][:_LIST_LIMITS["projects"]])
+    if profile.get("education"):
+        lines.append("Education: " + "; ".join(str(e) for e in profile["education"][:_LIST_LIMITS["education"]]))
+    return "Candidate profile:\n" + "\n".join(lines) if lines else ""
+
+
+class ResumeCache:
+    """SQLite map from resume content hash to its text and profile"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "resumes.sqlite"), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "sha256 TEXT PRIMARY KEY, text TEXT NOT NULL, profile TEXT, "
+            "profile_version INTEGER, created REAL NOT NULL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sha256: str) -> Optional[CachedResume]:
+        """Cached text and current-version profile of a resume, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text, profile, profile_version FROM resumes WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        text, profile, version = row
+        if profile is not None and version == PROFILE_VERSION:
+            try:
+                return CachedResume(sha256, text, json.loads(profile))
+            except ValueError:
+                pass
+        return CachedResume(sha256, text, None)
+
+    def put_text(self, sha256: str, text: str):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR IGNORE INTO resumes (sha256, text, created) VALUES (?, ?, ?)",
+                (sha256, text, time.time())
+            )
+            self._db.commit()
+
+    def put_profile(self, sha256: str, profile: dict):
+        with self._lock:
+            self._db.execute(
+                "UPDATE resumes SET profile = ?, profile_version = ? WHERE sha256 = ?",
+                (json.dumps(profile), PROFILE_VERSION, sha256)
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries, profiled = self._db.execute(
+                "SELECT COUNT(*), COUNT(profile) FROM resumes"
+            ).fetchone()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": entries,
+                "profiled": profiled,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_resume_cache() -> ResumeCache:
+    """Open the cache on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResumeCache(settings.RESUME_CACHE_DIR)
+    return _cache
+
+
+async def _cached(fn, *args):
+    """Run a cache operation off the event loop; cache errors never fail an upload"""
+    try:
+        return await run_in_threadpool(fn, *args)
+    except Exception as e:
+        logger.error(f"Resume cache error: {e}")
+        return None
+
+
+async def load_resume(sha256: str, path: str, filename: str) -> Optional[CachedResume]:
+    """
+    Text and profile of a stored resume, parsed and profiled only the first time it is seen
+
+    Args:
+        sha256: Content hash of the stored upload
+        path: Path of the stored upload
+        filename: Original filename, used to pick the parser
+
+    Returns:
+        The resume (profile None if extraction is disabled or failed), or None if it could not be parsed
+
+    Raises:
+        ResumeParseTimeout: Parsing did not finish within PARSER_TIMEOUT_SECONDS
+    """
+    cache = get_resume_cache() if settings.RESUME_CACHE_ENABLED else None
+    cached = await _cached(cache.get, sha256) if cache else None
+    if cached is None:
+        text = await parse_resume(path, filename)
+        if not text:
+            return None
+        cached = CachedResume(sha256, text, None)
+        if cache:
+            await _cached(cache.put_text, sha256, text)
+
+    if cached.profile is None and settings.RESUME_PROFILE_ENABLED:
+        profile = await gemini_client.extract_candidate_profile_async(cached.text)
+        if profile:
+            cached.profile = profile
+            if cache:
+                await _cached(cache.put_profile, sha256, profile)
+    return cached
@@ -36,7 +36,7 @@ async def analyze_performance(conversation_history: list):
     """
     
     try:
-        response = llm_client.chat_completion(prompt, system_message="You are an expert interview coach. Output valid JSON only.")
+        response = await llm_client.chat_completion_async(prompt, system_message="You are an expert interview coach. Output valid JSON only.")
         # Clean response to ensure it's JSON
         response = response.strip()
         if response.startswith("```json"):
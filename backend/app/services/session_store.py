@@ -0,0 +1,332 @@
+"""
+Interview session store
+
+Holds the per-interview context (resume text or profile, job description,
+interview types, progress) that every question turn needs. Stored outside
+the worker process so any uvicorn worker can serve any interview:
+
+- SQLite (default): a WAL database file shared by the workers on one host
+- Redis: any server speaking the Redis protocol, through a minimal RESP client
+
+Entries expire after SESSION_TTL_SECONDS without access, and the total size
+of stored contexts is kept under SESSION_MAX_BYTES by evicting the least
+recently used. A missing context is not fatal: the API rehydrates it from
+InterviewHistory and the resume cache.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+from urllib.parse import urlparse
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE_BACKENDS = ("sqlite", "redis")
+
+
+def _encode(context: dict) -> bytes:
+    return json.dumps(context, separators=(",", ":")).encode("utf-8")
+
+
+class SessionStore(ABC):
+    """Interface of the session store backends"""
+
+    def __init__(self, ttl_seconds: int, max_bytes: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, interview_id: int) -> Optional[dict]:
+        """Context of an interview (refreshing its TTL), or None if missing or expired"""
+
+    @abstractmethod
+    def put(self, interview_id: int, context: dict):
+        """Store a context, evicting least recently used ones if over SESSION_MAX_BYTES"""
+
+    @abstractmethod
+    def delete(self, interview_id: int):
+        """Remove an interview's context"""
+
+    @abstractmethod
+    def _usage(self) -> tuple:
+        """(entries, stored bytes)"""
+
+    def stats(self) -> dict:
+        entries, used = self._usage()
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "entries": entries,
+            "bytes": used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteSessionStore(SessionStore):
+    """Session store in a SQLite file shared by the workers of one host"""
+
+    def __init__(self, path: str, ttl_seconds: int, max_bytes: int):
+        super().__init__(ttl_seconds, max_bytes)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "interview_id INTEGER PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_accessed ON sessions (accessed)")
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def get(self, interview_id: int) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM sessions WHERE interview_id = ? AND accessed > ?",
+                (interview_id, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE sessions SET accessed = ? WHERE interview_id = ?", (now, interview_id))
+            self._db.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, interview_id: int, context: dict):
+        data = _encode(context)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (interview_id, data, size, accessed) VALUES (?, ?, ?, ?)",
+                (interview_id, data, len(data), now)
+            )
+            self._db.execute("DELETE FROM sessions WHERE accessed <= ?", (now - self.ttl_seconds,))
+            used = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM sessions").fetchone()[0]
+            if used > self.max_bytes:
+                # Walk from the least recently used until enough bytes are freed
+                victims, freed = [], 0
+                for victim, size in self._db.execute(
+                    "SELECT interview_id, size FROM sessions WHERE interview_id != ? ORDER BY accessed",
+                    (interview_id,)
+                ):
+                    victims.append((victim,))
+                    freed += size
+                    if used - freed <= self.max_bytes:
+                        break
+                self._db.executemany("DELETE FROM sessions WHERE interview_id = ?", victims)
+                self.evictions += len(victims)
+            self._db.commit()
+
+    def delete(self, interview_id: int):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE interview_id = ?", (interview_id,))
+            self._db.commit()
+
+    def _usage(self) -> tuple:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions WHERE accessed > ?",
+                (time.time() - self.ttl_seconds,)
+            ).fetchone()
+
+
+class RedisError(Exception):
+    """Error reply from the server"""
+
+
+class RespClient:
+    """Minimal blocking Redis protocol (RESP2) client: one connection, commands serialised by a lock"""
+
+    def __init__(self, url: str, timeout: float = 5.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.username = parsed.username
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._file = self._sock.makefile("rb")
+        if self.password:
+            self._call(*(["AUTH", self.username, self.password] if self.username else ["AUTH", self.password]))
+        if self.db:
+            self._call("SELECT", self.db)
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Connection closed by server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _call(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self._sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def execute(self, *args):
+        """
+        Run one command
+
+        Raises:
+            RedisError: The server replied with an error
+            OSError: The server is unreachable (after one reconnect attempt)
+        """
+        with self._lock:
+            for attempt in (0, 1):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._call(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt:
+                        raise
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Session store on a Redis-protocol server, shared by workers on any host
+
+    Each context is a key with a sliding TTL. A sorted set of last-access
+    times and a hash of sizes account for memory and drive LRU eviction.
+    """
+
+    def __init__(self, url: str, ttl_seconds: int, max_bytes: int, prefix: str = "interview-session:"):
+        super().__init__(ttl_seconds, max_bytes)
+        self.client = RespClient(url)
+        self.prefix = prefix
+        self._access_key = f"{prefix}accessed"
+        self._size_key = f"{prefix}sizes"
+
+    def _key(self, interview_id) -> str:
+        return f"{self.prefix}{int(interview_id)}"
+
+    def _forget(self, ids: list):
+        if ids:
+            self.client.execute("ZREM", self._access_key, *ids)
+            self.client.execute("HDEL", self._size_key, *ids)
+
+    def _forget_expired(self, now: float):
+        """Drop the accounting of keys that expired on the server"""
+        self._forget(self.client.execute("ZRANGEBYSCORE", self._access_key, "-inf", now - self.ttl_seconds))
+
+    def get(self, interview_id: int) -> Optional[dict]:
+        data = self.client.execute("GET", self._key(interview_id))
+        if data is None:
+            self.misses += 1
+            self._forget([interview_id])
+            return None
+        self.client.execute("EXPIRE", self._key(interview_id), self.ttl_seconds)
+        self.client.execute("ZADD", self._access_key, time.time(), interview_id)
+        self.hits += 1
+        return json.loads(data)
+
+    def put(self, interview_id: int, context: dict):
+        data = _encode(context)
+        now = time.time()
+        self.client.execute("SET", self._key(interview_id), data, "EX", self.ttl_seconds)
+        self.client.execute("ZADD", self._access_key, now, interview_id)
+        self.client.execute("HSET", self._size_key, interview_id, len(data))
+
+        self._forget_expired(now)
+        used = sum(int(size) for size in self.client.execute("HVALS", self._size_key))
+        while used > self.max_bytes:
+            oldest = self.client.execute("ZRANGE", self._access_key, 0, 0)
+            if not oldest or int(oldest[0]) == interview_id:
+                break
+            victim = int(oldest[0])
+            size = self.client.execute("HGET", self._size_key, victim)
+            self.client.execute("DEL", self._key(victim))
+            self._forget([victim])
+            used -= int(size or 0)
+            self.evictions += 1
+
+    def delete(self, interview_id: int):
+        self.client.execute("DEL", self._key(interview_id))
+        self._forget([interview_id])
+
+    def _usage(self) -> tuple:
+        self._forget_expired(time.time())
+        sizes = self.client.execute("HVALS", self._size_key)
+        return len(sizes), sum(int(size) for size in sizes)
+
+
+def create_session_store(backend: str = None) -> SessionStore:
+    """
+    Create the configured session store backend
+
+    Args:
+        backend: sqlite or redis, defaults to SESSION_STORE_BACKEND
+    """
+    backend = backend or settings.SESSION_STORE_BACKEND
+    if backend == "redis":
+        return RedisSessionStore(settings.SESSION_REDIS_URL, settings.SESSION_TTL_SECONDS, settings.SESSION_MAX_BYTES)
+    if backend == "sqlite":
+        return SQLiteSessionStore(settings.SESSION_STORE_PATH, settings.SESSION_TTL_SECONDS, settings.SESSION_MAX_BYTES)
+    raise ValueError(f"Unknown session store backend: {backend} (expected one of {SESSION_STORE_BACKENDS})")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Create the session store on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_session_store()
+    return _store
@@ -0,0 +1,197 @@
+"""
+Content-addressed cache for synthesized speech
+
+Audio is keyed by a hash of (engine, text, language, slow). Recently used
+clips are kept in memory; everything is also written to disk as audio files,
+and the least recently used files are evicted once the directory exceeds its
+size cap.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+import hashlib
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """Two-tier (memory + disk) LRU cache of audio bytes"""
+
+    def __init__(self, cache_dir: str, memory_max_bytes: int, disk_max_bytes: int, extension: str = "mp3"):
+        self.cache_dir = Path(cache_dir)
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.extension = extension
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None  # computed lazily on first disk write
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, threads using it]
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(text: str, language: str, slow: bool, engine: str = "gtts") -> str:
+        """Stable content hash for a synthesis request"""
+        raw = f"{engine}\0{language}\0{int(slow)}\0{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.{self.extension}"
+
+    def _remember(self, key: str, data: bytes):
+        """Put a clip in the memory tier, evicting least recently used clips"""
+        if len(data) > self.memory_max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_bytes -= len(old)
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _lookup(self, key: str) -> tuple:
+        """(clip, "memory" | "disk"), or (None, None) if it is in neither tier"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data, "memory"
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mtime doubles as the disk tier's LRU clock
+        except FileNotFoundError:
+            return None, None
+        except OSError as e:
+            logger.warning(f"TTS cache read failed for {key}: {e}")
+            return None, None
+
+        self._remember(key, data)
+        return data, "disk"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up a clip in memory, then on disk"""
+        data, tier = self._lookup(key)
+        with self._lock:
+            if tier == "memory":
+                self.memory_hits += 1
+            elif tier == "disk":
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store a clip in both tiers"""
+        if not data:
+            return
+        self._remember(key, data)
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed for {key}: {e}")
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                self._disk_bytes += len(data)
+            over_cap = self._disk_bytes > self.disk_max_bytes
+        if over_cap:
+            self._evict_disk()
+
+    def get_or_create(self, key: str, producer: Callable[[], bytes]) -> bytes:
+        """Return the cached clip, or produce it once even under concurrent requests"""
+        data = self.get(key)
+        if data is not None:
+            return data
+
+        # One lock per key, shared by everyone producing or waiting for it; the last one out removes it
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                # Another thread may have produced it while we waited (into either tier)
+                data, _ = self._lookup(key)
+                if data is None:
+                    data = producer()
+                    self.put(key, data)
+                return data
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._key_locks[key]
+
+    def _files(self) -> list:
+        if not self.cache_dir.exists():
+            return []
+        return [p for p in self.cache_dir.glob(f"*/*.{self.extension}") if p.is_file()]
+
+    def _scan_disk_bytes(self) -> int:
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _evict_disk(self):
+        """Delete least recently used files until the disk tier is back under 90% of its cap"""
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+            except OSError:
+                pass
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * 0.9)
+        evicted = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+                evicted += 1
+            except OSError:
+                pass
+
+        with self._lock:
+            self._disk_bytes = total
+        logger.info(f"TTS cache evicted {evicted} files, disk usage now {total} bytes")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,209 @@
+"""
+Content-addressed store for uploaded resumes
+
+Uploads are streamed to disk in chunks while being hashed, so the memory an
+upload needs is bounded by the chunk size, and each distinct file is stored
+once under its SHA-256 (uploads/blobs/ab/abcd...). A blob is referenced by
+the InterviewHistory rows whose resume_path points at it; the retention sweep
+deletes files no interview references any more.
+"""
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+import hashlib
+import logging
+import os
+import tempfile
+import time
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, select
+
+from backend.app.core.config import settings
+from backend.app.models.interview import InterviewHistory
+
+logger = logging.getLogger(__name__)
+
+
+class UploadTooLarge(Exception):
+    """The upload exceeded UPLOAD_MAX_BYTES"""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds {limit} bytes")
+        self.limit = limit
+
+
+class StoredUpload:
+    __slots__ = ("path", "sha256", "size", "deduplicated")
+
+    def __init__(self, path: str, sha256: str, size: int, deduplicated: bool):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.deduplicated = deduplicated  # identical content was already stored
+
+
+def _write_chunk(f, digest, chunk: bytes):
+    digest.update(chunk)
+    f.write(chunk)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class UploadStore:
+    """Deduplicating, size-capped store of uploaded files"""
+
+    def __init__(self, directory: str, max_bytes: int, chunk_size: int, orphan_grace_seconds: int):
+        self.directory = Path(directory)
+        self.blob_dir = self.directory / "blobs"
+        self.tmp_dir = self.directory / "tmp"
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.orphan_grace_seconds = orphan_grace_seconds
+
+    def blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / sha256
+
+    async def save(self, upload: UploadFile) -> StoredUpload:
+        """
+        Stream an upload into the store
+
+        Args:
+            upload: Uploaded file, read in UPLOAD_CHUNK_BYTES chunks
+
+        Returns:
+            The stored blob; its path is what InterviewHistory.resume_path should reference
+
+        Raises:
+            UploadTooLarge: The upload is larger than UPLOAD_MAX_BYTES
+        """
+        if upload.size is not None and upload.size > self.max_bytes:
+            raise UploadTooLarge(self.max_bytes)
+
+        await run_in_threadpool(self.tmp_dir.mkdir, parents=True, exist_ok=True)
+        fd, tmp_path = await run_in_threadpool(tempfile.mkstemp, dir=self.tmp_dir)
+        f = os.fdopen(fd, "wb")
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            while True:
+                chunk = await upload.read(self.chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_bytes:
+                    raise UploadTooLarge(self.max_bytes)
+                await run_in_threadpool(_write_chunk, f, digest, chunk)
+            await run_in_threadpool(f.close)
+            return await run_in_threadpool(self._commit, tmp_path, digest.hexdigest(), size)
+        except BaseException:
+            f.close()
+            await run_in_threadpool(_remove, tmp_path)
+            raise
+
+    def _commit(self, tmp_path: str, sha256: str, size: int) -> StoredUpload:
+        path = self.blob_path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            os.remove(tmp_path)
+            # Refresh the mtime so the sweep's grace period covers the new reference being written
+            os.utime(path)
+            return StoredUpload(str(path), sha256, size, deduplicated=True)
+        os.replace(tmp_path, path)
+        return StoredUpload(str(path), sha256, size, deduplicated=False)
+
+    def sha256_of(self, path: str) -> str:
+        """Content hash of a stored file (blob names are their hash; older uploads are hashed)"""
+        if Path(path).parent.parent == self.blob_dir:
+            return Path(path).name
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def sweep(self, session: Session, retention_days: Optional[int] = None) -> dict:
+        """
+        Delete stored files that no interview references
+
+        Args:
+            session: Database session
+            retention_days: If set, interviews started longer ago than this first
+                drop their resume reference
+
+        Returns:
+            Summary of expired references and removed files
+        """
+        expired = 0
+        if retention_days:
+            cutoff = datetime.utcnow() - timedelta(days=retention_days)
+            old = session.exec(
+                select(InterviewHistory).where(
+                    InterviewHistory.started_at < cutoff,
+                    InterviewHistory.resume_path.is_not(None)
+                )
+            ).all()
+            for interview in old:
+                interview.resume_path = None
+                session.add(interview)
+            session.commit()
+            expired = len(old)
+
+        referenced = {
+            os.path.normpath(path)
+            for path in session.exec(
+                select(InterviewHistory.resume_path).where(InterviewHistory.resume_path.is_not(None)).distinct()
+            ).all()
+        }
+
+        # Files younger than the grace period may belong to an upload whose interview is not committed yet
+        grace_cutoff = time.time() - self.orphan_grace_seconds
+        removed = kept = freed = 0
+        if self.directory.exists():
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    if os.path.normpath(path) in referenced or stat.st_mtime > grace_cutoff:
+                        kept += 1
+                        continue
+                    _remove(path)
+                    removed += 1
+                    freed += stat.st_size
+
+        summary = {"references_expired": expired, "files_removed": removed, "files_kept": kept, "bytes_freed": freed}
+        logger.info(f"Upload sweep: {summary}")
+        return summary
+
+
+def run_sweep(retention_days: Optional[int] = None) -> Optional[dict]:
+    """Sweep with its own database session (startup thread and sweep_uploads.py)"""
+    from backend.app.db import engine
+
+    try:
+        with Session(engine) as session:
+            return upload_store.sweep(
+                session,
+                retention_days=settings.UPLOAD_RETENTION_DAYS if retention_days is None else retention_days
+            )
+    except Exception as e:
+        logger.error(f"Upload sweep failed: {e}")
+        return None
+
+
+# Global instance
+upload_store = UploadStore(
+    directory=settings.UPLOAD_DIR,
+    max_bytes=settings.UPLOAD_MAX_BYTES,
+    chunk_size=settings.UPLOAD_CHUNK_BYTES,
+    orphan_grace_seconds=settings.UPLOAD_ORPHAN_GRACE_SECONDS
+)
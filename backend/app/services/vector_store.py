@@ -0,0 +1,207 @@
+"""
+Append-only on-disk storage for a vector store namespace
+
+Layout of a namespace directory:
+
+    docs.log         chunk texts (UTF-8), appended back to back
+    docs.idx         int64 (offset, length) of each chunk in docs.log
+    vectors.f32      float32 embedding rows, one per chunk
+    index-<n>.faiss  snapshot of the FAISS index over the first n rows
+
+Adding chunks only appends to these files, so a write costs O(new chunks)
+instead of rewriting the whole corpus. Texts and vectors are read through
+memory maps; loading a namespace reads the newest snapshot and adds the rows
+appended after it. docs.idx is written last and acts as the commit record:
+rows beyond it (from an interrupted append) are truncated on open.
+"""
+from typing import Callable, Optional
+import glob
+import logging
+import os
+import re
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_OFFSET_DTYPE = np.dtype([("offset", "<i8"), ("length", "<i8")])
+_SNAPSHOT_RE = re.compile(r"index-(\d+)\.faiss$")
+
+
+class VectorStore:
+    """Chunk texts and vectors of one namespace, stored in append-only files"""
+
+    def __init__(self, directory: str, dimension: int):
+        self.directory = directory
+        self.dimension = dimension
+        self.log_path = os.path.join(directory, "docs.log")
+        self.offsets_path = os.path.join(directory, "docs.idx")
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self._row_bytes = dimension * 4
+
+        self._log_map = None
+        self._vector_map = None
+        self.snapshot_rows = 0  # rows covered by the newest snapshot
+        self._offsets = self._recover()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.offsets_path)
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def _truncate(path: str, size: int):
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with open(path, "r+b") as f:
+                f.truncate(size)
+
+    def _recover(self) -> np.ndarray:
+        """Read the offset index and drop any partially appended tail"""
+        if not self.exists():
+            return np.zeros(0, dtype=_OFFSET_DTYPE)
+
+        record_size = _OFFSET_DTYPE.itemsize
+        complete = self._size(self.offsets_path) // record_size
+        offsets = np.fromfile(self.offsets_path, dtype=_OFFSET_DTYPE, count=complete)
+
+        # Keep only rows whose text and vector were fully written
+        rows = min(len(offsets), self._size(self.vectors_path) // self._row_bytes)
+        log_size = self._size(self.log_path)
+        while rows and offsets[rows - 1]["offset"] + offsets[rows - 1]["length"] > log_size:
+            rows -= 1
+        offsets = offsets[:rows]
+
+        log_end = int(offsets[-1]["offset"] + offsets[-1]["length"]) if rows else 0
+        self._truncate(self.offsets_path, rows * record_size)
+        self._truncate(self.vectors_path, rows * self._row_bytes)
+        self._truncate(self.log_path, log_end)
+        return offsets
+
+    def append(self, texts: list, vectors: np.ndarray):
+        """
+        Append chunks and their embeddings
+
+        Args:
+            texts: Chunk texts
+            vectors: float32 matrix with one row per text
+        """
+        if not texts:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        encoded = [text.encode("utf-8") for text in texts]
+        lengths = np.array([len(b) for b in encoded], dtype=np.int64)
+
+        with open(self.log_path, "ab") as f:
+            start = f.seek(0, os.SEEK_END)
+            f.write(b"".join(encoded))
+
+        records = np.zeros(len(texts), dtype=_OFFSET_DTYPE)
+        records["offset"] = start + np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        records["length"] = lengths
+
+        with open(self.vectors_path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self.offsets_path, "ab") as f:
+            f.write(records.tobytes())
+
+        self._offsets = np.concatenate((self._offsets, records))
+
+    def _log(self, end: int) -> np.memmap:
+        if self._log_map is None or len(self._log_map) < end:
+            self._log_map = np.memmap(self.log_path, dtype=np.uint8, mode="r")
+        return self._log_map
+
+    def document(self, i: int) -> str:
+        offset, length = int(self._offsets[i]["offset"]), int(self._offsets[i]["length"])
+        if length == 0:
+            return ""
+        return bytes(self._log(offset + length)[offset:offset + length]).decode("utf-8")
+
+    def vectors(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Memory-mapped view of embedding rows [start, stop)"""
+        stop = len(self) if stop is None else stop
+        if stop <= start:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        if self._vector_map is None or len(self._vector_map) < stop:
+            self._vector_map = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(len(self), self.dimension)
+            )
+        return self._vector_map[start:stop]
+
+    def _snapshots(self) -> list:
+        """(rows, path) of existing snapshots, newest first"""
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "index-*.faiss")):
+            match = _SNAPSHOT_RE.search(os.path.basename(path))
+            if match:
+                snapshots.append((int(match.group(1)), path))
+        return sorted(snapshots, reverse=True)
+
+    def load_index(self, new_index: Callable):
+        """
+        Load the newest usable snapshot and add the rows appended after it
+
+        Args:
+            new_index: Factory for an empty index, used when there is no snapshot
+
+        Returns:
+            FAISS index over all stored rows
+        """
+        import faiss
+
+        index, self.snapshot_rows = None, 0
+        for rows, path in self._snapshots():
+            if rows > len(self):
+                continue
+            try:
+                index = faiss.read_index(path)
+                self.snapshot_rows = rows
+                break
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable index snapshot {path}: {e}")
+
+        if index is None:
+            index = new_index()
+        tail = self.vectors(self.snapshot_rows)
+        if len(tail):
+            index.add(np.ascontiguousarray(tail))
+        return index
+
+    def write_snapshot(self, index):
+        """Atomically write a snapshot of the index and remove older ones"""
+        import faiss
+
+        rows = len(self)
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"index-{rows}.faiss")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, path)
+        self.snapshot_rows = rows
+
+        for old_rows, old_path in self._snapshots():
+            if old_rows != rows:
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+    def clear(self):
+        """Delete this namespace's files (other files in the directory are left alone)"""
+        self._log_map = None
+        self._vector_map = None
+        for _, path in self._snapshots():
+            os.remove(path)
+        for path in (self.offsets_path, self.vectors_path, self.log_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._offsets = np.zeros(0, dtype=_OFFSET_DTYPE)
+        self.snapshot_rows = 0
@@ -1,17 +1,243 @@
 from gtts import gTTS
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import asyncio
 import base64
 import io
 import logging
+import re
+import shutil
+import subprocess
+import threading
 from pathlib import Path
+from backend.app.core.config import settings
+from backend.app.services.tts_cache import TTSCache
 
 logger = logging.getLogger(__name__)
 
+class TTSEngine(ABC):
+    """Interface for the speech synthesizers behind VoiceService"""
+    
+    name = "base"
+    media_type = "audio/mpeg"
+    extension = "mp3"
+    concatenable = True  # whether clips can be joined byte-wise (true for MP3)
+    
+    @abstractmethod
+    def synthesize(self, text: str, language: str, slow: bool) -> bytes:
+        """
+        Convert text to audio bytes
+        
+        Args:
+            text: Text to convert to speech
+            language: Language code, e.g. 'en'
+            slow: Whether to speak slowly
+        
+        Returns:
+            Audio bytes in this engine's media type (raises on errors)
+        """
+
+class GTTSEngine(TTSEngine):
+    """Google Translate TTS (network round-trip per request)"""
+    
+    name = "gtts"
+    
+    def synthesize(self, text: str, language: str, slow: bool) -> bytes:
+        tts = gTTS(text=text, lang=language, slow=slow)
+        
+        audio_buffer = io.BytesIO()
+        tts.write_to_fp(audio_buffer)
+        return audio_buffer.getvalue()
+
+class EspeakEngine(TTSEngine):
+    """
+    Local synthesizer using espeak / espeak-ng in a subprocess
+    
+    Works offline. Output is encoded to MP3 with ffmpeg when it is installed,
+    otherwise WAV is served (WAV clips are not pipelined since they cannot
+    be joined byte-wise).
+    """
+    
+    name = "espeak"
+    
+    def __init__(self, binary: str, voice: str, speed: int, encode_mp3: bool, timeout: float):
+        self.binary = shutil.which(binary) or shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.binary:
+            raise RuntimeError(f"TTS engine 'espeak' requested but '{binary}' was not found on PATH")
+        self.voice = voice
+        self.speed = speed
+        self.timeout = timeout
+        self.ffmpeg = shutil.which("ffmpeg") if encode_mp3 else None
+        if not self.ffmpeg:
+            self.media_type = "audio/wav"
+            self.extension = "wav"
+            self.concatenable = False
+    
+    def synthesize(self, text: str, language: str, slow: bool) -> bytes:
+        speed = self.speed * 2 // 3 if slow else self.speed
+        wav = subprocess.run(
+            [self.binary, "-v", self.voice or language, "-s", str(speed), "--stdout", "--stdin"],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=self.timeout,
+            check=True
+        ).stdout
+        if not self.ffmpeg:
+            return wav
+        return subprocess.run(
+            [self.ffmpeg, "-loglevel", "error", "-f", "wav", "-i", "pipe:0", "-f", "mp3", "pipe:1"],
+            input=wav,
+            capture_output=True,
+            timeout=self.timeout,
+            check=True
+        ).stdout
+
+def create_tts_engine(name: str) -> TTSEngine:
+    """Build the TTS engine selected in settings"""
+    if name == "gtts":
+        return GTTSEngine()
+    if name == "espeak":
+        return EspeakEngine(
+            binary=settings.TTS_ESPEAK_BINARY,
+            voice=settings.TTS_ESPEAK_VOICE,
+            speed=settings.TTS_ESPEAK_SPEED,
+            encode_mp3=settings.TTS_ESPEAK_MP3,
+            timeout=settings.TTS_ENGINE_TIMEOUT
+        )
+    raise ValueError(f"Unknown TTS engine: {name}")
+
 class VoiceService:
     """Service for Text-to-Speech conversion"""
     
-    def __init__(self):
+    def __init__(self, engine: TTSEngine = None):
         self.language = 'en'
         self.slow = False
+        self.engine = engine or create_tts_engine(settings.TTS_ENGINE)
+        self.cache = TTSCache(
+            cache_dir=settings.TTS_CACHE_DIR,
+            memory_max_bytes=settings.TTS_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_max_bytes=settings.TTS_CACHE_DISK_MB * 1024 * 1024,
+            extension=self.engine.extension
+        )
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    @property
+    def media_type(self) -> str:
+        return self.engine.media_type
+    
+    def _synthesize_uncached(self, text: str) -> bytes:
+        """Run the configured engine and return the audio bytes"""
+        return self.engine.synthesize(text, self.language, self.slow)
+    
+    def cache_key(self, text: str) -> str:
+        """Content hash identifying the audio for this text, engine and voice settings"""
+        return TTSCache.make_key(text, self.language, self.slow, self.engine.name)
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Bounded worker pool for pipelined segment synthesis"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=settings.TTS_PIPELINE_WORKERS,
+                        thread_name_prefix="tts"
+                    )
+        return self._executor
+    
+    def split_sentences(self, text: str) -> list:
+        """
+        Split text into sentence segments for pipelined synthesis
+        
+        Very short sentences are merged into their neighbour so each segment
+        is worth a separate synthesis request. Engines whose clips cannot be
+        joined byte-wise get the whole text as one segment.
+        """
+        if not self.engine.concatenable:
+            return [text]
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?;:])\s+", text.strip()) if s.strip()]
+        segments = []
+        for sentence in sentences:
+            if segments and len(segments[-1]) < settings.TTS_SEGMENT_MIN_CHARS:
+                segments[-1] = f"{segments[-1]} {sentence}"
+            else:
+                segments.append(sentence)
+        if len(segments) > 1 and len(segments[-1]) < settings.TTS_SEGMENT_MIN_CHARS:
+            tail = segments.pop()
+            segments[-1] = f"{segments[-1]} {tail}"
+        return segments
+    
+    def _synthesize_segment(self, segment: str) -> bytes:
+        """Synthesize one segment, each segment is cached on its own"""
+        return self.cache.get_or_create(self.cache_key(segment), lambda: self._synthesize_uncached(segment))
+    
+    def iter_speech_segments(self, text: str):
+        """
+        Synthesize sentence segments concurrently and yield their audio in order
+        
+        Playback of the first sentence can start while later ones are still
+        being generated. MP3 frames can be concatenated, so the yielded chunks
+        form one valid stream.
+        """
+        segments = self.split_sentences(text)
+        futures = [self._get_executor().submit(self._synthesize_segment, segment) for segment in segments]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    
+    async def stream_speech(self, text: str):
+        """
+        Async version of iter_speech_segments for streaming responses
+        
+        The full clip is stored in the cache once every segment is done, so
+        later requests for the same text are served in one piece.
+        """
+        loop = asyncio.get_running_loop()
+        segments = self.split_sentences(text)
+        futures = [
+            loop.run_in_executor(self._get_executor(), self._synthesize_segment, segment)
+            for segment in segments
+        ]
+        chunks = []
+        try:
+            for future in futures:
+                chunk = await future
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            for future in futures:
+                future.cancel()
+        
+        if len(chunks) > 1:
+            await loop.run_in_executor(self._get_executor(), self.cache.put, self.cache_key(text), b"".join(chunks))
+    
+    def cached_audio(self, text: str) -> Optional[bytes]:
+        """Return the full clip if it is already cached, without synthesizing"""
+        return self.cache.get(self.cache_key(text))
+    
+    def synthesize(self, text: str) -> bytes:
+        """
+        Convert text to speech, serving repeated texts from the audio cache
+        
+        Multi-sentence texts are synthesized sentence by sentence in parallel.
+        
+        Args:
+            text: Text to convert to speech
+        
+        Returns:
+            MP3 audio bytes (raises on synthesis errors)
+        """
+        if len(self.split_sentences(text)) <= 1:
+            return self._synthesize_segment(text)
+        return self.cache.get_or_create(self.cache_key(text), lambda: b"".join(self.iter_speech_segments(text)))
+    
+    def cache_stats(self) -> dict:
+        """Hit/miss counters and sizes of the audio cache"""
+        return self.cache.stats()
     
     def text_to_speech_base64(self, text: str) -> str:
         """
@@ -24,16 +250,10 @@ class VoiceService:
             Base64 encoded MP3 audio string
         """
         try:
-            # Create TTS object
-            tts = gTTS(text=text, lang=self.language, slow=self.slow)
-            
-            # Save to bytes buffer
-            audio_buffer = io.BytesIO()
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
+            audio_bytes = self.synthesize(text)
             
             # Encode to base64
-            audio_base64 = base64.b64encode(audio_buffer.read()).decode('utf-8')
+            audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
             
             return audio_base64
             
@@ -43,7 +263,7 @@ class VoiceService:
     
     def text_to_speech_file(self, text: str, output_path: str) -> bool:
         """
-        Convert text to speech and save as MP3 file
+        Convert text to speech and save as an audio file
         
         Args:
             text: Text to convert to speech
@@ -53,8 +273,7 @@ class VoiceService:
             True if successful, False otherwise
         """
         try:
-            tts = gTTS(text=text, lang=self.language, slow=self.slow)
-            tts.save(output_path)
+            Path(output_path).write_bytes(self.synthesize(text))
             logger.info(f"TTS audio saved to {output_path}")
             return True
             
@@ -0,0 +1,76 @@
+"""
+Background warm-up of slow-to-load subsystems
+
+The embedding model and the vector store load lazily, so the server can
+open its port (and pass health checks) immediately. The warm-up thread,
+started from the app's lifespan hook, loads them ahead of the first
+interview; /ready reports how far it has got.
+"""
+import logging
+import threading
+import time
+
+from backend.app.core.config import settings
+from backend.app.services import embedding, rag
+
+logger = logging.getLogger(__name__)
+
+
+class WarmupState:
+    """Progress of the startup warm-up"""
+
+    def __init__(self):
+        self.status = "not_started"  # not_started | running | done | failed
+        self.error = None
+        self.durations = {}  # subsystem -> seconds spent loading
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _load(self, name: str, loader):
+        start = time.perf_counter()
+        loader()
+        self.durations[name] = round(time.perf_counter() - start, 3)
+        logger.info(f"Warm-up: {name} loaded in {self.durations[name]}s")
+
+    def _run(self):
+        try:
+            # One real encode also initialises the tokenizer and kernels. It must
+            # bypass the embedding cache, where "warm-up" is a hit after the first run
+            if settings.EMBEDDING_WORKER_ENABLED:
+                self._load("embedding_model", lambda: embedding.get_embeddings(["warm-up"], use_cache=False))
+            else:
+                self._load("embedding_model", lambda: embedding.encode_local(["warm-up"]))
+            # Creating the engine and touching the default namespace loads FAISS and the stored index
+            self._load("vector_store", lambda: rag.get_rag_engine().has_documents())
+            self.status = "done"
+        except Exception as e:
+            logger.error(f"Warm-up failed: {e}")
+            self.error = str(e)
+            self.status = "failed"
+
+    def start(self):
+        """Start the warm-up thread once; later calls are no-ops"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.status = "running"
+            self._thread = threading.Thread(target=self._run, name="warmup", daemon=True)
+            self._thread.start()
+
+    def readiness(self) -> dict:
+        """Which subsystems are loaded, for the readiness endpoint"""
+        subsystems = {
+            "embedding_model": embedding.is_model_loaded(),
+            "vector_store": rag.is_rag_engine_loaded(),
+        }
+        return {
+            "ready": all(subsystems.values()),
+            "warmup": self.status,
+            "error": self.error,
+            "subsystems": subsystems,
+            "load_seconds": dict(self.durations),
+        }
+
+
+# Global instance
+warmup = WarmupState()
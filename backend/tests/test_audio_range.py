@@ -0,0 +1,46 @@
+"""Range and If-None-Match handling of the question audio endpoint"""
+import pytest
+
+from backend.app.api.interview import _byte_range, _etag_matches
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=10-", (10, 99)),
+    ("bytes=90-500", (90, 99)),  # end is clamped to the body
+    ("bytes=-10", (90, 99)),  # suffix: the last 10 bytes
+    ("bytes=-500", (0, 99)),
+    (" bytes=5-5 ", (5, 5)),
+])
+def test_byte_range_satisfiable(header, expected):
+    assert _byte_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=100-",  # starts past the end
+    "bytes=20-10",
+    "bytes=-0",
+    "bytes=-",
+    "bytes=0-1,5-6",  # multiple ranges are not supported
+    "items=0-10",
+    "bytes=a-b",
+    "",
+])
+def test_byte_range_rejected(header):
+    assert _byte_range(header, 100) is None
+
+
+def test_byte_range_empty_body():
+    assert _byte_range("bytes=0-", 0) is None
+
+
+def test_etag_matches():
+    etag = '"abc"'
+    assert _etag_matches('"abc"', etag)
+    assert _etag_matches('"other", "abc"', etag)
+    assert _etag_matches('W/"abc"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"other"', etag)
+    assert not _etag_matches(None, etag)
+    assert not _etag_matches("", etag)
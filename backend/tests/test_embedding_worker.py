@@ -0,0 +1,65 @@
+"""Embedding worker: connection authentication and supervision"""
+import os
+import stat
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.services import embedding_worker
+from backend.app.services.embedding_worker import EmbeddingWorkerClient, EmbeddingWorkerServer
+
+
+def test_client_requires_a_key(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_WORKER_AUTHKEY", "")
+    client = EmbeddingWorkerClient("unused.sock", timeout=1.0)
+    with pytest.raises(ValueError):
+        client._round_trip(["hello"])
+
+
+@pytest.mark.parametrize("authkey", ["", "changethis"])
+def test_tcp_refuses_weak_key(monkeypatch, authkey):
+    monkeypatch.setattr(settings, "EMBEDDING_WORKER_AUTHKEY", authkey)
+    server = EmbeddingWorkerServer("127.0.0.1:0", max_batch=8, max_wait_ms=1.0)
+    with pytest.raises(ValueError):
+        server._listen()
+
+
+def test_unix_socket_is_owner_only(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "EMBEDDING_WORKER_AUTHKEY", "k" * 8)
+    address = str(tmp_path / "worker.sock")
+    listener = EmbeddingWorkerServer(address, max_batch=8, max_wait_ms=1.0)._listen()
+    try:
+        assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+    finally:
+        listener.close()
+
+
+class FakeProcess:
+    def __init__(self, code: int):
+        self.code = code
+
+    def poll(self):
+        return self.code
+
+    def wait(self):
+        return self.code
+
+    def terminate(self):
+        pass
+
+
+def test_supervisor_restarts_until_misconfigured(monkeypatch):
+    codes = [-9, 1, embedding_worker._EXIT_MISCONFIGURED]
+    spawned = []
+
+    def popen(args):
+        spawned.append(args)
+        return FakeProcess(codes[len(spawned) - 1])
+
+    monkeypatch.setattr(embedding_worker.subprocess, "Popen", popen)
+    monkeypatch.setattr(embedding_worker.signal, "signal", lambda *args: None)
+    monkeypatch.setattr(embedding_worker, "_RESPAWN_BACKOFF_SECONDS", 0.0)
+
+    embedding_worker.supervise()
+    assert len(spawned) == 3
+    assert all("--supervise" not in args for args in spawned)
@@ -0,0 +1,68 @@
+"""Parity of the ONNX Runtime embedding export with the PyTorch model
+
+Skipped unless the export (python -m backend.app.services.onnx_embedding)
+and the sentence-transformers model are both available locally.
+"""
+import os
+
+import numpy as np
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.services.embedding import EMBEDDING_DIMENSION, MODEL_NAME
+from backend.app.services import onnx_embedding
+
+MIN_COSINE = 0.98
+MIN_TOPK_OVERLAP = 0.8
+
+SENTENCES = [
+    "Python developer with five years of experience building REST APIs using FastAPI and Django.",
+    "Led a team of four engineers to migrate a monolith to microservices on Kubernetes.",
+    "Bachelor of Technology in Computer Science, graduated with distinction.",
+    "We are looking for a backend engineer comfortable with PostgreSQL, Redis and message queues.",
+    "Strong communication skills and experience mentoring junior developers.",
+    "Implemented a recommendation engine that increased user engagement by 18 percent.",
+    "Familiar with React, TypeScript and modern frontend tooling.",
+    "Responsibilities include designing scalable systems and reviewing pull requests.",
+    "Tell me about a time you disagreed with your manager.",
+    "What is the difference between a process and a thread?",
+    "A train 100 metres long crosses a pole in 5 seconds. What is its speed?",
+    "Certified AWS Solutions Architect with hands-on experience in Lambda and DynamoDB.",
+    "",
+    "SQL " * 400,  # longer than the model's max sequence length, so truncation must match
+]
+
+
+def _onnx_model(quantized: bool):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tokenizers")
+    model_file = onnx_embedding.QUANTIZED_MODEL_FILE if quantized else onnx_embedding.MODEL_FILE
+    if not os.path.exists(os.path.join(settings.EMBEDDING_ONNX_DIR, model_file)):
+        pytest.skip(f"No ONNX export in {settings.EMBEDDING_ONNX_DIR}")
+    return onnx_embedding.OnnxEmbeddingModel(settings.EMBEDDING_ONNX_DIR, quantized=quantized)
+
+
+@pytest.fixture(scope="module")
+def reference():
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+    try:
+        model = sentence_transformers.SentenceTransformer(MODEL_NAME, device="cpu")
+    except Exception as e:
+        pytest.skip(f"PyTorch model {MODEL_NAME} unavailable: {e}")
+    return np.asarray(model.encode(SENTENCES, batch_size=4), dtype=np.float32)
+
+
+@pytest.mark.parametrize("quantized", [True, False], ids=["int8", "fp32"])
+def test_onnx_parity(quantized, request):
+    model = _onnx_model(quantized)
+    reference = request.getfixturevalue("reference")
+
+    # Batch size differs from the reference so padding differences would show
+    vectors = model.encode(SENTENCES, batch_size=3)
+    assert vectors.shape == (len(SENTENCES), EMBEDDING_DIMENSION)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-4)
+
+    result = onnx_embedding.parity(reference, vectors)
+    assert result["min_cosine"] >= MIN_COSINE, result
+    assert result["topk_overlap"] >= MIN_TOPK_OVERLAP, result
+    np.testing.assert_allclose(model.encode(SENTENCES[0]), vectors[0], atol=1e-4)
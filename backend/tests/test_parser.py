@@ -0,0 +1,58 @@
+"""Parser pool deadlines: a timed-out file must not take other uploads' parses down with it"""
+import asyncio
+import time
+
+import pytest
+
+from backend.app.core.config import settings
+from backend.app.services import parser
+from backend.app.services.parser import ResumeParseTimeout
+
+TIMEOUT = 3.0
+
+
+def _sleep_and_return(seconds: float, value: str) -> str:
+    time.sleep(seconds)
+    return value
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PARSER_WORKERS", 2)
+    monkeypatch.setattr(settings, "PARSER_TIMEOUT_SECONDS", TIMEOUT)
+    parser.shutdown_parser_pool()
+    yield
+    parser.shutdown_parser_pool()
+
+
+async def _parse(seconds: float, value: str, delay: float = 0.0) -> str:
+    await asyncio.sleep(delay)
+    return await parser._with_deadline(parser._run(_sleep_and_return, seconds, value), f"{value}.pdf")
+
+
+def test_timeout_spares_other_parses(pool_settings):
+    async def scenario():
+        # Start both workers so spawn start-up does not count against the deadlines
+        await asyncio.gather(_parse(0.2, "a"), _parse(0.2, "b"))
+        old_pool = parser._pool
+        processes = list(old_pool._processes.values())
+
+        # The other parse is still running on the old pool when the first one times out
+        hung, other = await asyncio.gather(
+            _parse(60, "hung"), _parse(2.0, "other", delay=TIMEOUT - 1.0), return_exceptions=True
+        )
+        assert isinstance(hung, ResumeParseTimeout)
+        assert other == "other"
+        assert parser._pool is not old_pool
+
+        # The retired pool's processes are terminated once the other parse is done
+        for _ in range(50):
+            if not any(process.is_alive() for process in processes):
+                break
+            await asyncio.sleep(0.1)
+        assert not any(process.is_alive() for process in processes)
+
+        assert await _parse(0.1, "after") == "after"
+
+    asyncio.run(scenario())
+
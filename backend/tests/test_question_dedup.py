@@ -0,0 +1,90 @@
+"""Regeneration of repeated questions before they are persisted"""
+import asyncio
+
+import pytest
+
+from backend.app.api import interview
+from backend.app.core.config import settings
+from backend.app.services.question_guard import QuestionGuard
+
+EARLIER = "Tell me about yourself."
+
+
+class FakeChat:
+    """Chat session producing scripted questions"""
+
+    def __init__(self, replies: list, fail_after: int = None):
+        self.interview_id = 1
+        self.last_error = None
+        self.turns = []
+        self.replies = list(replies)
+        self.fail_after = fail_after
+        self.asks = 0
+
+    def record(self, message: str, question: str):
+        self.turns += [message, question]
+
+    def rewind(self):
+        self.turns = self.turns[:-2]
+
+    async def ask(self, message: str) -> str:
+        self.asks += 1
+        if self.fail_after is not None and self.asks > self.fail_after:
+            self.last_error = "Error: unavailable"
+            return self.last_error
+        question = self.replies.pop(0)
+        self.record(message, question)
+        return question
+
+
+@pytest.fixture
+def similarities(monkeypatch):
+    """Similarity of each candidate to EARLIER; anything below 0.9 is not a duplicate"""
+    scores = {}
+
+    def find_duplicate(interview_id, question, asked=None):
+        similarity = scores.get(question, 0.0)
+        return (EARLIER, similarity) if similarity >= 0.9 else None
+
+    monkeypatch.setattr(interview.question_guard, "find_duplicate", find_duplicate)
+    monkeypatch.setattr(settings, "QUESTION_GUARD_ENABLED", True)
+    monkeypatch.setattr(settings, "QUESTION_GUARD_MAX_RETRIES", 2)
+    return scores
+
+
+def _deduplicate(chat: FakeChat, question: str) -> str:
+    chat.record("next", question)
+    return asyncio.run(interview._deduplicated_question(chat, "next", question, [EARLIER]))
+
+
+def test_regenerated_question_is_kept(similarities):
+    similarities.update({"Introduce yourself.": 0.97})
+    chat = FakeChat(["What did you build at your last job?"])
+    assert _deduplicate(chat, "Introduce yourself.") == "What did you build at your last job?"
+    assert chat.turns[-1] == "What did you build at your last job?"
+
+
+def test_last_retry_is_checked_and_least_similar_kept(similarities):
+    similarities.update({"Introduce yourself.": 0.97, "Describe yourself.": 0.91, "Who are you?": 0.95})
+    chat = FakeChat(["Describe yourself.", "Who are you?"])
+    assert _deduplicate(chat, "Introduce yourself.") == "Describe yourself."
+    assert chat.asks == 2
+    # The session ends with the question actually asked, once
+    assert chat.turns[-1] == "Describe yourself."
+    assert len(chat.turns) == 2
+
+
+def test_failed_regeneration_keeps_least_similar(similarities):
+    similarities.update({"Introduce yourself.": 0.97, "Describe yourself.": 0.93})
+    chat = FakeChat(["Describe yourself."], fail_after=1)
+    assert _deduplicate(chat, "Introduce yourself.") == "Describe yourself."
+    assert chat.last_error is None
+    assert chat.turns[-1] == "Describe yourself."
+
+
+def test_forget_checked():
+    guard = QuestionGuard(threshold=0.9, max_interviews=4)
+    guard._last_checked[1] = ("question", None)
+    guard.forget_checked(1)
+    guard.forget_checked(2)
+    assert guard._last_checked == {}
@@ -0,0 +1,99 @@
+"""Memory footprint and re-ranking of quantized RAG namespaces"""
+import numpy as np
+import pytest
+
+from backend.app.services import ann_index, rag
+from backend.app.services.rag import RAGService, interview_namespace
+
+CHUNKS = 40
+
+
+@pytest.fixture
+def embedded(monkeypatch):
+    """Deterministic unit vectors per text, recording every embedding call"""
+    rng = np.random.default_rng(7)
+    vectors, calls = {}, []
+
+    def get_embeddings(texts, use_cache=True):
+        calls.append(list(texts))
+        for text in texts:
+            if text not in vectors:
+                vector = rng.standard_normal(rag.EMBEDDING_DIMENSION).astype(np.float32)
+                vectors[text] = vector / np.linalg.norm(vector)
+        return np.stack([vectors[text] for text in texts])
+
+    monkeypatch.setattr(rag, "get_embeddings", get_embeddings)
+    return vectors, calls
+
+
+def _service(tmp_path, storage: str, **kwargs) -> RAGService:
+    params = {**ann_index.default_index_params(), "storage": storage}
+    return RAGService(base_path=str(tmp_path), index_params=params, rerank_factor=4, **kwargs)
+
+
+@pytest.mark.parametrize("storage, bytes_per_vector", [
+    ("float32", 4 * rag.EMBEDDING_DIMENSION),
+    ("fp16", 2 * rag.EMBEDDING_DIMENSION),
+    ("int8", rag.EMBEDDING_DIMENSION),
+])
+def test_in_memory_namespace_holds_only_index_codes(tmp_path, embedded, storage, bytes_per_vector):
+    service = _service(tmp_path, storage)
+    namespace = interview_namespace(1)
+    for i in range(CHUNKS):
+        service.add_document(f"chunk {i}", namespace=namespace)
+
+    memory = service.stats()["memory"][namespace]
+    assert memory == {"vectors": CHUNKS, "index_bytes": CHUNKS * bytes_per_vector, "mapped_bytes": 0}
+    assert not hasattr(service._get(namespace, create=False), "_vectors")
+
+
+def test_in_memory_quantized_namespace_searches_codes(tmp_path, embedded):
+    vectors, calls = embedded
+    service = _service(tmp_path, "int8")
+    namespace = interview_namespace(2)
+    for i in range(CHUNKS):
+        service.add_document(f"chunk {i}", namespace=namespace)
+
+    vectors["query"] = vectors["chunk 13"] + 0.01 * vectors["chunk 4"]
+    calls.clear()
+    assert service.search("query", k=1, namespace=namespace) == ["chunk 13"]
+    assert calls == [["query"]]
+
+    service.rebuild(namespace)
+    assert service.search("query", k=1, namespace=namespace) == ["chunk 13"]
+
+
+def test_persisted_namespace_reranks_from_store(tmp_path, embedded, monkeypatch):
+    vectors, calls = embedded
+    service = _service(tmp_path, "int8")
+    for i in range(CHUNKS):
+        service.add_document(f"chunk {i}")
+
+    reranked = []
+    rerank = ann_index.rerank
+    monkeypatch.setattr(ann_index, "rerank", lambda query, ids, exact: reranked.append(exact) or rerank(query, ids, exact))
+    vectors["query"] = vectors["chunk 5"] + 0.5 * vectors["chunk 6"]
+    calls.clear()
+    assert service.search("query", k=2) == ["chunk 5", "chunk 6"]
+    assert calls == [["query"]]
+    # Exact rows come from the store, not from the codes
+    np.testing.assert_array_equal(reranked[0][0], vectors["chunk 5"])
+
+    memory = service.stats()["memory"]["default"]
+    assert memory["index_bytes"] == CHUNKS * rag.EMBEDDING_DIMENSION
+    assert memory["mapped_bytes"] == CHUNKS * rag.EMBEDDING_DIMENSION * 4
+
+
+def test_index_bytes_counts_graph_and_lists():
+    dimension = 32
+    vectors = np.random.default_rng(0).random((500, dimension), dtype=np.float32)
+    params = {**ann_index.default_index_params(), "hnsw_m": 8, "ivf_nlist": 4, "pq_m": 4, "pq_nbits": 4}
+    hnsw = ann_index.create_index("hnsw", dimension, params)
+    hnsw.add(vectors)
+    assert ann_index.index_bytes(hnsw) > ann_index.vector_bytes(hnsw) == 500 * dimension * 4
+
+    ivfpq = ann_index.create_index("ivfpq", dimension, params)
+    ivfpq.train(vectors)
+    ivfpq.add(vectors)
+    # Codes, int64 ids, PQ codebooks and the coarse centroids
+    assert ann_index.index_bytes(ivfpq) >= 500 * (ivfpq.code_size + 8) + 4 * dimension * 4
@@ -0,0 +1,293 @@
+"""Session store backends against a fake clock and an in-process RESP server"""
+import socketserver
+import threading
+
+import pytest
+
+from backend.app.services import session_store
+from backend.app.services.session_store import RedisError, RedisSessionStore, RespClient, SQLiteSessionStore
+
+TTL = 100
+
+
+class FakeClock:
+    """Stands in for the time module in session_store and the RESP stub"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+class FakeRedis:
+    """The subset of Redis commands the session store uses, with key expiry on `clock`"""
+
+    def __init__(self, clock: FakeClock, password: str = None):
+        self.clock = clock
+        self.password = password
+        self.commands = []
+        self.strings = {}  # key -> (value, deadline or None)
+        self.zsets = {}
+        self.hashes = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key):
+        entry = self.strings.get(key)
+        if entry and entry[1] is not None and entry[1] <= self.clock.time():
+            del self.strings[key]
+            return None
+        return entry
+
+    def execute(self, command: bytes, *args):
+        with self._lock:
+            name = command.decode().upper()
+            self.commands.append(name)
+            handler = getattr(self, f"cmd_{name.lower()}", None)
+            if handler is None:
+                raise RedisError(f"ERR unknown command '{name}'")
+            return handler(*args)
+
+    def cmd_auth(self, *args):
+        if args[-1].decode() != self.password:
+            raise RedisError("WRONGPASS invalid password")
+        return "OK"
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_get(self, key):
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    def cmd_set(self, key, value, *options):
+        deadline = None
+        if options and options[0].upper() == b"EX":
+            deadline = self.clock.time() + int(options[1])
+        self.strings[key] = (value, deadline)
+        return "OK"
+
+    def cmd_expire(self, key, seconds):
+        entry = self._live(key)
+        if not entry:
+            return 0
+        self.strings[key] = (entry[0], self.clock.time() + int(seconds))
+        return 1
+
+    def cmd_del(self, *keys):
+        return sum(self.strings.pop(key, None) is not None for key in keys)
+
+    def cmd_zadd(self, key, score, member):
+        zset = self.zsets.setdefault(key, {})
+        added = member not in zset
+        zset[member] = float(score)
+        return int(added)
+
+    def cmd_zrem(self, key, *members):
+        zset = self.zsets.get(key, {})
+        return sum(zset.pop(member, None) is not None for member in members)
+
+    def _sorted(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: (item[1], item[0]))
+
+    def cmd_zrange(self, key, start, stop):
+        members = [member for member, _ in self._sorted(key)]
+        stop = int(stop)
+        return members[int(start):None if stop == -1 else stop + 1]
+
+    def cmd_zrangebyscore(self, key, low, high):
+        low, high = float(low), float(high)
+        return [member for member, score in self._sorted(key) if low <= score <= high]
+
+    def cmd_hset(self, key, field, value):
+        fields = self.hashes.setdefault(key, {})
+        added = field not in fields
+        fields[field] = value
+        return int(added)
+
+    def cmd_hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    def cmd_hdel(self, key, *fields):
+        hash_ = self.hashes.get(key, {})
+        return sum(hash_.pop(field, None) is not None for field in fields)
+
+    def cmd_hvals(self, key):
+        return list(self.hashes.get(key, {}).values())
+
+
+def _encode_reply(reply) -> bytes:
+    if isinstance(reply, RedisError):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
+
+
+class RespServer(socketserver.ThreadingTCPServer):
+    """Serves a FakeRedis over RESP2 on a local port"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, redis: FakeRedis):
+        self.redis = redis
+        self.connections = set()
+        super().__init__(("127.0.0.1", 0), RespHandler)
+
+    @property
+    def url(self) -> str:
+        return "redis://127.0.0.1:%d/0" % self.server_address[1]
+
+    def drop_connections(self):
+        for connection in list(self.connections):
+            connection.close()
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        self.server.connections.add(self.connection)
+        try:
+            while True:
+                header = self.rfile.readline()
+                if not header:
+                    return
+                assert header[:1] == b"*"
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                try:
+                    reply = self.server.redis.execute(*args)
+                except RedisError as e:
+                    reply = e
+                self.wfile.write(_encode_reply(reply))
+        except OSError:
+            pass
+        finally:
+            self.server.connections.discard(self.connection)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(session_store, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def redis_server(clock):
+    server = RespServer(FakeRedis(clock))
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.drop_connections()
+    server.server_close()
+
+
+def _make_store(backend: str, tmp_path, redis_server, max_bytes: int):
+    if backend == "sqlite":
+        return SQLiteSessionStore(str(tmp_path / "sessions.sqlite"), TTL, max_bytes)
+    return RedisSessionStore(redis_server.url, TTL, max_bytes)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def make_store(request, tmp_path, redis_server):
+    return lambda max_bytes=1 << 20: _make_store(request.param, tmp_path, redis_server, max_bytes)
+
+
+def _context(i: int) -> dict:
+    return {"resume": f"resume {i} " + "x" * 100, "job_description": "jd", "types": ["HR"]}
+
+
+def test_put_get_delete(make_store):
+    store = make_store()
+    assert store.get(1) is None
+    store.put(1, _context(1))
+    assert store.get(1) == _context(1)
+    store.put(1, _context(2))
+    assert store.get(1) == _context(2)
+    store.delete(1)
+    assert store.get(1) is None
+
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"], stats["bytes"]) == (2, 2, 0, 0)
+
+
+def test_entries_expire_after_ttl(make_store, clock):
+    store = make_store()
+    store.put(1, _context(1))
+    clock.advance(TTL + 1)
+    assert store.get(1) is None
+    assert store.stats()["entries"] == 0
+
+
+def test_get_refreshes_ttl(make_store, clock):
+    store = make_store()
+    store.put(1, _context(1))
+    for _ in range(3):
+        clock.advance(TTL * 0.6)
+        assert store.get(1) == _context(1)
+
+
+def test_least_recently_used_is_evicted(make_store, clock):
+    size = len(session_store._encode(_context(1)))
+    store = make_store(max_bytes=2 * size + size // 2)
+    for i in (1, 2):
+        store.put(i, _context(i))
+        clock.advance(1)
+    assert store.get(1) is not None  # 2 is now the least recently used
+    clock.advance(1)
+    store.put(3, _context(3))
+
+    assert store.get(2) is None
+    assert store.get(1) == _context(1)
+    assert store.get(3) == _context(3)
+    stats = store.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 2 * size, 1)
+
+
+def test_oversized_entry_is_kept(make_store):
+    # The entry being written is never its own victim
+    store = make_store(max_bytes=10)
+    store.put(1, _context(1))
+    assert store.get(1) == _context(1)
+
+
+def test_shared_between_store_instances(make_store):
+    make_store().put(1, _context(1))
+    assert make_store().get(1) == _context(1)
+
+
+def test_redis_client_reconnects(redis_server, clock):
+    store = RedisSessionStore(redis_server.url, TTL, 1 << 20)
+    store.put(1, _context(1))
+    redis_server.drop_connections()
+    assert store.get(1) == _context(1)
+
+
+def test_redis_client_authenticates(redis_server):
+    redis_server.redis.password = "secret"
+    url = redis_server.url.replace("redis://", "redis://:secret@").replace("/0", "/2")
+    client = RespClient(url)
+    assert client.execute("SET", "k", "v") == "OK"
+    assert client.execute("GET", "k") == b"v"
+    assert redis_server.redis.commands[:2] == ["AUTH", "SELECT"]
+
+
+def test_redis_error_reply(redis_server):
+    client = RespClient(redis_server.url)
+    with pytest.raises(RedisError):
+        client.execute("NOSUCHCOMMAND")
+    assert client.execute("GET", "missing") is None  # the connection is still usable
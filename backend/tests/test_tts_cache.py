@@ -0,0 +1,54 @@
+"""Two-tier TTS cache: lookups and single production under concurrency"""
+import threading
+import time
+
+import pytest
+
+from backend.app.services.tts_cache import TTSCache
+
+
+def _produce_concurrently(cache: TTSCache, key: str, threads: int = 8) -> tuple:
+    calls = []
+
+    def producer() -> bytes:
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return b"x" * 100
+
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(cache.get_or_create(key, producer)))
+               for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+        time.sleep(0.01)
+    for worker in workers:
+        worker.join()
+    return calls, results
+
+
+@pytest.mark.parametrize("memory_max_bytes", [1 << 20, 10], ids=["memory", "disk-only"])
+def test_clip_is_produced_once(tmp_path, memory_max_bytes):
+    cache = TTSCache(str(tmp_path), memory_max_bytes=memory_max_bytes, disk_max_bytes=1 << 20)
+    key = cache.make_key("Hello there", "en", False)
+
+    calls, results = _produce_concurrently(cache, key)
+    assert len(calls) == 1
+    assert results == [b"x" * 100] * 8
+    assert cache._key_locks == {}
+
+
+def test_tiers_and_stats(tmp_path):
+    cache = TTSCache(str(tmp_path), memory_max_bytes=150, disk_max_bytes=1 << 20)
+    first, second = cache.make_key("one", "en", False), cache.make_key("two", "en", False)
+    assert cache.get(first) is None
+    cache.put(first, b"a" * 100)
+    cache.put(second, b"b" * 100)  # pushes the first clip out of memory
+
+    assert cache.get(second) == b"b" * 100
+    assert cache.get(first) == b"a" * 100  # read back from disk
+    stats = cache.stats()
+    assert (stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (1, 1, 1)
+    assert stats["disk_bytes"] == 200
+
+    # A fresh cache on the same directory finds both clips on disk
+    assert TTSCache(str(tmp_path), 150, 1 << 20).get(second) == b"b" * 100
@@ -0,0 +1,131 @@
+"""Append-only vector store files: reopening, crash recovery and snapshots"""
+import os
+
+import faiss
+import numpy as np
+import pytest
+
+from backend.app.services.vector_store import VectorStore, _OFFSET_DTYPE
+
+DIM = 4
+
+
+def _vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((n, DIM), dtype=np.float32)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = VectorStore(str(tmp_path / "ns"), DIM)
+    store.append(["alpha", "béta", ""], _vectors(3))
+    return store
+
+
+def test_reopen_reads_texts_and_vectors(store):
+    reopened = VectorStore(store.directory, DIM)
+    assert len(reopened) == 3
+    assert [reopened.document(i) for i in range(3)] == ["alpha", "béta", ""]
+    np.testing.assert_array_equal(reopened.vectors(), _vectors(3))
+    np.testing.assert_array_equal(reopened.vectors(1, 2), _vectors(3)[1:2])
+
+
+def test_append_after_reopen(store):
+    reopened = VectorStore(store.directory, DIM)
+    reopened.append(["gamma"], _vectors(1, seed=1))
+    assert len(VectorStore(store.directory, DIM)) == 4
+    assert reopened.document(3) == "gamma"
+
+
+def _append_raw(path: str, data: bytes):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_recover_drops_uncommitted_text_and_vector(store):
+    # Crash after the text and vector were written but before docs.idx
+    _append_raw(store.log_path, b"lost")
+    _append_raw(store.vectors_path, _vectors(1, seed=2).tobytes())
+    sizes = {p: os.path.getsize(p) for p in (store.log_path, store.vectors_path)}
+
+    recovered = VectorStore(store.directory, DIM)
+    assert len(recovered) == 3
+    assert os.path.getsize(store.log_path) == sizes[store.log_path] - 4
+    assert os.path.getsize(store.vectors_path) == sizes[store.vectors_path] - DIM * 4
+    recovered.append(["delta"], _vectors(1, seed=3))
+    assert VectorStore(store.directory, DIM).document(3) == "delta"
+
+
+def test_recover_drops_partial_records(store):
+    # Torn writes: half an offset record and half a vector row
+    _append_raw(store.offsets_path, b"\0" * (_OFFSET_DTYPE.itemsize // 2))
+    _append_raw(store.vectors_path, b"\0" * 6)
+    recovered = VectorStore(store.directory, DIM)
+    assert len(recovered) == 3
+    assert os.path.getsize(store.offsets_path) == 3 * _OFFSET_DTYPE.itemsize
+    assert os.path.getsize(store.vectors_path) == 3 * DIM * 4
+
+
+def test_recover_drops_rows_missing_their_vector(store):
+    # An offset record whose vector never reached the disk
+    with open(store.vectors_path, "r+b") as f:
+        f.truncate(2 * DIM * 4)
+    recovered = VectorStore(store.directory, DIM)
+    assert len(recovered) == 2
+    assert [recovered.document(i) for i in range(2)] == ["alpha", "béta"]
+    assert os.path.getsize(store.log_path) == len("alpha".encode()) + len("béta".encode())
+
+
+def test_recover_drops_rows_missing_their_text(store):
+    with open(store.log_path, "r+b") as f:
+        f.truncate(len(b"alpha") + 1)
+    recovered = VectorStore(store.directory, DIM)
+    assert len(recovered) == 1
+    assert recovered.document(0) == "alpha"
+
+
+def test_missing_directory_is_empty(tmp_path):
+    store = VectorStore(str(tmp_path / "missing"), DIM)
+    assert len(store) == 0
+    assert not store.exists()
+    assert store.vectors().shape == (0, DIM)
+
+
+def test_load_index_from_snapshot_and_tail(store):
+    index = store.load_index(lambda: faiss.IndexFlatIP(DIM))
+    assert index.ntotal == 3
+    store.write_snapshot(index)
+    store.append(["gamma", "delta"], _vectors(2, seed=4))
+
+    reopened = VectorStore(store.directory, DIM)
+    index = reopened.load_index(lambda: pytest.fail("snapshot should be used"))
+    assert reopened.snapshot_rows == 3
+    assert index.ntotal == 5
+
+
+def test_load_index_skips_unusable_snapshots(store):
+    store.write_snapshot(store.load_index(lambda: faiss.IndexFlatIP(DIM)))
+    # Newer but corrupt, and one covering rows that were never committed
+    with open(os.path.join(store.directory, "index-3.faiss"), "r+b") as f:
+        f.truncate(8)
+    with open(os.path.join(store.directory, "index-9.faiss"), "wb") as f:
+        f.write(b"future")
+
+    reopened = VectorStore(store.directory, DIM)
+    index = reopened.load_index(lambda: faiss.IndexFlatIP(DIM))
+    assert reopened.snapshot_rows == 0
+    assert index.ntotal == 3
+
+
+def test_write_snapshot_replaces_older_ones(store):
+    store.write_snapshot(store.load_index(lambda: faiss.IndexFlatIP(DIM)))
+    store.append(["gamma"], _vectors(1, seed=5))
+    store.write_snapshot(store.load_index(lambda: faiss.IndexFlatIP(DIM)))
+    assert sorted(os.listdir(store.directory)) == ["docs.idx", "docs.log", "index-4.faiss", "vectors.f32"]
+
+
+def test_clear_removes_files(store):
+    store.write_snapshot(store.load_index(lambda: faiss.IndexFlatIP(DIM)))
+    store.clear()
+    assert len(store) == 0
+    assert os.listdir(store.directory) == []
+    assert len(VectorStore(store.directory, DIM)) == 0
@@ -0,0 +1,101 @@
+"""
+Parity check and throughput benchmark of the embedding backends
+
+Compares the ONNX Runtime export (int8 and fp32) against the PyTorch
+sentence-transformers model: per-text cosine similarity, agreement of the
+top-k neighbours of a retrieval query set, and texts/second per backend.
+Exits with status 1 if parity is below --min-cosine, so it can gate a new export.
+
+Usage:
+    python -m backend.app.services.onnx_embedding          (export first)
+    python bench_embeddings.py [--onnx-dir DIR] [--corpus FILE] [--min-cosine 0.98]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.core.config import settings
+from backend.app.services.embedding import MODEL_NAME
+from backend.app.services.onnx_embedding import OnnxEmbeddingModel, parity
+
+SAMPLE_TEXTS = [
+    "Python developer with five years of experience building REST APIs using FastAPI and Django.",
+    "Led a team of four engineers to migrate a monolith to microservices on Kubernetes.",
+    "Bachelor of Technology in Computer Science, graduated with distinction.",
+    "We are looking for a backend engineer comfortable with PostgreSQL, Redis and message queues.",
+    "Strong communication skills and experience mentoring junior developers.",
+    "Implemented a recommendation engine that increased user engagement by 18 percent.",
+    "Familiar with React, TypeScript and modern frontend tooling.",
+    "Responsibilities include designing scalable systems and reviewing pull requests.",
+    "Tell me about a time you disagreed with your manager.",
+    "What is the difference between a process and a thread?",
+    "A train 100 metres long crosses a pole in 5 seconds. What is its speed?",
+    "Certified AWS Solutions Architect with hands-on experience in Lambda and DynamoDB.",
+]
+
+
+def load_corpus(path: str) -> list:
+    if not path:
+        # Vary the samples so the corpus has realistic length spread
+        return [f"{text} {SAMPLE_TEXTS[(i * 7) % len(SAMPLE_TEXTS)] * (i % 4)}".strip()
+                for i, text in enumerate(SAMPLE_TEXTS * 20)]
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def throughput(model, texts: list, batch_size: int, rounds: int = 3) -> float:
+    model.encode(texts[:batch_size], batch_size=batch_size)  # warm up
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        model.encode(texts, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--onnx-dir", default=settings.EMBEDDING_ONNX_DIR)
+    parser.add_argument("--corpus", help="text file, one text per line")
+    parser.add_argument("--batch-size", type=int, default=settings.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--min-cosine", type=float, default=0.98)
+    args = parser.parse_args()
+
+    from sentence_transformers import SentenceTransformer
+
+    texts = load_corpus(args.corpus)
+    print(f"texts={len(texts)} batch_size={args.batch_size}")
+
+    backends = {"torch": SentenceTransformer(args.model, device="cpu")}
+    for quantized in (True, False):
+        name = "onnx-int8" if quantized else "onnx-fp32"
+        try:
+            backends[name] = OnnxEmbeddingModel(args.onnx_dir, quantized=quantized)
+        except Exception as e:
+            print(f"{name}: unavailable ({e})")
+
+    reference = np.asarray(backends["torch"].encode(texts, batch_size=args.batch_size), dtype=np.float32)
+    failed = False
+    for name, model in backends.items():
+        rate = throughput(model, texts, args.batch_size)
+        line = f"{name:10s} {rate:8.1f} texts/s"
+        if name != "torch":
+            result = parity(reference, model.encode(texts, batch_size=args.batch_size))
+            line += (f"  cosine min={result['min_cosine']:.4f} mean={result['mean_cosine']:.4f}"
+                     f"  top5 overlap={result['topk_overlap']:.3f}")
+            failed = failed or result["min_cosine"] < args.min_cosine
+        print(line)
+
+    if failed:
+        print(f"FAIL: cosine similarity to PyTorch below {args.min_cosine}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Benchmark resume parsing
+
+Compares the old in-process extraction (on the event loop, text built with
++=) against the process pool used by backend.app.services.parser, with and
+without page-parallel PDF extraction. Reports per-file latency and the worst
+event-loop stall seen by a heartbeat task while a batch of uploads is parsed.
+
+Usage:
+    python bench_parser.py [--corpus DIR] [--concurrency 8] [--rounds 3]
+
+Without --corpus, synthetic PDF and DOCX resumes of 2, 20 and 60 pages are generated.
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import PyPDF2
+from docx import Document
+
+from backend.app.core.config import settings
+from backend.app.services import parser as resume_parser
+
+LINES = [
+    "Senior Software Engineer - Acme Corp (2019 - present)",
+    "Designed and operated REST APIs in Python (FastAPI, Django) serving 2M requests per day.",
+    "Led the migration of a monolith to microservices on Kubernetes with zero downtime.",
+    "Mentored four junior engineers and introduced code review guidelines.",
+    "Skills: Python, Go, PostgreSQL, Redis, Kafka, AWS, Terraform, Docker.",
+    "B.Tech in Computer Science, graduated with distinction.",
+]
+
+
+def make_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Minimal multi-page PDF with Helvetica text (no PDF library needed)"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        rows = [f"{LINES[(page + i) % len(LINES)]} ({page + 1}.{i + 1})" for i in range(lines_per_page)]
+        text = "".join(f"({row}) Tj T* " for row in rows)
+        stream = f"BT /F1 10 Tf 12 TL 40 800 Td {text}ET".encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def make_docx(pages: int, lines_per_page: int = 45) -> bytes:
+    doc = Document()
+    for i in range(pages * lines_per_page):
+        doc.add_paragraph(LINES[i % len(LINES)])
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def load_corpus(directory: str) -> list:
+    if not directory:
+        return [(f"synthetic_{pages}p.{kind}", make(pages))
+                for pages in (2, 20, 60) for kind, make in (("pdf", make_pdf), ("docx", make_docx))]
+    files = []
+    for name in sorted(os.listdir(directory)):
+        if name.lower().endswith((".pdf", ".docx")):
+            with open(os.path.join(directory, name), "rb") as f:
+                files.append((name, f.read()))
+    return files
+
+
+async def parse_inline(file_bytes: bytes, filename: str) -> str:
+    """The previous implementation: synchronous work inside a coroutine"""
+    if filename.lower().endswith(".pdf"):
+        reader = PyPDF2.PdfReader(io.BytesIO(file_bytes))
+        text = ""
+        for page in reader.pages:
+            text += page.extract_text() or ""
+        return text
+    doc = Document(io.BytesIO(file_bytes))
+    return "\n".join([para.text for para in doc.paragraphs])
+
+
+async def measure(parse, files: list, concurrency: int, rounds: int) -> dict:
+    latencies = []
+    for name, data in files:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            await parse(data, name)
+            latencies.append((name, time.perf_counter() - start))
+
+    # Worst event-loop stall while `concurrency` uploads are parsed at once
+    stall = 0.0
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        nonlocal stall
+        while not stop.is_set():
+            before = time.perf_counter()
+            await asyncio.sleep(0.005)
+            stall = max(stall, time.perf_counter() - before - 0.005)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await asyncio.gather(*(parse(data, name) for name, data in files * concurrency))
+    wall = time.perf_counter() - start
+    stop.set()
+    await beat
+
+    per_file = {}
+    for name, latency in latencies:
+        per_file.setdefault(name, []).append(latency)
+    return {"per_file": {n: statistics.median(v) for n, v in per_file.items()}, "stall": stall, "wall": wall}
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--corpus", help="directory of .pdf/.docx resumes")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="copies of the corpus parsed at once")
+    arg_parser.add_argument("--rounds", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    files = load_corpus(args.corpus)
+    print(f"files={len(files)} workers={settings.PARSER_WORKERS} pages_per_task={settings.PARSER_PDF_PAGES_PER_TASK}")
+
+    # Start the pool outside the measurements
+    await resume_parser.parse_resume(files[0][1], files[0][0])
+
+    page_parallel = settings.PARSER_PDF_PAGES_PER_TASK
+    variants = [("inline", parse_inline, page_parallel), ("pool", resume_parser.parse_resume, 10 ** 9),
+                ("pool+pages", resume_parser.parse_resume, page_parallel)]
+    results = {}
+    for label, parse, pages_per_task in variants:
+        settings.PARSER_PDF_PAGES_PER_TASK = pages_per_task
+        results[label] = await measure(parse, files, args.concurrency, args.rounds)
+    settings.PARSER_PDF_PAGES_PER_TASK = page_parallel
+    resume_parser.shutdown_parser_pool()
+
+    print(f"{'file':24s}" + "".join(f"{label:>14s}" for label, _, _ in variants))
+    for name, _ in files:
+        print(f"{name:24s}" + "".join(f"{results[label]['per_file'][name] * 1000:12.1f}ms" for label, _, _ in variants))
+    print(f"{'batch wall time':24s}" + "".join(f"{results[label]['wall']:13.2f}s" for label, _, _ in variants))
+    print(f"{'max event-loop stall':24s}" + "".join(f"{results[label]['stall'] * 1000:12.1f}ms" for label, _, _ in variants))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,141 @@
+"""
+Benchmark approximate vector indexes against the exact flat index
+
+Reports build time, recall@k (against flat search results) and per-query
+latency for HNSW over a range of efSearch values and IVF-PQ over a range
+of nprobe values, plus memory and recall of fp16/int8 vector storage with
+and without exact re-ranking.
+
+Usage:
+    python bench_rag_index.py                      synthetic clustered vectors
+    python bench_rag_index.py --store vector_store vectors of a persisted namespace
+    python bench_rag_index.py --size 200000 --queries 500 --k 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.services.ann_index import build_index, default_index_params, rerank, set_search_params, index_bytes
+from backend.app.services.embedding import EMBEDDING_DIMENSION
+from backend.app.services.vector_store import VectorStore
+
+
+def synthetic_vectors(size: int, dimension: int, clusters: int = 256, seed: int = 7) -> np.ndarray:
+    """Normalised vectors around random centres, roughly like sentence embeddings"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centres[rng.integers(0, clusters, size)] + 0.6 * rng.standard_normal((size, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def run_queries(index, queries: np.ndarray, k: int) -> tuple:
+    """Search one query at a time (as the API does); returns (ids, latencies in seconds)"""
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    latencies = []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, found = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        ids[i] = found[0]
+    return ids, latencies
+
+
+def run_reranked(index, queries: np.ndarray, corpus: np.ndarray, k: int, factor: int) -> tuple:
+    """Over-fetch k * factor candidates and re-rank them with exact vectors, as RAGService does"""
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    latencies = []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        _, found = index.search(query[None, :], k * factor)
+        candidates = [int(c) for c in found[0] if c != -1]
+        ids[i] = rerank(query, candidates, corpus[candidates])[:k]
+        latencies.append(time.perf_counter() - start)
+    return ids, latencies
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def report(label: str, found: np.ndarray, truth: np.ndarray, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"  {label:18s} recall={recall(found, truth):.3f} "
+        f"mean={statistics.mean(latencies) * 1000:7.3f}ms p95={p95 * 1000:7.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--store", help="vector store directory to read vectors from")
+    parser.add_argument("--size", type=int, default=100000, help="synthetic corpus size")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    if args.store:
+        vectors = np.ascontiguousarray(VectorStore(args.store, EMBEDDING_DIMENSION).vectors())
+    else:
+        vectors = synthetic_vectors(args.size + args.queries, EMBEDDING_DIMENSION)
+    # Held-out queries, perturbed so they are never exact corpus members
+    rng = np.random.default_rng(11)
+    queries = vectors[-args.queries:] + 0.05 * rng.standard_normal((args.queries, vectors.shape[1])).astype(np.float32)
+    corpus = vectors[:-args.queries] if not args.store else vectors
+    print(f"corpus={len(corpus)} dim={corpus.shape[1]} queries={len(queries)} k={args.k}")
+
+    params = default_index_params()
+    params["ivf_nlist"] = min(params["ivf_nlist"], max(1, len(corpus) // 39))
+
+    timings = {}
+    indexes = {}
+    for index_type in ("flat", "hnsw", "ivfpq"):
+        start = time.perf_counter()
+        try:
+            indexes[index_type] = build_index(index_type, corpus, params)
+        except ValueError as e:
+            print(f"{index_type}: skipped ({e})")
+            continue
+        timings[index_type] = time.perf_counter() - start
+
+    truth, latencies = run_queries(indexes["flat"], queries, args.k)
+    print(f"flat   build={timings['flat']:.2f}s")
+    report("exact", truth, truth, latencies)
+
+    if "hnsw" in indexes:
+        print(f"hnsw   build={timings['hnsw']:.2f}s M={params['hnsw_m']} efConstruction={params['hnsw_ef_construction']}")
+        for ef in (16, 32, 64, 128, 256):
+            set_search_params(indexes["hnsw"], {"hnsw_ef_search": ef})
+            found, latencies = run_queries(indexes["hnsw"], queries, args.k)
+            report(f"efSearch={ef}", found, truth, latencies)
+
+    if "ivfpq" in indexes:
+        print(f"ivfpq  build={timings['ivfpq']:.2f}s nlist={params['ivf_nlist']} m={params['pq_m']} nbits={params['pq_nbits']}")
+        for nprobe in (1, 4, 16, 64):
+            set_search_params(indexes["ivfpq"], {"ivf_nprobe": nprobe})
+            found, latencies = run_queries(indexes["ivfpq"], queries, args.k)
+            report(f"nprobe={nprobe}", found, truth, latencies)
+            found, latencies = run_reranked(indexes["ivfpq"], queries, corpus, args.k, args.rerank_factor)
+            report(f"  +rerank x{args.rerank_factor}", found, truth, latencies)
+
+    print(f"flat storage (float32 = {index_bytes(indexes['flat']) / len(corpus):.0f} B/vector)")
+    for storage in ("fp16", "int8"):
+        index = build_index("flat", corpus, dict(params, storage=storage))
+        print(f"  {storage}: {index_bytes(index) / len(corpus):.0f} B/vector")
+        found, latencies = run_queries(index, queries, args.k)
+        report(f"{storage}", found, truth, latencies)
+        found, latencies = run_reranked(index, queries, corpus, args.k, args.rerank_factor)
+        report(f"{storage} +rerank x{args.rerank_factor}", found, truth, latencies)
+
+
+if __name__ == "__main__":
+    main()
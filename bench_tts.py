@@ -0,0 +1,57 @@
+"""
+Benchmark TTS engines (uncached synthesis latency)
+
+Usage: python bench_tts.py [engine ...]      e.g. python bench_tts.py gtts espeak
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.services.voice_service import create_tts_engine
+
+SENTENCES = [
+    "Tell me about yourself.",
+    "Describe a situation where you had to work with a difficult team member.",
+    "How did you implement authentication in your most recent project, and what would you change today?",
+    "A train 100 metres long crosses a pole in 5 seconds. What is its speed?",
+    "Design a system that stores and serves interview recordings for thousands of candidates.",
+]
+
+
+def bench(name: str, rounds: int = 3):
+    try:
+        engine = create_tts_engine(name)
+    except Exception as e:
+        print(f"{name}: unavailable ({e})")
+        return
+
+    latencies = []
+    total_bytes = 0
+    for _ in range(rounds):
+        for sentence in SENTENCES:
+            start = time.perf_counter()
+            try:
+                audio = engine.synthesize(sentence, "en", False)
+            except Exception as e:
+                print(f"{name}: synthesis failed ({e})")
+                return
+            latencies.append(time.perf_counter() - start)
+            total_bytes += len(audio)
+
+    latencies.sort()
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(
+        f"{name:8s} {engine.media_type:11s} n={len(latencies):3d} "
+        f"mean={statistics.mean(latencies) * 1000:7.1f}ms "
+        f"p50={statistics.median(latencies) * 1000:7.1f}ms "
+        f"p95={p95 * 1000:7.1f}ms "
+        f"avg_size={total_bytes // len(latencies)}B"
+    )
+
+
+if __name__ == "__main__":
+    for engine_name in sys.argv[1:] or ["gtts", "espeak"]:
+        bench(engine_name)
@@ -116,23 +116,103 @@ function addMessage(text, sender) {
     chatMessages.scrollTop = chatMessages.scrollHeight;
 }
 
-// Play TTS audio
-function playTTS(base64Audio) {
-    if (!base64Audio) return;
+// Play TTS audio (fetched separately so the question text shows immediately)
+// Reader of the audio response currently being played progressively
+let ttsReader = null;
 
+async function playTTS(audioUrl) {
+    if (!audioUrl) return;
+
+    const token = localStorage.getItem('token');
     speakingIndicator.style.display = 'block';
 
-    const audioData = `data:audio/mp3;base64,${base64Audio}`;
-    ttsAudio.src = audioData;
+    try {
+        const response = await fetch(new URL(audioUrl, API_BASE), {
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
 
-    ttsAudio.onended = () => {
-        speakingIndicator.style.display = 'none';
-        voiceStatus.textContent = 'Click microphone to answer';
-    };
+        if (!response.ok) {
+            throw new Error(`Audio request failed: ${response.status}`);
+        }
+
+        if (ttsReader) {
+            ttsReader.cancel().catch(() => {});
+            ttsReader = null;
+        }
+        if (ttsAudio.src.startsWith('blob:')) {
+            URL.revokeObjectURL(ttsAudio.src);
+        }
+
+        ttsAudio.onended = () => {
+            speakingIndicator.style.display = 'none';
+            voiceStatus.textContent = 'Click microphone to answer';
+        };
 
-    ttsAudio.play().catch(err => {
+        const mimeType = (response.headers.get('Content-Type') || '').split(';')[0].trim();
+        if (response.body && window.MediaSource && MediaSource.isTypeSupported(mimeType)) {
+            // Start playing with the first sentence instead of waiting for the whole question
+            await playProgressively(response, mimeType);
+        } else {
+            const audioBlob = await response.blob();
+            ttsAudio.src = URL.createObjectURL(audioBlob);
+            await ttsAudio.play();
+        }
+    } catch (err) {
         console.error('Error playing audio:', err);
         speakingIndicator.style.display = 'none';
+    }
+}
+
+// Feed the response body into a MediaSource as it arrives; resolves once playback starts
+function playProgressively(response, mimeType) {
+    return new Promise((resolve, reject) => {
+        const mediaSource = new MediaSource();
+        ttsAudio.src = URL.createObjectURL(mediaSource);
+
+        mediaSource.addEventListener('sourceopen', async () => {
+            const reader = response.body.getReader();
+            ttsReader = reader;
+            let started = false;
+            const start = () => {
+                if (started) return;
+                started = true;
+                ttsAudio.play().then(resolve, reject);
+            };
+
+            try {
+                const sourceBuffer = mediaSource.addSourceBuffer(mimeType);
+                while (true) {
+                    const { done, value } = await reader.read();
+                    if (done) break;
+                    await appendAudioChunk(sourceBuffer, value);
+                    start();
+                }
+                if (mediaSource.readyState === 'open') {
+                    mediaSource.endOfStream();
+                }
+                start();
+            } catch (err) {
+                // Also reached when a newer question's audio cancels this reader
+                if (ttsReader === reader) {
+                    console.error('Error streaming audio:', err);
+                }
+                reject(err);
+            } finally {
+                if (ttsReader === reader) {
+                    ttsReader = null;
+                }
+            }
+        }, { once: true });
+    });
+}
+
+function appendAudioChunk(sourceBuffer, chunk) {
+    return new Promise((resolve, reject) => {
+        sourceBuffer.addEventListener('updateend', resolve, { once: true });
+        sourceBuffer.addEventListener('error', reject, { once: true });
+        sourceBuffer.appendBuffer(chunk);
     });
 }
 
@@ -196,8 +276,8 @@ async function startInterview() {
         addMessage(data.first_question, 'ai');
 
         // Play TTS if available
-        if (data.audio_base64) {
-            playTTS(data.audio_base64);
+        if (data.audio_url) {
+            playTTS(data.audio_url);
         }
 
         // Update UI
@@ -246,8 +326,8 @@ async function submitAnswer(answerText) {
             addMessage(data.next_question, 'ai');
 
             // Play TTS
-            if (data.audio_base64) {
-                playTTS(data.audio_base64);
+            if (data.audio_url) {
+                playTTS(data.audio_url);
             }
 
             // Update question count
@@ -0,0 +1,30 @@
+"""
+Train and rebuild the vector index of a shared corpus namespace
+
+Run after bulk-loading the question/JD library, or after changing
+RAG_INDEX_TYPE or its build parameters. Vectors are read from the
+namespace's memory-mapped store, so nothing is re-embedded.
+
+Usage: python rebuild_rag_index.py [namespace] [--type flat|hnsw|ivfpq]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.services.ann_index import INDEX_TYPES
+from backend.app.services.rag import get_rag_engine, DEFAULT_NAMESPACE
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("namespace", nargs="?", default=DEFAULT_NAMESPACE)
+    parser.add_argument("--type", choices=INDEX_TYPES, help="defaults to RAG_INDEX_TYPE")
+    args = parser.parse_args()
+
+    summary = get_rag_engine().rebuild(args.namespace, index_type=args.type)
+    print(
+        f"{summary['namespace']}: {summary['index_type']} index over "
+        f"{summary['vectors']} vectors built in {summary['seconds']}s"
+    )
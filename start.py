@@ -45,8 +45,42 @@ def check_environment():
         return False
     return True
 
+def start_embedding_worker():
+    """Start the shared embedding worker process if it is enabled"""
+    from backend.app.core.config import settings
+    if not settings.EMBEDDING_WORKER_ENABLED:
+        return None
+
+    import atexit
+    import secrets
+    import subprocess
+    if not settings.EMBEDDING_WORKER_AUTHKEY:
+        # A fresh key per run: the worker inherits it through the environment,
+        # API workers (this process or its forks) through settings
+        settings.EMBEDDING_WORKER_AUTHKEY = secrets.token_hex(32)
+        os.environ["EMBEDDING_WORKER_AUTHKEY"] = settings.EMBEDDING_WORKER_AUTHKEY
+    logger.info(f"Starting embedding worker on {settings.EMBEDDING_WORKER_ADDRESS}")
+    # The supervisor restarts the worker if it dies, instead of every API worker loading its own model
+    process = subprocess.Popen(
+        [sys.executable, "-m", "backend.app.services.embedding_worker", "--supervise"],
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    atexit.register(process.terminate)
+    return process
+
+def parse_args():
+    import argparse
+    from backend.app.core.config import settings
+    parser = argparse.ArgumentParser(description="Start the AI Interviewer server")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", settings.WEB_WORKERS)),
+                        help="worker processes; more than 1 runs the pre-fork server (default: WEB_WORKERS)")
+    parser.add_argument("--max-requests", type=int, default=settings.WEB_MAX_REQUESTS,
+                        help="recycle a worker after this many requests, 0 = never (default: WEB_MAX_REQUESTS)")
+    return parser.parse_args()
+
 def main():
     """Main startup function"""
+    args = parse_args()
     logger.info("=" * 60)
     logger.info("Starting AI Interviewer Application")
     logger.info("=" * 60)
@@ -77,6 +111,28 @@ def main():
         logger.error(f"✗ Critical import error: {e}")
         sys.exit(1)
     
+    # Start the shared embedding worker before the API workers that use it
+    try:
+        start_embedding_worker()
+    except Exception as e:
+        logger.error(f"✗ Failed to start embedding worker: {e}")
+        logger.error("API workers will load the embedding model themselves")
+    
+    # Production mode: preload once, fork workers that share it copy-on-write
+    if args.workers > 1:
+        logger.info("=" * 60)
+        logger.info(f"Starting pre-fork server on 0.0.0.0:{port} with {args.workers} workers")
+        logger.info("=" * 60)
+        try:
+            from backend.app.prefork import serve
+            serve("0.0.0.0", port, workers=args.workers, max_requests=args.max_requests)
+            return
+        except Exception as e:
+            logger.error(f"✗ Failed to start pre-fork server: {e}")
+            import traceback
+            traceback.print_exc()
+            sys.exit(1)
+    
     # Try to import the application
     logger.info("Importing application...")
     try:
@@ -0,0 +1,31 @@
+"""
+Delete uploaded resumes that no interview references any more
+
+Also run once in the background at API startup (UPLOAD_SWEEP_ON_STARTUP);
+schedule this script for long-running deployments.
+
+Usage: python sweep_uploads.py [--retention-days N]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.app.core.config import settings
+from backend.app.services.upload_store import run_sweep
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--retention-days", type=int, default=settings.UPLOAD_RETENTION_DAYS,
+                        help="drop resumes of interviews started longer ago than this (0 = keep)")
+    args = parser.parse_args()
+
+    summary = run_sweep(retention_days=args.retention_days)
+    if summary is None:
+        sys.exit(1)
+    print(
+        f"expired {summary['references_expired']} resume references, removed {summary['files_removed']} files "
+        f"({summary['bytes_freed']} bytes), kept {summary['files_kept']}"
+    )